@@ -6,6 +6,7 @@ Fluxo: login manual, acesso ao Aviator e monitoramento das velas.
 """
 
 import os
+import sys
 import json
 import logging
 from datetime import datetime
@@ -27,14 +28,14 @@ from selenium.common.exceptions import (
     StaleElementReferenceException
 )
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('aviator_bot.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Reaproveita os módulos do backend: pipeline de logging, observador de
+# rodadas e regras de estratégia (uma única cópia do JS e das regras)
+sys.path.insert(0, str(Path(__file__).resolve().parent / "backend"))
+from log_pipeline import setup_logging
+from page_observer import ResultObserver
+from strategy_rules import compile_rule, default_rule_spec
+
+setup_logging('aviator_bot.log', logging.INFO)
 logger = logging.getLogger(__name__)
 
 FORCE_MANUAL_LOGIN = True
@@ -66,12 +67,18 @@ class BotConfig:
     history_size: int = 10
     min_strategy_checks: int = 4
     manual_login: bool = FORCE_MANUAL_LOGIN
+    use_observer: bool = False
+    observer_timeout: float = 30.0
 
 class AviatorBot:
     def __init__(self, config: BotConfig):
         self.config = config
         self.driver: Optional[webdriver.Chrome] = None
         self.results_history: List[float] = []
+        self.result_observer: Optional[ResultObserver] = None
+        self.strategy_rule = compile_rule(
+            default_rule_spec(config.strategy_threshold, config.min_strategy_checks)
+        )
         self.session_stats = {
             'start_time': datetime.now(),
             'strategies_found': 0,
@@ -298,10 +305,7 @@ class AviatorBot:
             return False
 
     def verify_strategy(self, results: List[float]) -> bool:
-        if len(results) < self.config.min_strategy_checks:
-            return False
-        recent_results = results[:self.config.min_strategy_checks]
-        return all(result < self.config.strategy_threshold for result in recent_results)
+        return self.strategy_rule(results)
 
     def get_game_results(self) -> Optional[List[float]]:
         try:
@@ -322,17 +326,50 @@ class AviatorBot:
             return results[:self.config.history_size]
 
         except (NoSuchElementException, ValueError) as e:
-            logger.warning(f"Erro ao obter resultados: {e}")
+            logger.warning("Erro ao obter resultados: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Erro inesperado ao obter resultados: {e}")
+            logger.error("Erro inesperado ao obter resultados: %s", e)
             return None
 
+    def drain_observed_results(self) -> Optional[List[List[float]]]:
+        if self.result_observer is None:
+            self.result_observer = ResultObserver(self.driver, PAYOUT_CONTAINER_XPATH, by_xpath=True)
+        payload = self.result_observer.drain(self.config.observer_timeout, {})
+        if payload is None:
+            return None
+        return [event["history"] for event in payload["events"]]
+
+    def process_results(self, current_results: List[float]) -> None:
+        if current_results == self.results_history:
+            return
+
+        self.results_history = current_results
+        self.session_stats['total_rounds'] += 1
+
+        if self.verify_strategy(current_results):
+            self.session_stats['strategies_found'] += 1
+            logger.info("[ESTRATEGIA] Ultimos resultados: %s", current_results[:4])
+            logger.info("[HISTORICO] %s", current_results)
+        else:
+            logger.info("[INFO] Resultados atuais: %s (estrategia nao ativada)", current_results[:4])
+
+        if self.session_stats['total_rounds'] % 10 == 0:
+            self.log_session_stats()
+
     def monitor_game(self) -> None:
         logger.info("Iniciando monitoramento do jogo")
 
         while True:
             try:
+                if self.config.use_observer:
+                    events = self.drain_observed_results()
+                    if events is not None:
+                        for history in events:
+                            self.process_results(history[:self.config.history_size])
+                        continue
+                    logger.warning("Observador indisponivel, usando leitura direta")
+
                 current_results = self.get_game_results()
 
                 if current_results is None:
@@ -340,27 +377,14 @@ class AviatorBot:
                     sleep(5)
                     continue
 
-                if current_results != self.results_history:
-                    self.results_history = current_results
-                    self.session_stats['total_rounds'] += 1
-
-                    if self.verify_strategy(current_results):
-                        self.session_stats['strategies_found'] += 1
-                        logger.info(f"[ESTRATEGIA] Ultimos resultados: {current_results[:4]}")
-                        logger.info(f"[HISTORICO] {current_results}")
-                    else:
-                        logger.info(f"[INFO] Resultados atuais: {current_results[:4]} (estrategia nao ativada)")
-
-                    if self.session_stats['total_rounds'] % 10 == 0:
-                        self.log_session_stats()
-
+                self.process_results(current_results)
                 sleep(2)
 
             except KeyboardInterrupt:
                 logger.info("Monitoramento interrompido pelo usuario")
                 break
             except Exception as e:
-                logger.error(f"Erro durante monitoramento: {e}")
+                logger.error("Erro durante monitoramento: %s", e)
                 self.session_stats['errors'] += 1
                 sleep(5)
 
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backtest vetorizado de uma BettingStrategy sobre rodadas históricas
+
+Reproduz as regras do controlador ao vivo:
+- a regra de ativação é avaliada com o histórico visto logo após a rodada i
+  e a aposta é feita na rodada i + 1
+- a aposta ganha se o crash da rodada for >= auto_cashout (cashout no alvo);
+  sem auto_cashout não há cashout automático e toda aposta é perdida
+- o valor segue BettingStrategy.calculate_bet_amount: amount * fator ** derrotas
+  acumuladas na sessão (reset_on_win não é aplicado pelo controlador)
+- max_loss/max_win são verificados antes de cada aposta e, com stop_on_*,
+  encerram as apostas da sessão
+
+Como as derrotas são acumuladas (nunca zeram), o valor de cada aposta depende
+só de um cumsum dos resultados anteriores e a simulação inteira, inclusive a
+progressiva, é feita com operações vetorizadas.
+
+Uso:
+    python backtester.py --db rounds.db --amount 1 --auto-cashout 2
+    python backtester.py --file historico.csv --amount 1 --auto-cashout 1.5 \\
+        --rule '{"run_below": {"threshold": 1.5, "length": 3}}'
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from models import BettingStrategy, BotConfig, SessionStats, StrategyTypeEnum
+from strategy_rules import CompiledRule, compile_rule, default_rule_spec, evaluate_series
+
+
+@dataclass
+class BacktestResult:
+    """Resultado de um backtest"""
+    rounds: int
+    triggers: int
+    bets_placed: int
+    wins: int
+    losses: int
+    total_bet: float
+    total_profit: float
+    max_drawdown: float
+    stopped_at: Optional[int] = None
+    stop_reason: Optional[str] = None
+    # Lucro acumulado após cada rodada (mesmo tamanho da série)
+    pnl: np.ndarray = field(default_factory=lambda: np.zeros(0), repr=False)
+    # Índice da rodada e resultado de cada aposta
+    bet_rounds: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64), repr=False)
+    bet_amounts: np.ndarray = field(default_factory=lambda: np.zeros(0), repr=False)
+    bet_profits: np.ndarray = field(default_factory=lambda: np.zeros(0), repr=False)
+
+    def to_session_stats(self) -> SessionStats:
+        """Estatísticas no mesmo formato da sessão ao vivo"""
+        return SessionStats(
+            total_rounds=self.rounds,
+            strategies_found=self.triggers,
+            bets_placed=self.bets_placed,
+            wins=self.wins,
+            losses=self.losses,
+            total_bet=self.total_bet,
+            total_profit=self.total_profit,
+        )
+
+    @property
+    def win_rate(self) -> float:
+        return self.to_session_stats().calculate_win_rate()
+
+    @property
+    def roi(self) -> float:
+        return self.to_session_stats().calculate_roi()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "rounds": self.rounds,
+            "triggers": self.triggers,
+            "bets_placed": self.bets_placed,
+            "wins": self.wins,
+            "losses": self.losses,
+            "total_bet": round(self.total_bet, 2),
+            "total_profit": round(self.total_profit, 2),
+            "win_rate": round(self.win_rate, 2),
+            "roi": round(self.roi, 2),
+            "max_drawdown": round(self.max_drawdown, 2),
+            "stopped_at": self.stopped_at,
+            "stop_reason": self.stop_reason,
+        }
+
+
+def strategy_rule(strategy: BettingStrategy, config: Optional[BotConfig] = None) -> CompiledRule:
+    """Mesma regra que o controlador usaria para a estratégia"""
+    if strategy.rule:
+        return compile_rule(strategy.rule)
+    config = config or BotConfig()
+    return compile_rule(default_rule_spec(config.strategy_threshold, config.min_strategy_checks))
+
+
+def max_drawdown(pnl: np.ndarray) -> float:
+    """Maior queda do lucro acumulado em relação ao pico anterior (começando em 0)"""
+    if not pnl.size:
+        return 0.0
+    peaks = np.maximum.accumulate(np.maximum(pnl, 0.0))
+    return float(np.max(peaks - pnl))
+
+
+def _first_stop(profit_before: np.ndarray, strategy: BettingStrategy) -> tuple:
+    """Primeira aposta bloqueada pelos limites de perda/ganho"""
+    candidates = []
+    if strategy.max_loss and strategy.stop_on_loss:
+        hits = np.flatnonzero(profit_before <= -strategy.max_loss)
+        if hits.size:
+            candidates.append((int(hits[0]), "max_loss"))
+    if strategy.max_win and strategy.stop_on_win:
+        hits = np.flatnonzero(profit_before >= strategy.max_win)
+        if hits.size:
+            candidates.append((int(hits[0]), "max_win"))
+    if not candidates:
+        return None, None
+    # Na mesma aposta o controlador verifica a perda antes do ganho
+    return min(candidates, key=lambda item: item[0])
+
+
+def backtest(series: Sequence[float], strategy: BettingStrategy,
+             config: Optional[BotConfig] = None,
+             rule: Optional[CompiledRule] = None) -> BacktestResult:
+    """Simula a estratégia sobre a série cronológica de multiplicadores"""
+    values = np.ascontiguousarray(series, dtype=np.float64)
+    rounds = values.size
+    rule = rule or strategy_rule(strategy, config)
+
+    triggers = evaluate_series(rule, values)
+    # Gatilho na rodada i aposta na i + 1; o da última rodada não tem aposta
+    bet_rounds = np.flatnonzero(triggers[:-1]) + 1 if rounds else np.zeros(0, dtype=np.int64)
+
+    target = strategy.auto_cashout
+    crashes = values[bet_rounds]
+    won = crashes >= target if target else np.zeros(bet_rounds.size, dtype=bool)
+
+    if strategy.progressive_betting:
+        losses_before = np.concatenate(([0], np.cumsum(~won)[:-1])) if won.size else np.zeros(0)
+        # Sem limite de perda a progressão pode estourar o float em séries longas
+        with np.errstate(over="ignore"):
+            amounts = strategy.amount * np.power(strategy.progression_factor, losses_before)
+    else:
+        amounts = np.full(bet_rounds.size, strategy.amount)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        profits = np.where(won, amounts * ((target or 1.0) - 1), -amounts)
+        # Limites verificados antes de cada aposta com o lucro acumulado até ali
+        cumulative = np.cumsum(profits)
+    profit_before = np.concatenate(([0.0], cumulative[:-1])) if profits.size else profits
+    stop_index, stop_reason = _first_stop(profit_before, strategy)
+    stopped_at = None
+    if stop_index is not None:
+        stopped_at = int(bet_rounds[stop_index])
+        bet_rounds = bet_rounds[:stop_index]
+        won = won[:stop_index]
+        amounts = amounts[:stop_index]
+        profits = profits[:stop_index]
+
+    per_round = np.zeros(rounds)
+    per_round[bet_rounds] = profits
+    with np.errstate(over="ignore", invalid="ignore"):
+        pnl = np.cumsum(per_round)
+        drawdown = max_drawdown(pnl)
+        total_bet = float(amounts.sum())
+        total_profit = float(profits.sum())
+
+    wins = int(np.count_nonzero(won))
+    return BacktestResult(
+        rounds=rounds,
+        triggers=int(np.count_nonzero(triggers)),
+        bets_placed=int(bet_rounds.size),
+        wins=wins,
+        losses=int(bet_rounds.size) - wins,
+        total_bet=total_bet,
+        total_profit=total_profit,
+        max_drawdown=drawdown,
+        stopped_at=stopped_at,
+        stop_reason=stop_reason,
+        pnl=pnl,
+        bet_rounds=bet_rounds,
+        bet_amounts=amounts,
+        bet_profits=profits,
+    )
+
+
+def load_series(path: str) -> np.ndarray:
+    """Carrega multiplicadores em ordem cronológica (.npy, .json, .csv/.txt)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return np.load(path).astype(np.float64)
+    if extension == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Lista de números ou de rodadas no formato da API (/rounds)
+        if isinstance(data, dict):
+            data = data.get("rounds", [])
+        return np.array([item["multiplier"] if isinstance(item, dict) else item for item in data], dtype=np.float64)
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    tokens = text.replace(",", " ").replace(";", " ").split()
+    return np.array([float(token.rstrip("xX")) for token in tokens], dtype=np.float64)
+
+
+def load_round_store(path: str, limit: Optional[int] = None) -> np.ndarray:
+    """Carrega os multiplicadores gravados pelo RoundStore"""
+    from round_store import RoundStore
+
+    store = RoundStore(path)
+    try:
+        return np.array(store.multipliers(limit), dtype=np.float64)
+    finally:
+        store.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="Arquivo com multiplicadores (.csv, .txt, .json, .npy)")
+    source.add_argument("--db", help="Banco SQLite do RoundStore")
+    parser.add_argument("--limit", type=int, help="Usar apenas as últimas N rodadas")
+    parser.add_argument("--amount", type=float, default=1.0, help="Valor da aposta")
+    parser.add_argument("--auto-cashout", type=float, help="Multiplicador de cashout automático")
+    parser.add_argument("--max-loss", type=float, help="Perda máxima")
+    parser.add_argument("--max-win", type=float, help="Ganho máximo")
+    parser.add_argument("--no-stop-on-loss", action="store_true", help="Não parar ao atingir a perda máxima")
+    parser.add_argument("--no-stop-on-win", action="store_true", help="Não parar ao atingir o ganho máximo")
+    parser.add_argument("--progressive", action="store_true", help="Aposta progressiva")
+    parser.add_argument("--factor", type=float, default=1.5, help="Fator de progressão")
+    parser.add_argument("--rule", help="Regra de ativação em JSON (ver strategy_rules)")
+    parser.add_argument("--threshold", type=float, default=2.0, help="Threshold da regra padrão")
+    parser.add_argument("--checks", type=int, default=4, help="Rodadas consecutivas da regra padrão")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    return parser
+
+
+def strategy_from_args(args: argparse.Namespace) -> BettingStrategy:
+    return BettingStrategy(
+        amount=args.amount,
+        strategy_type=StrategyTypeEnum.CUSTOM if args.rule else StrategyTypeEnum.MODERATE,
+        auto_cashout=args.auto_cashout,
+        max_loss=args.max_loss,
+        max_win=args.max_win,
+        stop_on_loss=not args.no_stop_on_loss,
+        stop_on_win=not args.no_stop_on_win,
+        progressive_betting=args.progressive,
+        progression_factor=args.factor,
+        rule=json.loads(args.rule) if args.rule else None,
+    )
+
+
+def main():
+    args = build_parser().parse_args()
+    series = load_round_store(args.db, args.limit) if args.db else load_series(args.file)
+    if args.limit and not args.db:
+        series = series[-args.limit:]
+
+    strategy = strategy_from_args(args)
+    config = BotConfig(strategy_threshold=args.threshold, min_strategy_checks=args.checks)
+
+    start = time.perf_counter()
+    result = backtest(series, strategy, config)
+    elapsed = time.perf_counter() - start
+
+    summary = result.summary()
+    summary["elapsed_ms"] = round(elapsed * 1000, 3)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    for key, value in summary.items():
+        print(f"{key:>14}: {value}")
+    if elapsed > 0:
+        print(f"{'rounds/s':>14}: {result.rounds / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
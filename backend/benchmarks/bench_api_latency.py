@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: latência da API enquanto o bot monitora o jogo
+
+Um laço de monitoramento faz chamadas bloqueantes a um driver simulado
+(latência fixa por comando) enquanto um cliente chama /bot/status pelo
+transporte ASGI. Compara o laço chamando o driver direto no event loop
+(como antes) com o mesmo laço passando pelo DriverWorker.
+
+Roda em um diretório temporário (backend.log, rounds.db e bot_config.json
+criados pela API e pelo controlador não ficam na pasta atual) e com o log
+abaixo de WARNING desligado.
+
+Uso: python benchmarks/bench_api_latency.py [--latency-ms 20] [--requests 300]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+
+class BlockingDriver:
+    """Driver simulado: cada comando bloqueia a thread chamadora"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def execute_script(self, script, *args):
+        time.sleep(self.latency)
+        return {"history": [1.5, 2.0, 3.1, 1.2], "balance": "R$ 10,00"}
+
+
+async def monitor_direct(controller, stop):
+    while not stop.is_set():
+        controller.read_page_state()
+        await asyncio.sleep(0)
+
+
+async def monitor_worker(controller, stop):
+    while not stop.is_set():
+        await controller.driver_worker.run(controller.read_page_state)
+
+
+async def measure(api, monitor, latency: float, requests: int):
+    from bot_controller import AviatorBotController
+    from driver_worker import DriverWorker
+
+    controller = AviatorBotController()
+    controller.driver = BlockingDriver(latency)
+    controller.driver_worker = DriverWorker()
+    api.bot_controller = controller
+
+    stop = asyncio.Event()
+    task = asyncio.create_task(monitor(controller, stop))
+    samples = []
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(requests):
+            # A requisição "chega" no instante agendado; conta a espera pelo loop
+            arrival = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            response = await client.get("/bot/status")
+            samples.append((time.perf_counter() - arrival) * 1000)
+            response.raise_for_status()
+
+    stop.set()
+    await task
+    controller.driver_worker.stop()
+    controller.round_store.close()
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latência simulada por comando do driver")
+    parser.add_argument("--requests", type=int, default=300, help="Requisições a /bot/status")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        # Importar main já configura o log em ./backend.log
+        os.chdir(folder)
+        try:
+            import main as api
+            logging.disable(logging.INFO)
+            for name, monitor in (("antes (driver no event loop)", monitor_direct),
+                                  ("depois (DriverWorker)", monitor_worker)):
+                p50, p99 = asyncio.run(measure(api, monitor, latency, args.requests))
+                print(f"{name:30s} /bot/status p50={p50:7.2f} ms  p99={p99:7.2f} ms")
+            api.log_listener.stop()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main_cli()
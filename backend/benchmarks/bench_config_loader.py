@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: leituras e gravações do ConfigLoader
+
+Compara a leitura de credentials.json a cada chamada (abrir + json.load, como
+antes) com o cache em memória validado por mtime/tamanho, e conta quantas
+gravações em disco uma rajada de PUTs gera com o debounce.
+
+Uso: python benchmarks/bench_config_loader.py [--reads 5000] [--puts 200]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config_loader
+from config_loader import ConfigLoader
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=5000, help="Leituras de configuração")
+    parser.add_argument("--puts", type=int, default=200, help="Atualizações em rajada")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        loader = ConfigLoader()
+        loader.aviator_folder = Path(folder)
+        loader.credentials_file = loader.aviator_folder / "credentials.json"
+        data = {
+            "username": "usuario",
+            "password": "senha",
+            "bot_settings": loader._get_default_config(),
+            "elements": loader._get_default_elements(),
+            "betting_strategy": loader._get_default_strategy(),
+        }
+        loader.save_credentials(data)
+
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            with open(loader.credentials_file, "r", encoding="utf-8") as f:
+                json.load(f).get("elements")
+        uncached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            loader.get_element_config()
+        cached = time.perf_counter() - start
+
+        print(f"{args.reads} leituras")
+        print(f"  arquivo a cada chamada: {uncached / args.reads * 1e6:8.1f} us/leitura")
+        print(f"  cache em memória:       {cached / args.reads * 1e6:8.1f} us/leitura "
+              f"({loader.disk_reads} leitura(s) do disco)")
+
+        writes_before = loader.disk_writes
+        start = time.perf_counter()
+        for index in range(args.puts):
+            loader.update_config("bot_settings", {**data["bot_settings"], "history_size": index})
+        elapsed = time.perf_counter() - start
+        time.sleep(config_loader.WRITE_DEBOUNCE + 0.2)
+        print(f"{args.puts} PUTs em {elapsed * 1000:.1f} ms -> {loader.disk_writes - writes_before} "
+              f"gravação(ões) em disco, {loader.coalesced_writes} agrupadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: latência de logger.info no laço quente
+
+Compara o custo por chamada, medido na thread que loga, entre os handlers
+síncronos (arquivo + console, como no basicConfig antigo, com f-string) e o
+pipeline com fila (log_pipeline.setup_logging, com formatação preguiçosa).
+
+Uso: python benchmarks/bench_logging.py [--calls 20000]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_pipeline import setup_logging
+
+
+def measure(logger: logging.Logger, calls: int, lazy: bool):
+    window = [1.23, 4.56, 1.01, 2.5]
+    samples = []
+    for index in range(calls):
+        start = time.perf_counter()
+        if lazy:
+            logger.info("📈 Resultados atuais: %s (estratégia não ativada) #%d", window, index)
+        else:
+            logger.info(f"📈 Resultados atuais: {window} (estratégia não ativada) #{index}")
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.999)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000, help="Chamadas de log")
+    args = parser.parse_args()
+
+    # Console descartado nos dois cenários para medir só o custo da chamada
+    devnull = open(os.devnull, "w")
+    sys.stderr = devnull
+    logger = logging.getLogger("bench")
+
+    with tempfile.TemporaryDirectory() as folder:
+        root = logging.getLogger()
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[logging.FileHandler(os.path.join(folder, "sync.log")), logging.StreamHandler(devnull)],
+        )
+        sync = measure(logger, args.calls, lazy=False)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+
+        # Console do pipeline criado com sys.stderr já apontando para devnull
+        listener = setup_logging(os.path.join(folder, "queue.log"), logging.INFO)
+        queued = measure(logger, args.calls, lazy=True)
+        listener.stop()
+
+    sys.stderr = sys.__stderr__
+    for label, (mean, p50, p999) in (("síncrono + f-string", sync), ("fila + preguiçoso", queued)):
+        print(f"{label:<22} média={mean * 1e6:7.2f} us  p50={p50 * 1e6:7.2f} us  p99.9={p999 * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: custo por tick do monitoramento antes e depois do snapshot em lote
+
+Simula o chromedriver com uma latência fixa por chamada HTTP e compara:
+- leitura antiga: find_element + .text para histórico e saldo, mais a
+  verificação do botão de aposta (cada acesso é uma chamada ao driver)
+- leitura nova: um único execute_script que devolve todo o estado
+
+Uso: python benchmarks/bench_page_state.py [--latency-ms 3] [--ticks 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By
+
+from models import ElementConfig
+from page_state import read_page_state
+
+
+class FakeElement:
+    """WebElement simulado: cada propriedade custa uma chamada ao driver"""
+
+    def __init__(self, driver, text):
+        self._driver = driver
+        self._text = text
+
+    @property
+    def text(self):
+        self._driver._round_trip()
+        return self._text
+
+    def is_enabled(self):
+        self._driver._round_trip()
+        return True
+
+    def is_displayed(self):
+        self._driver._round_trip()
+        return True
+
+
+class FakeDriver:
+    """Driver simulado com latência fixa por comando"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def _round_trip(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def find_element(self, by, value):
+        self._round_trip()
+        if by == By.CLASS_NAME:
+            return FakeElement(self, "1.23x\n4.56x\n1.01x\n2.00x")
+        return FakeElement(self, "R$ 150,25")
+
+    def execute_script(self, script, *args):
+        self._round_trip()
+        return {
+            "history": [1.23, 4.56, 1.01, 2.00],
+            "balance": "R$ 150,25",
+            "multiplier": "1.87x",
+            "bet_button": {"visible": True, "enabled": True},
+            "cashout_button": {"visible": False, "enabled": False},
+            "ts": time.time() * 1000,
+        }
+
+
+def legacy_tick(driver, elements):
+    """Leitura por tick como era feita antes (histórico, saldo e botão)"""
+    history = driver.find_element(By.CLASS_NAME, elements.result_history).text
+    [float(n) for n in history.replace('x', '').split('\n') if n.strip()]
+    balance = driver.find_element(By.XPATH, elements.balance_display).text
+    float(balance.replace('R$', '').replace(',', '.').strip())
+    button = driver.find_element(By.XPATH, elements.bet_button)
+    button.is_displayed() and button.is_enabled()
+
+
+def snapshot_tick(driver, elements):
+    """Leitura por tick com o snapshot em lote"""
+    read_page_state(driver, elements)
+
+
+def run(tick, latency: float, ticks: int):
+    driver = FakeDriver(latency)
+    elements = ElementConfig(balance_display="//balance", bet_button="//bet", multiplier_display="//mult")
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick(driver, elements)
+    elapsed = time.perf_counter() - start
+    return driver.calls / ticks, elapsed / ticks * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=3.0, help="Latência simulada por chamada ao driver")
+    parser.add_argument("--ticks", type=int, default=200, help="Número de ticks simulados")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    for name, tick in (("antes (find_element/.text)", legacy_tick), ("depois (snapshot em lote)", snapshot_tick)):
+        calls, ms = run(tick, latency, args.ticks)
+        print(f"{name:28s} chamadas/tick={calls:4.1f}  custo/tick={ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
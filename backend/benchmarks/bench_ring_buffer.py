@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: memória por rodada retida e custo das agregações
+
+Compara list[GameResult], list[float] e RingBuffer com o mesmo número de
+rodadas, medindo a memória alocada com tracemalloc e o tempo de média/máximo
+sobre a janela completa.
+
+Uso: python benchmarks/bench_ring_buffer.py [--rounds 10000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import GameResult
+from ring_buffer import RingBuffer
+
+
+def measure_memory(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    container = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del container
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=10000, help="Rodadas retidas")
+    args = parser.parse_args()
+
+    rounds = args.rounds
+    values = [round(random.uniform(1.0, 10.0), 2) for _ in range(rounds)]
+
+    def build_models():
+        return [GameResult(multiplier=value) for value in values]
+
+    def build_floats():
+        # Força floats novos (não reaproveita os objetos de `values`)
+        return [value * 1.0 + 0.0 for value in values]
+
+    def build_ring():
+        ring = RingBuffer(rounds)
+        for value in values:
+            ring.append(value)
+        return ring
+
+    print(f"Memória por rodada retida ({rounds} rodadas):")
+    for name, build in (("list[GameResult]", build_models), ("list[float]", build_floats), ("RingBuffer", build_ring)):
+        print(f"  {name:18s} {measure_memory(build) / rounds:8.1f} bytes")
+
+    ring = build_ring()
+    floats = build_floats()
+    repeats = 200
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        sum(floats) / len(floats), max(floats)
+    python_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        window = ring.as_array()
+        window.mean(), window.max()
+    ring_ms = (time.perf_counter() - start) / repeats * 1000
+
+    print(f"Média + máximo da janela: list {python_ms:.3f} ms, RingBuffer (visão NumPy) {ring_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: custo de serialização do status por número de leitores
+
+Para cada versão do estado, N leitores (requisições REST e clientes
+WebSocket) pedem o status. Compara a serialização por leitor (modelo
+pydantic + json.dumps, como antes) com o StateCache, que serializa uma vez
+por versão e entrega os mesmos bytes.
+
+Uso: python benchmarks/bench_state_cache.py [--versions 200] [--readers 1,10,100,500]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import BotStatus, BotStatusEnum, SessionStats
+from state_cache import StateCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--versions", type=int, default=200, help="Versões do estado")
+    parser.add_argument("--readers", default="1,10,100,500", help="Leitores por versão (lista)")
+    args = parser.parse_args()
+
+    status = BotStatus(status=BotStatusEnum.MONITORING, is_running=True, current_balance=100.0,
+                       recent_results=[1.5, 2.3, 1.0, 7.8, 1.2, 3.4, 1.1, 2.0, 1.9, 15.2])
+    stats = SessionStats()
+
+    def build():
+        return {"status": status.dict(), "stats": stats.dict()}
+
+    print(f"{'leitores':>9} {'por leitor (ms)':>16} {'cache (ms)':>11} {'us/leitura':>11}")
+    for readers in (int(value) for value in args.readers.split(",")):
+        start = time.perf_counter()
+        for version in range(args.versions):
+            stats.total_rounds = version
+            for _ in range(readers):
+                json.dumps(build(), default=str).encode()
+        per_reader = time.perf_counter() - start
+
+        cache = StateCache(max_age=float("inf"))
+        start = time.perf_counter()
+        for version in range(args.versions):
+            stats.total_rounds = version
+            for _ in range(readers):
+                cache.get("status", version, build).body
+        cached = time.perf_counter() - start
+
+        reads = args.versions * readers
+        print(f"{readers:9d} {per_reader * 1000:16.1f} {cached * 1000:11.1f} {cached / reads * 1e6:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: bytes e CPU do status completo a cada 2 s vs deltas por evento
+
+Simula uma sessão de monitoramento (uma rodada a cada ~10 s, mudanças de fase
+e algumas apostas) e compara o status_update completo enviado a cada 2 s com
+os status_delta do StatusStream, gerados apenas quando o estado muda: primeiro
+reconstruindo e comparando as duas seções a cada evento, depois só as seções
+marcadas, com a fase no canal round_phase (como publish_status faz).
+
+Uso: python benchmarks/bench_status_stream.py [--minutes 60]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import BotStatus, BotStatusEnum, RoundPhaseEnum, SessionStats
+from status_stream import StatusStream
+
+PHASES = [RoundPhaseEnum.WAITING, RoundPhaseEnum.BETTING, RoundPhaseEnum.FLYING, RoundPhaseEnum.CRASHED]
+
+
+def simulate_events(minutes: int, seed: int = 7):
+    """Instantes (s) de cada mudança de estado: (tempo, tipo)"""
+    rng = random.Random(seed)
+    events, now = [], 0.0
+    while now < minutes * 60:
+        for phase in PHASES:
+            events.append((now, phase))
+            now += rng.uniform(1.5, 4.0)
+        events.append((now, "round"))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=60, help="Duração simulada da sessão")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    start = datetime.now()
+    status = BotStatus(status=BotStatusEnum.MONITORING, is_running=True, current_balance=100.0)
+    stats = SessionStats(start_time=start)
+    recent = []
+
+    def state(at: float, exclude_phase: bool = False):
+        status.last_update = start + timedelta(seconds=at)
+        stats.uptime = str(timedelta(seconds=int(at)))
+        exclude = {"round_phase"} if exclude_phase else None
+        return {"status": status.dict(exclude=exclude), "stats": stats.dict()}
+
+    events = simulate_events(args.minutes)
+    duration = args.minutes * 60
+
+    # Antes: snapshot completo a cada 2 s, mude ou não
+    full_bytes, full_messages, full_time = 0, 0, 0.0
+    for tick in range(0, duration, 2):
+        begin = time.perf_counter()
+        text = json.dumps({"type": "status_update", "data": {**state(tick), "timestamp": datetime.now().isoformat()}},
+                          default=str)
+        full_time += time.perf_counter() - begin
+        full_bytes += len(text)
+        full_messages += 1
+
+    def apply(kind):
+        nonlocal recent
+        if kind == "round":
+            multiplier = round(rng.expovariate(0.5) + 1, 2)
+            recent = ([multiplier] + recent)[:10]
+            status.last_multiplier, status.recent_results = multiplier, recent
+            stats.total_rounds += 1
+            if rng.random() < 0.2:
+                status.current_balance = round(status.current_balance + rng.uniform(-5, 5), 2)
+                stats.bets_placed += 1
+        else:
+            status.round_phase = kind
+
+    # Deltas com as duas seções reconstruídas e comparadas a cada evento
+    stream = StatusStream()
+    stream.update(state(0))
+    delta_bytes, delta_messages, delta_time = 0, 0, 0.0
+    for at, kind in events:
+        apply(kind)
+        begin = time.perf_counter()
+        delta = stream.update(state(at))
+        text = json.dumps(delta, default=str) if delta else ""
+        delta_time += time.perf_counter() - begin
+        if delta:
+            delta_bytes += len(text)
+            delta_messages += 1
+
+    # Seções marcadas: fase no canal próprio, status/stats só quando há rodada
+    rng.seed(1)
+    recent = []
+    status.round_phase, status.last_multiplier, status.recent_results = None, None, []
+    status.current_balance, stats.total_rounds, stats.bets_placed = 100.0, 0, 0
+    stream = StatusStream()
+    stream.update(state(0, exclude_phase=True))
+    dirty_bytes, dirty_messages, dirty_time = 0, 0, 0.0
+    for at, kind in events:
+        apply(kind)
+        begin = time.perf_counter()
+        if kind == "round":
+            message = stream.update(state(at, exclude_phase=True))
+        else:
+            message = stream.update_phase(kind.value)
+        text = json.dumps(message, default=str) if message else ""
+        dirty_time += time.perf_counter() - begin
+        if message:
+            dirty_bytes += len(text)
+            dirty_messages += 1
+
+    print(f"Sessão de {args.minutes} min, {sum(1 for _, kind in events if kind == 'round')} rodadas")
+    print(f"  completo a cada 2 s: {full_messages:6d} mensagens {full_bytes / 1024:9.1f} KiB "
+          f"{full_time * 1000:8.1f} ms de CPU")
+    print(f"  deltas por evento:   {delta_messages:6d} mensagens {delta_bytes / 1024:9.1f} KiB "
+          f"{delta_time * 1000:8.1f} ms de CPU")
+    print(f"  seções marcadas:     {dirty_messages:6d} mensagens {dirty_bytes / 1024:9.1f} KiB "
+          f"{dirty_time * 1000:8.1f} ms de CPU")
+    print(f"  redução de bytes: {1 - dirty_bytes / full_bytes:.1%}, "
+          f"de CPU: {1 - dirty_time / full_time:.1%} (vs completo), "
+          f"{1 - dirty_time / delta_time:.1%} (vs deltas por evento)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: custo por rodada das regras de estratégia compiladas
+
+Avalia N regras ativas sobre a janela do histórico, o avaliador incremental
+(estado compartilhado, uma atualização por rodada) e a avaliação vetorizada
+de uma série inteira.
+
+Uso: python benchmarks/bench_strategy_rules.py [--rules 36] [--rounds 100000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategy_rules import compile_rule, default_rule_spec, evaluate_series
+from strategy_evaluator import StrategyEvaluator
+
+SPECS = [
+    default_rule_spec(2.0, 4),
+    {"run_above": {"threshold": 1.5, "length": 2}},
+    {"avg_below": {"threshold": 2.5, "window": 10}},
+    {"count_above": {"threshold": 2.0, "window": 8, "min": 5}},
+    {"all": [
+        {"run_below": {"threshold": 2.0, "length": 3}},
+        {"not": {"avg_above": {"threshold": 4.0, "window": 10}}},
+    ]},
+    {"any": [
+        {"run_below": {"threshold": 1.3, "length": 2}},
+        {"count_below": {"threshold": 1.5, "window": 6, "min": 4}},
+    ]},
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=36, help="Regras ativas")
+    parser.add_argument("--rounds", type=int, default=100000, help="Rodadas da série vetorizada")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    series = np.round(0.99 / rng.random(args.rounds), 2)
+    rules = [compile_rule(SPECS[i % len(SPECS)]) for i in range(args.rules)]
+    window = series[:10][::-1].tolist()
+
+    repeats = 20000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for rule in rules:
+            rule(window)
+    per_round_us = (time.perf_counter() - start) / repeats * 1e6
+    print(f"{len(rules)} regras por rodada: {per_round_us:.1f} µs ({per_round_us / len(rules):.2f} µs/regra)")
+
+    # Candidatas com thresholds e contagens variados sobre o mesmo estado
+    evaluator = StrategyEvaluator()
+    for i in range(args.rules):
+        spec = SPECS[i % len(SPECS)]
+        evaluator.watch(f"s{i}", {"all": [spec, default_rule_spec(1.5 + (i % 10) / 10, 2 + i % 5)]})
+    start = time.perf_counter()
+    for value in series[:repeats].tolist():
+        evaluator.update(value)
+    stream_us = (time.perf_counter() - start) / repeats * 1e6
+    print(f"Avaliador incremental: {stream_us:.1f} µs/rodada para {len(evaluator)} estratégias "
+          f"({evaluator.features.size} células compartilhadas)")
+
+    start = time.perf_counter()
+    for rule in rules:
+        evaluate_series(rule, series)
+    elapsed = time.perf_counter() - start
+    print(f"Vetorizado: {args.rounds * len(rules) / elapsed / 1e6:.1f} M avaliações/s")
+
+
+if __name__ == "__main__":
+    main()
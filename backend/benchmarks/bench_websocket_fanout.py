@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: custo do broadcast WebSocket com muitos clientes
+
+Simula clientes com latência de envio (uma fração deles lenta) e compara o
+broadcast sequencial antigo (await send_text em cada conexão) com o
+ConnectionManager com filas por cliente. Mede o tempo que o chamador fica
+bloqueado em cada broadcast e, ao final, o atraso e os descartes por cliente.
+
+Uso: python benchmarks/bench_websocket_fanout.py [--clients 500] [--messages 50] [--slow 0.05]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Cliente simulado: cada envio custa `delay` segundos"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def close(self):
+        pass
+
+
+async def sequential_broadcast(connections, message):
+    """Broadcast como era antes: um envio após o outro"""
+    text = json.dumps(message, default=str)
+    for connection in connections:
+        await connection.send_text(text)
+
+
+def make_clients(count: int, slow_fraction: float, seed: int):
+    rng = random.Random(seed)
+    return [
+        FakeWebSocket(0.2 if rng.random() < slow_fraction else rng.uniform(0.0001, 0.001))
+        for _ in range(count)
+    ]
+
+
+def message(index: int):
+    return {
+        "type": "status_delta",
+        "data": {"status": {"is_running": True, "rounds": index}, "timestamp": time.time()},
+    }
+
+
+async def run_sequential(clients, messages: int):
+    times = []
+    for index in range(messages):
+        start = time.perf_counter()
+        await sequential_broadcast(clients, message(index))
+        times.append(time.perf_counter() - start)
+    return times
+
+
+async def run_queued(clients, messages: int, interval: float):
+    manager = ConnectionManager(max_queue=32, send_timeout=5.0)
+    for client in clients:
+        await manager.connect(client)
+    times = []
+    for index in range(messages):
+        start = time.perf_counter()
+        await manager.broadcast(message(index))
+        times.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    # Deixa as filas esvaziarem antes de coletar as métricas
+    await asyncio.sleep(0.5)
+    stats = manager.get_stats()
+    for client in clients:
+        manager.disconnect(client)
+    return times, stats
+
+
+def report(label: str, times):
+    print(f"  {label:<28} média={statistics.mean(times) * 1e6:10.1f} us  "
+          f"máx={max(times) * 1e6:10.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500, help="Clientes simulados no maior cenário")
+    parser.add_argument("--messages", type=int, default=50, help="Broadcasts por cenário")
+    parser.add_argument("--slow", type=float, default=0.05, help="Fração de clientes lentos (200 ms por envio)")
+    parser.add_argument("--interval", type=float, default=0.01, help="Intervalo entre broadcasts (s)")
+    parser.add_argument("--sequential-messages", type=int, default=3,
+                        help="Broadcasts do modo sequencial (é lento com clientes lentos)")
+    args = parser.parse_args()
+
+    sizes = sorted({size for size in (10, 50, 100, 250, args.clients) if size <= args.clients})
+    print(f"Broadcast ({args.slow:.0%} de clientes lentos)")
+    for size in sizes:
+        print(f"{size} clientes:")
+        clients = make_clients(size, args.slow, seed=size)
+        sequential = asyncio.run(run_sequential(clients, args.sequential_messages))
+        report("sequencial", sequential)
+
+        clients = make_clients(size, args.slow, seed=size)
+        queued, stats = asyncio.run(run_queued(clients, args.messages, args.interval))
+        report("filas por cliente", queued)
+        lags = sorted(client["max_lag_ms"] for client in stats["clients"])
+        print(f"  {'':<28} coalescidas={sum(c['coalesced'] for c in stats['clients'])} "
+              f"descartadas={stats['dropped']} removidos={stats['evicted']} "
+              f"atraso máx p50={lags[len(lags) // 2]:.1f} ms p99={lags[int(len(lags) * 0.99)]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,12 @@ import asyncio
 import logging
 import json
 import os
+import time
+import threading
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Set
 from dataclasses import asdict
 
 from selenium import webdriver
@@ -22,22 +26,53 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import (
     TimeoutException, 
     NoSuchElementException, 
-    WebDriverException
+    WebDriverException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    SessionNotCreatedException
 )
-from webdriver_manager.chrome import ChromeDriverManager
 
 from models import (
     BotConfig, 
     BotStatus, 
     BotStatusEnum,
+    RoundPhaseEnum,
     SessionStats, 
     BettingStrategy,
     ElementConfig,
     GameResult
 )
+from page_observer import ResultObserver
+from page_state import PageSnapshot, read_page_state, parse_page_state, state_selectors
+from round_aligner import AlignedRound, HistoryAligner
+from round_phase import PhaseScheduler
+from element_cache import ElementCache
+from driver_worker import DriverWorker
+from multiplier_tracker import MultiplierTracker
+from round_store import RoundStore
+from ring_buffer import RingBuffer
+from stream_stats import RunningStats
+from strategy_rules import RuleError, default_rule_spec
+from strategy_evaluator import StrategyEvaluator
+from paper_trading import PAPER_PREFIX, PaperTradingManager, virtual_cashout
+from config_loader import atomic_write_json
+from startup import StartupTimeline, document_ready, resolve_chromedriver
 
 logger = logging.getLogger(__name__)
 
+# Rodadas mantidas no buffer circular em memória
+RESULTS_CAPACITY = 1000
+# Nome reservado da regra que decide as apostas no avaliador de estratégias
+ACTIVE_STRATEGY = "active"
+# Seções de configuração (mesmos nomes do credentials.json do config_loader)
+CONFIG_SECTION = "bot_settings"
+ELEMENTS_SECTION = "elements"
+# Seções do estado publicadas pelo /ws (ver status_stream); "phase" tem canal próprio
+STATE_SECTIONS = ("status", "stats")
+# Campos que só valem a partir do próximo início (driver, navegação, banco)
+RESTART_FIELDS = {"headless", "site_url", "game_url", "round_store_path", "chromedriver_path", "driver_cache_path"}
+
 class AviatorBotController:
     """Controlador principal do bot Aviator"""
     
@@ -45,33 +80,58 @@ class AviatorBotController:
         self.config = BotConfig()
         self.elements = ElementConfig()
         self.driver: Optional[webdriver.Chrome] = None
-        self.status = BotStatusEnum.STOPPED
+        # Toda chamada ao Selenium passa pela thread do worker
+        self.driver_worker = DriverWorker()
+        # Mudanças de estado acordam quem publica o status (ver wait_state_change)
+        self.state_changed = asyncio.Event()
+        self.state_version = 0
+        self._dirty_sections: Set[str] = set()
+        self._state_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._status = BotStatusEnum.STOPPED
         self.session_stats = SessionStats()
+        self.multiplier_stats = RunningStats()
         self.betting_strategy: Optional[BettingStrategy] = None
         self.is_betting_active = False
+        self.armed_bet_amount: Optional[float] = None
+        self.bet_latencies: deque = deque(maxlen=200)
+        # Duração das fases do último início (driver, página, login, iframe)
+        self.startup_timeline: Optional[StartupTimeline] = None
+        self.active_bet: Optional[Dict[str, Any]] = None
+        self.multiplier_tracker = MultiplierTracker()
         self.current_balance: Optional[float] = None
-        self.recent_results: List[float] = []
-        self.game_results: List[GameResult] = []
+        self.results = RingBuffer(RESULTS_CAPACITY)
         self.error_message: Optional[str] = None
         self.credentials: Optional[Dict[str, str]] = None
+        self.result_observer: Optional[ResultObserver] = None
+        self.page_state: Optional[PageSnapshot] = None
+        self.history_aligner = HistoryAligner()
+        self.element_cache = ElementCache()
         self._running = False
         self._stop_requested = False
+        # Alterações de configuração aguardando o intervalo entre ciclos
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
         
         # Carregar configurações salvas
         self.load_config()
+        self.phase_scheduler = PhaseScheduler(self.config)
+        # Regra ativa e estratégias candidatas avaliadas sobre o mesmo estado
+        self.strategy_evaluator = StrategyEvaluator()
+        self.paper_trading = PaperTradingManager(self.strategy_evaluator)
+        self.apply_strategy_rule()
+        
+        # Histórico persistente de rodadas (sobrevive a reinícios)
+        self.round_store = RoundStore(self.config.round_store_path, cache_size=RESULTS_CAPACITY)
+        for result in self.round_store.recent(RESULTS_CAPACITY):
+            self.results.append(result.multiplier)
     
     def get_config(self) -> BotConfig:
         """Retorna a configuração atual"""
         return self.config
     
     def update_config(self, updates: Dict[str, Any]) -> BotConfig:
-        """Atualiza a configuração"""
-        for key, value in updates.items():
-            if hasattr(self.config, key):
-                setattr(self.config, key, value)
-        
-        self.save_config()
-        logger.info(f"Configuração atualizada: {updates}")
+        """Atualiza a configuração (com o bot rodando, entre dois ciclos)"""
+        self.stage_update(CONFIG_SECTION, updates)
         return self.config
     
     def get_elements(self) -> ElementConfig:
@@ -79,20 +139,145 @@ class AviatorBotController:
         return self.elements
     
     def update_elements(self, updates: Dict[str, Any]) -> ElementConfig:
-        """Atualiza a configuração de elementos"""
-        for key, value in updates.items():
-            if hasattr(self.elements, key) and value:
-                setattr(self.elements, key, value)
-        
-        self.save_config()
-        logger.info(f"Elementos atualizados: {updates}")
+        """Atualiza a configuração de elementos (com o bot rodando, entre dois ciclos)"""
+        self.stage_update(ELEMENTS_SECTION, updates)
         return self.elements
     
+    def stage_update(self, section: str, updates: Dict[str, Any]) -> None:
+        """
+        Registra alterações de uma seção de configuração. Com o bot parado
+        são aplicadas na hora; rodando, o laço de monitoramento as aplica
+        juntas no próximo intervalo entre ciclos. Também é o listener do
+        config_loader.
+        """
+        if section not in (CONFIG_SECTION, ELEMENTS_SECTION):
+            return
+        with self._pending_lock:
+            self._pending_updates.setdefault(section, {}).update(updates)
+        if not self._running:
+            self.apply_pending_updates()
+    
+    def apply_pending_updates(self) -> bool:
+        """Aplica de uma vez as alterações pendentes; retorna se algo mudou"""
+        with self._pending_lock:
+            pending, self._pending_updates = self._pending_updates, {}
+        if not pending:
+            return False
+        
+        changed = False
+        if CONFIG_SECTION in pending:
+            changed |= self._apply_config_updates(pending[CONFIG_SECTION])
+        if ELEMENTS_SECTION in pending:
+            changed |= self._apply_element_updates(pending[ELEMENTS_SECTION])
+        if changed:
+            self.save_config()
+        return changed
+    
+    def _apply_config_updates(self, updates: Dict[str, Any]) -> bool:
+        values = {key: value for key, value in updates.items() if hasattr(self.config, key)}
+        try:
+            # Validação completa antes de trocar: ou tudo entra, ou nada
+            config = BotConfig(**{**self.config.dict(), **values})
+        except Exception as e:
+            logger.error(f"Configuração inválida ignorada: {e}")
+            return False
+        changed = {key for key in values if getattr(config, key) != getattr(self.config, key)}
+        if not changed:
+            return False
+        
+        previous = self.config
+        self.config = config
+        self.phase_scheduler.config = config
+        if {"strategy_threshold", "min_strategy_checks"} & changed:
+            try:
+                self.apply_strategy_rule(self.betting_strategy)
+            except RuleError as e:
+                self.config = previous
+                self.phase_scheduler.config = previous
+                logger.error(f"Configuração não aplicada (regra inválida): {e}")
+                return False
+        
+        if "paper_mode" in changed:
+            # A aposta em curso liquida no modo em que foi feita; a pré-armada
+            # (valor no campo da página) só vale para apostas reais
+            self.armed_bet_amount = None
+            logger.info("Modo simulado %s", "ativado" if config.paper_mode else "desativado")
+        
+        deferred = changed & RESTART_FIELDS
+        if deferred and self._running:
+            logger.info(f"Alterações aplicadas no próximo início: {sorted(deferred)}")
+        logger.info(f"Configuração atualizada: {sorted(changed)}")
+        return True
+    
+    def _apply_element_updates(self, updates: Dict[str, Any]) -> bool:
+        values = {key: value for key, value in updates.items() if hasattr(self.elements, key) and value}
+        changed = {key for key, value in values.items() if getattr(self.elements, key) != value}
+        if not changed:
+            return False
+        
+        previous = self.elements
+        self.elements = self.elements.copy(update={key: values[key] for key in changed})
+        # Só os seletores alterados saem do cache; os demais continuam válidos
+        for key in changed:
+            self.element_cache.invalidate(By.XPATH, getattr(previous, key))
+        if "result_history" in changed:
+            # O observador é reinstalado no novo container na próxima leitura
+            self.result_observer = None
+        if {"bet_input", "bet_button"} & changed:
+            self.armed_bet_amount = None
+        if "game_iframe" in changed and self._running:
+            logger.info("Novo iframe do jogo aplicado no próximo acesso ao jogo")
+        logger.info(f"Elementos atualizados: {sorted(changed)}")
+        return True
+    
     def set_credentials(self, username: str, password: str) -> None:
         """Define as credenciais de login"""
         self.credentials = {"username": username, "password": password}
         logger.info("Credenciais definidas")
     
+    @property
+    def status(self) -> BotStatusEnum:
+        return self._status
+    
+    @status.setter
+    def status(self, value: BotStatusEnum) -> None:
+        if value != self._status:
+            self._status = value
+            self.notify_state_change()
+    
+    def notify_state_change(self, *sections: str) -> None:
+        """Sinaliza que seções do estado mudaram (padrão: status e estatísticas)"""
+        self._dirty_sections.update(sections or STATE_SECTIONS)
+        self.state_version += 1
+        loop = self._state_loop
+        if loop is None:
+            self.state_changed.set()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self.state_changed.set()
+        elif not loop.is_closed():
+            # Chamado fora do loop (ex.: thread do driver)
+            loop.call_soon_threadsafe(self.state_changed.set)
+    
+    async def wait_state_change(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a próxima mudança de estado; False se o timeout expirar"""
+        self._state_loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self.state_changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.state_changed.clear()
+        return True
+    
+    def take_dirty_sections(self) -> Set[str]:
+        """Seções alteradas desde a última chamada (e limpa as marcas)"""
+        dirty, self._dirty_sections = self._dirty_sections, set()
+        return dirty
+    
     def get_status(self) -> str:
         """Retorna o status atual como string"""
         return self.status.value
@@ -104,40 +289,102 @@ class AviatorBotController:
             is_running=self._running,
             is_betting=self.is_betting_active,
             current_balance=self.current_balance,
-            last_multiplier=self.recent_results[0] if self.recent_results else None,
+            last_multiplier=self.results.last(),
             last_update=datetime.now(),
             error_message=self.error_message,
             current_strategy=self.betting_strategy,
-            recent_results=self.recent_results[:10]
+            recent_results=self.results.latest(10),
+            round_phase=self.phase_scheduler.phase
         )
     
+    def get_uptime(self) -> Optional[str]:
+        """Tempo de execução da sessão, sem microsegundos"""
+        if not self.session_stats.start_time:
+            return self.session_stats.uptime
+        return str(datetime.now() - self.session_stats.start_time).split('.')[0]
+    
     def get_session_stats(self) -> SessionStats:
         """Retorna estatísticas da sessão"""
-        if self.session_stats.start_time:
-            uptime = datetime.now() - self.session_stats.start_time
-            self.session_stats.uptime = str(uptime).split('.')[0]  # Remove microsegundos
+        self.session_stats.uptime = self.get_uptime()
         
-        # Calcular multiplicador médio
-        if self.recent_results:
-            self.session_stats.avg_multiplier = sum(self.recent_results) / len(self.recent_results)
-            self.session_stats.max_multiplier = max(self.recent_results)
+        # Estatísticas de toda a sessão, mantidas incrementalmente (leitura O(1))
+        stats = self.multiplier_stats
+        if stats.count:
+            self.session_stats.avg_multiplier = stats.mean
+            self.session_stats.max_multiplier = stats.max
+            self.session_stats.min_multiplier = stats.min
+            self.session_stats.std_multiplier = stats.std
+            self.session_stats.median_multiplier = stats.quantile(0.5)
+            self.session_stats.p90_multiplier = stats.quantile(0.9)
+            self.session_stats.p99_multiplier = stats.quantile(0.99)
         
         return self.session_stats
     
+    def get_recent_rounds(self, limit: int = 100, since_seq: Optional[int] = None) -> List[GameResult]:
+        """Retorna as rodadas registradas (mais antigas primeiro)"""
+        return self.round_store.query(limit=limit, since_seq=since_seq)
+    
+    def get_phase_timings(self) -> Dict[str, Any]:
+        """Retorna a fase atual e os tempos observados de cada fase"""
+        return self.phase_scheduler.get_timings()
+    
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """Retorna métricas de desempenho do controlador"""
+        return {
+            "element_cache": self.element_cache.get_stats(),
+            "driver_worker": self.driver_worker.get_stats(),
+            "bet_latency": self.get_bet_latency_stats(),
+            "cashout": self.multiplier_tracker.get_stats(),
+            "round_store": self.round_store.get_stats(),
+            "startup": self.startup_timeline.summary() if self.startup_timeline else None,
+            "strategy_evaluator": {
+                "strategies": len(self.strategy_evaluator),
+                "features": self.strategy_evaluator.features.size,
+                "avg_update_us": self.strategy_evaluator.get_stats(names=())["avg_update_us"],
+            }
+        }
+    
+    def mark_startup(self, phase: str) -> None:
+        """Fecha uma fase da linha do tempo de início, se o início ainda não terminou"""
+        timeline = self.startup_timeline
+        if timeline and timeline.total is None:
+            duration = timeline.mark(phase)
+            logger.info("⏱️ Fase %s: %.2fs", phase, duration)
+    
+    def get_bet_latency_stats(self) -> Dict[str, Any]:
+        """Latência entre o disparo da estratégia e o clique de aposta (ms)"""
+        if not self.bet_latencies:
+            return {"count": 0}
+        ordered = sorted(self.bet_latencies)
+        return {
+            "count": len(ordered),
+            "last_ms": self.bet_latencies[-1],
+            "avg_ms": sum(ordered) / len(ordered),
+            "p50_ms": ordered[len(ordered) // 2],
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max_ms": ordered[-1],
+        }
+    
     def is_running(self) -> bool:
         """Verifica se o bot está em execução"""
         return self._running
     
     def start_betting(self, strategy: BettingStrategy) -> None:
         """Inicia apostas automáticas"""
+        # Compila antes de alterar o estado: regra inválida não inicia apostas
+        self.apply_strategy_rule(strategy)
         self.betting_strategy = strategy
         self.is_betting_active = True
+        self.notify_state_change()
         logger.info(f"Apostas automáticas iniciadas com estratégia: {strategy.strategy_type}")
     
     def stop_betting(self) -> None:
         """Para apostas automáticas"""
         self.is_betting_active = False
         self.betting_strategy = None
+        self.armed_bet_amount = None
+        self.apply_strategy_rule()
+        self.notify_state_change()
         logger.info("Apostas automáticas paradas")
     
     def setup_driver(self) -> None:
@@ -172,10 +419,19 @@ class AviatorBotController:
             options.add_experimental_option('excludeSwitches', ['enable-automation'])
             options.add_experimental_option('useAutomationExtension', False)
             options.add_experimental_option('w3c', True)
+            # get/refresh retornam com o DOM pronto; o que falta carregar é
+            # coberto pelas esperas por elemento
+            options.page_load_strategy = 'eager'
             
-            # Inicializar driver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            # Inicializar driver com o chromedriver já resolvido (sem consulta de versão)
+            driver_path = resolve_chromedriver(self.config.driver_cache_path, self.config.chromedriver_path)
+            try:
+                self.driver = webdriver.Chrome(service=Service(driver_path), options=options)
+            except SessionNotCreatedException as e:
+                # Chrome atualizado: o chromedriver em cache deixou de ser compatível
+                logger.warning("chromedriver em cache incompatível (%s); resolvendo novamente", e.msg)
+                driver_path = resolve_chromedriver(self.config.driver_cache_path, refresh=True)
+                self.driver = webdriver.Chrome(service=Service(driver_path), options=options)
             
             # Executar script para evitar detecção
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -191,14 +447,36 @@ class AviatorBotController:
             self.status = BotStatusEnum.ERROR
             raise
     
+    def with_cached_element(self, by: By, value: str, condition, action, timeout: int):
+        """
+        Executa `action` sobre o elemento em cache, resolvendo com `condition`
+        apenas na primeira vez ou depois que o elemento ficar obsoleto
+        """
+        def resolve():
+            return WebDriverWait(self.driver, timeout).until(condition((by, value)))
+        
+        for attempt in range(2):
+            element = self.element_cache.get(by, value, resolve)
+            try:
+                return action(element)
+            except StaleElementReferenceException:
+                self.element_cache.mark_stale(by, value)
+                if attempt:
+                    raise
+    
     def wait_and_click(self, by: By, value: str, timeout: int = None) -> bool:
         """Aguarda elemento e clica com tratamento de erro"""
         timeout = timeout or self.config.wait_timeout
+        
+        def click(element):
+            try:
+                element.click()
+            except (ElementClickInterceptedException, ElementNotInteractableException):
+                # Elemento em cache ainda não clicável: aguarda sem novo XPath
+                WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(element)).click()
+        
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((by, value))
-            )
-            element.click()
+            self.with_cached_element(by, value, EC.element_to_be_clickable, click, timeout)
             return True
         except TimeoutException:
             logger.error(f"Timeout ao aguardar elemento: {value}")
@@ -210,12 +488,13 @@ class AviatorBotController:
     def wait_and_send_keys(self, by: By, value: str, text: str, timeout: int = None) -> bool:
         """Aguarda elemento e envia texto com tratamento de erro"""
         timeout = timeout or self.config.wait_timeout
-        try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by, value))
-            )
+        
+        def send_keys(element):
             element.clear()
             element.send_keys(text)
+        
+        try:
+            self.with_cached_element(by, value, EC.presence_of_element_located, send_keys, timeout)
             return True
         except TimeoutException:
             logger.error(f"Timeout ao aguardar elemento: {value}")
@@ -233,40 +512,34 @@ class AviatorBotController:
             if not self.credentials:
                 raise Exception("Credenciais não configuradas")
             
-            # Navegar para o site
-            self.driver.get(self.config.site_url)
-            await asyncio.sleep(5)
-            
-            # Atualizar página
-            logger.info("Atualizando página...")
-            self.driver.refresh()
-            await asyncio.sleep(5)
+            # Navegar para o site e atualizar a página
+            await self.driver_worker.run(self.open_site)
+            self.mark_startup("page_load")
             
             # Aceitar cookies
             logger.info("Aguardando botão de cookies...")
-            if self.wait_and_click(By.XPATH, self.elements.cookies_button):
+            if await self.driver_worker.run(self.accept_cookies):
                 logger.info("Cookies aceitos")
-                await asyncio.sleep(3)
             
-            # Inserir credenciais
+            # Inserir credenciais (cada campo é aguardado antes de receber o texto)
             logger.info("Inserindo usuário...")
-            if not self.wait_and_send_keys(By.XPATH, self.elements.username_field, self.credentials["username"]):
+            if not await self.driver_worker.run(
+                self.wait_and_send_keys, By.XPATH, self.elements.username_field, self.credentials["username"]
+            ):
                 return False
             
-            await asyncio.sleep(2)
-            
             logger.info("Inserindo senha...")
-            if not self.wait_and_send_keys(By.XPATH, self.elements.password_field, self.credentials["password"]):
+            if not await self.driver_worker.run(
+                self.wait_and_send_keys, By.XPATH, self.elements.password_field, self.credentials["password"]
+            ):
                 return False
             
-            await asyncio.sleep(2)
-            
             # Clicar no botão de login
             logger.info("Clicando no botão de login...")
-            if not self.wait_and_click(By.XPATH, self.elements.login_button):
+            if not await self.driver_worker.run(self.submit_login):
                 return False
             
-            await asyncio.sleep(5)
+            self.mark_startup("login")
             self.status = BotStatusEnum.LOGGED_IN
             logger.info("Login realizado com sucesso")
             return True
@@ -278,21 +551,72 @@ class AviatorBotController:
             self.session_stats.errors += 1
             return False
     
+    def open_site(self) -> None:
+        """Abre o site e atualiza a página, aguardando o DOM a cada carga (thread do driver)"""
+        wait = WebDriverWait(self.driver, self.config.wait_timeout)
+        self.driver.get(self.config.site_url)
+        wait.until(document_ready)
+        
+        logger.info("Atualizando página...")
+        self.driver.refresh()
+        self.element_cache.invalidate()
+        wait.until(document_ready)
+    
+    def accept_cookies(self) -> bool:
+        """Fecha o aviso de cookies, se aparecer dentro do prazo curto (thread do driver)"""
+        timeout = self.config.optional_element_timeout
+        if not self.wait_and_click(By.XPATH, self.elements.cookies_button, timeout):
+            return False
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.invisibility_of_element_located((By.XPATH, self.elements.cookies_button))
+            )
+        except TimeoutException:
+            logger.warning("Aviso de cookies ainda visível após %ss", timeout)
+        return True
+    
+    def submit_login(self) -> bool:
+        """Clica em entrar e aguarda o formulário sumir ou a URL mudar (thread do driver)"""
+        url = self.driver.current_url
+        if not self.wait_and_click(By.XPATH, self.elements.login_button):
+            return False
+        try:
+            WebDriverWait(self.driver, self.config.wait_timeout).until(EC.any_of(
+                EC.invisibility_of_element_located((By.XPATH, self.elements.password_field)),
+                EC.url_changes(url),
+            ))
+        except TimeoutException:
+            # Mesmo comportamento de antes: segue e o acesso ao jogo confirma a sessão
+            logger.warning("Formulário de login ainda visível após %ss", self.config.wait_timeout)
+        return True
+    
+    def enter_game_frame(self) -> None:
+        """Abre o jogo, entra no iframe e aguarda o histórico (executado na thread do driver)"""
+        wait = WebDriverWait(self.driver, self.config.wait_timeout)
+        self.driver.get(self.config.game_url)
+        
+        # Aguardar iframe do jogo
+        logger.info("Aguardando frame do jogo...")
+        iframe = wait.until(EC.presence_of_element_located((By.ID, self.elements.game_iframe)))
+        
+        # Mudar para o iframe; elementos do documento anterior deixam de valer
+        self.driver.switch_to.frame(iframe)
+        self.element_cache.invalidate()
+        
+        # Jogo pronto quando o histórico de resultados existe no iframe
+        wait.until(EC.presence_of_element_located((By.CLASS_NAME, self.elements.result_history)))
+    
     async def access_game(self) -> bool:
         """Acessa o jogo Aviator"""
         try:
             logger.info("Acessando jogo Aviator...")
-            self.driver.get(self.config.game_url)
+            await self.driver_worker.run(self.enter_game_frame)
+            self.mark_startup("iframe_ready")
             
-            # Aguardar iframe do jogo
-            logger.info("Aguardando frame do jogo...")
-            iframe = WebDriverWait(self.driver, self.config.wait_timeout).until(
-                EC.presence_of_element_located((By.ID, self.elements.game_iframe))
-            )
-            
-            # Mudar para o iframe
-            self.driver.switch_to.frame(iframe)
-            await asyncio.sleep(5)
+            # Observador precisa ser (re)instalado no novo contexto do iframe
+            self.result_observer = None
+            self.history_aligner.reset()
+            self.strategy_evaluator.reset()
             
             self.status = BotStatusEnum.IN_GAME
             logger.info("Jogo acessado com sucesso")
@@ -310,69 +634,146 @@ class AviatorBotController:
             self.session_stats.errors += 1
             return False
     
-    def verify_strategy(self, results: List[float]) -> bool:
-        """Verifica se a estratégia é válida baseada nos últimos resultados"""
-        if len(results) < self.config.min_strategy_checks:
+    def strategy_rule_spec(self, strategy: Optional[BettingStrategy] = None) -> Dict[str, Any]:
+        """Regra da estratégia ou a padrão da configuração"""
+        if strategy and strategy.rule:
+            return strategy.rule
+        return default_rule_spec(self.config.strategy_threshold, self.config.min_strategy_checks)
+    
+    def apply_strategy_rule(self, strategy: Optional[BettingStrategy] = None) -> None:
+        """Observa a regra da estratégia (ou a padrão) como regra ativa"""
+        self.strategy_evaluator.watch(ACTIVE_STRATEGY, self.strategy_rule_spec(strategy))
+    
+    def watch_strategy(self, name: str, rule: Dict[str, Any]) -> None:
+        """Passa a avaliar uma estratégia candidata a cada rodada (sem apostar)"""
+        if name == ACTIVE_STRATEGY or name.startswith(PAPER_PREFIX):
+            raise RuleError(f"Nome reservado: {name}")
+        self.strategy_evaluator.watch(name, rule)
+        logger.info(f"Estratégia candidata observada: {name}")
+    
+    def unwatch_strategy(self, name: str) -> bool:
+        """Deixa de avaliar uma estratégia candidata"""
+        if name == ACTIVE_STRATEGY or name.startswith(PAPER_PREFIX) or name not in self.strategy_evaluator:
             return False
-        
-        # Estratégia: verificar se os últimos resultados são menores que o threshold
-        recent_results = results[:self.config.min_strategy_checks]
-        return all(result < self.config.strategy_threshold for result in recent_results)
+        self.strategy_evaluator.unwatch(name)
+        return True
     
-    def get_game_results(self) -> Optional[List[float]]:
-        """Obtém os resultados do histórico do jogo"""
+    def get_watched_strategies(self) -> Dict[str, Any]:
+        """Gatilhos da regra ativa e das candidatas"""
+        return self.strategy_evaluator.get_stats()
+    
+    def add_paper_portfolio(self, name: str, strategy: BettingStrategy) -> Dict[str, Any]:
+        """Cria um portfólio simulado sobre as rodadas ao vivo"""
+        portfolio = self.paper_trading.add(name, strategy, self.strategy_rule_spec(strategy))
+        return portfolio.summary()
+    
+    def remove_paper_portfolio(self, name: str) -> bool:
+        """Remove um portfólio simulado"""
+        return self.paper_trading.remove(name)
+    
+    def read_page_state(self) -> Optional[PageSnapshot]:
+        """Lê histórico, saldo, multiplicador e botões em uma única chamada"""
         try:
-            history_element = self.driver.find_element(By.CLASS_NAME, self.elements.result_history)
-            history_text = history_element.text.replace('x', '').strip()
-            
-            if not history_text:
-                return None
-            
-            results = [float(n) for n in history_text.split('\n') if n.strip()]
-            return results[:self.config.history_size]
-            
-        except (NoSuchElementException, ValueError) as e:
-            logger.warning(f"Erro ao obter resultados: {e}")
-            return None
+            snapshot = read_page_state(self.driver, self.elements, self.config.history_size)
         except Exception as e:
-            logger.error(f"Erro inesperado ao obter resultados: {e}")
+            logger.error("Erro ao ler estado da página: %s", e)
             return None
+        
+        if snapshot:
+            self.page_state = snapshot
+        return snapshot
+    
+    def get_game_results(self) -> Optional[List[float]]:
+        """Obtém os resultados do histórico do jogo a partir do último snapshot"""
+        return self.page_state.history if self.page_state else None
     
     def get_current_balance(self) -> Optional[float]:
-        """Obtém o saldo atual"""
+        """Obtém o saldo atual a partir do último snapshot"""
+        return self.page_state.balance if self.page_state else None
+    
+    def arm_bet(self, amount: float) -> bool:
+        """
+        Pré-arma a aposta: localiza campo e botão (ficam no cache de elementos)
+        e deixa o valor planejado preenchido. Executado na thread do driver.
+        """
+        timeout = self.config.wait_timeout
+        
+        def fill(element):
+            element.clear()
+            element.send_keys(str(amount))
+        
         try:
-            if self.elements.balance_display:
-                balance_element = self.driver.find_element(By.XPATH, self.elements.balance_display)
-                balance_text = balance_element.text.replace('R$', '').replace(',', '.').strip()
-                return float(balance_text)
+            self.with_cached_element(By.XPATH, self.elements.bet_input, EC.presence_of_element_located, fill, timeout)
+            self.with_cached_element(By.XPATH, self.elements.bet_button, EC.presence_of_element_located, lambda element: None, timeout)
         except Exception as e:
-            logger.warning(f"Erro ao obter saldo: {e}")
-        return None
+            logger.warning("Erro ao pré-armar aposta: %s", e)
+            self.armed_bet_amount = None
+            return False
+        
+        self.armed_bet_amount = amount
+        logger.debug("Aposta pré-armada: R$ %s", amount)
+        return True
+    
+    def is_bet_armed(self, amount: float) -> bool:
+        """Verifica se o campo de aposta já contém o valor planejado"""
+        if self.armed_bet_amount is None or round(self.armed_bet_amount, 2) != round(amount, 2):
+            return False
+        # O snapshot mostra o valor real do campo; o jogo pode tê-lo alterado
+        filled = self.page_state.bet_amount if self.page_state else None
+        return filled is None or round(filled, 2) == round(amount, 2)
+    
+    async def prearm_bet(self) -> None:
+        """Mantém a próxima aposta planejada pré-armada durante a janela de apostas"""
+        if not self.is_betting_active or not self.betting_strategy or self.config.paper_mode:
+            return
+        # Fora da janela (rodada em voo) ou com aposta em aberto o campo não aceita valor
+        if self.phase_scheduler.phase != RoundPhaseEnum.BETTING or self.active_bet is not None:
+            return
+        if not self.elements.bet_input or not self.elements.bet_button:
+            return
+        
+        amount = self.betting_strategy.calculate_bet_amount(self.session_stats)
+        if not self.is_bet_armed(amount):
+            await self.driver_worker.run(self.arm_bet, amount)
     
-    async def place_bet(self, amount: float) -> bool:
-        """Realiza uma aposta"""
+    async def place_bet(self, amount: float, triggered_at: Optional[float] = None) -> bool:
+        """
+        Realiza uma aposta. Com a aposta pré-armada basta um clique;
+        `triggered_at` (time.monotonic) mede a latência desde o disparo.
+        """
         try:
             if not self.elements.bet_input or not self.elements.bet_button:
                 logger.warning("Elementos de aposta não configurados")
                 return False
             
-            # Inserir valor da aposta
-            if not self.wait_and_send_keys(By.XPATH, self.elements.bet_input, str(amount)):
+            # Botão conhecido como indisponível no último snapshot: nem tenta
+            bet_button = self.page_state.bet_button if self.page_state else None
+            if bet_button and not bet_button.clickable:
+                logger.warning("Botão de aposta indisponível no momento")
                 return False
             
-            await asyncio.sleep(1)
+            # Valor ainda não preenchido: arma agora (sem espera fixa)
+            if not self.is_bet_armed(amount):
+                if not await self.driver_worker.run(self.arm_bet, amount):
+                    return False
             
             # Clicar no botão de apostar
-            if not self.wait_and_click(By.XPATH, self.elements.bet_button):
+            if not await self.driver_worker.run(self.wait_and_click, By.XPATH, self.elements.bet_button):
                 return False
             
+            if triggered_at is not None:
+                latency_ms = (time.monotonic() - triggered_at) * 1000
+                self.bet_latencies.append(latency_ms)
+                logger.info("Aposta de R$ %s realizada (%.0f ms após o disparo)", amount, latency_ms)
+            else:
+                logger.info("Aposta de R$ %s realizada", amount)
+            
             self.session_stats.bets_placed += 1
             self.session_stats.total_bet += amount
-            logger.info(f"Aposta de R$ {amount} realizada")
             return True
             
         except Exception as e:
-            logger.error(f"Erro ao realizar aposta: {e}")
+            logger.error("Erro ao realizar aposta: %s", e)
             return False
     
     async def cashout(self) -> bool:
@@ -382,69 +783,236 @@ class AviatorBotController:
                 logger.warning("Elemento de cashout não configurado")
                 return False
             
-            if self.wait_and_click(By.XPATH, self.elements.cashout_button):
+            cashout_button = self.page_state.cashout_button if self.page_state else None
+            if cashout_button and not cashout_button.visible:
+                logger.warning("Botão de cashout indisponível no momento")
+                return False
+            
+            if await self.driver_worker.run(self.wait_and_click, By.XPATH, self.elements.cashout_button):
                 logger.info("Cashout realizado")
                 return True
             return False
             
         except Exception as e:
-            logger.error(f"Erro ao realizar cashout: {e}")
+            logger.error("Erro ao realizar cashout: %s", e)
             return False
     
+    def record_cashout(self, bet: Dict[str, Any], multiplier: float, fallback: bool = False) -> None:
+        """Registra o cashout de uma aposta"""
+        bet["cashout"] = multiplier
+        overshoot = self.multiplier_tracker.record_cashout(bet["target"], multiplier, fallback)
+        logger.info("💸 Cashout em %sx (alvo %sx, desvio %+.2f)", multiplier, bet['target'], overshoot)
+    
+    async def track_cashout(self, snapshot: Optional[PageSnapshot]) -> None:
+        """Acompanha o rastreador da página durante o voo da aposta"""
+        if not self.active_bet or self.active_bet["cashout"] is not None or self.active_bet.get("paper"):
+            return
+        if not snapshot or not snapshot.tracker:
+            return
+        
+        state = snapshot.tracker
+        if state.fired:
+            self.record_cashout(self.active_bet, state.cashout)
+        elif self.multiplier_tracker.needs_fallback(state):
+            # O clique na página falhou (botão não encontrado); tenta pelo driver
+            logger.warning("Alvo %sx atingido sem cashout na página; usando o driver", state.target)
+            if await self.cashout():
+                self.record_cashout(self.active_bet, state.last, fallback=True)
+    
+    async def settle_bet(self, crash_multiplier: float) -> Dict[str, Any]:
+        """Liquida a aposta em andamento com o multiplicador final da rodada"""
+        bet = self.active_bet
+        self.active_bet = None
+        
+        if bet.get("paper"):
+            # Aposta simulada: cashout automático no alvo se o crash o atingiu
+            bet["cashout"] = virtual_cashout(bet["target"], crash_multiplier)
+        elif bet["target"]:
+            final_state = await self.driver_worker.run(self.multiplier_tracker.disarm, self.driver)
+            if final_state and final_state.fired and bet["cashout"] is None:
+                self.record_cashout(bet, final_state.cashout)
+        
+        amount = bet["amount"]
+        if bet["cashout"] is not None:
+            profit = amount * (bet["cashout"] - 1)
+            self.session_stats.wins += 1
+            logger.info("✅ Aposta ganha: +R$ %.2f", profit)
+        else:
+            profit = -amount
+            self.session_stats.losses += 1
+            if bet["target"] and crash_multiplier >= bet["target"] and not bet.get("paper"):
+                self.multiplier_tracker.missed += 1
+            logger.info("❌ Aposta perdida: -R$ %.2f (crash em %sx)", amount, crash_multiplier)
+        
+        self.session_stats.total_profit += profit
+        self.status = BotStatusEnum.MONITORING
+        return {"bet_amount": amount, "cashout_multiplier": bet["cashout"], "profit": profit}
+    
+    async def process_results(self, current_results: List[float]) -> int:
+        """Processa uma nova janela do histórico e retorna quantas rodadas eram novas"""
+        alignment = self.history_aligner.align(current_results)
+        if alignment.gap:
+            self.session_stats.history_gaps += 1
+        if alignment.corrected:
+            self.apply_round_correction(alignment.corrected)
+        
+        # O estado das regras parte do histórico da página na primeira leitura,
+        # após uma ressincronização ou correção; depois só as rodadas novas o atualizam
+        evaluator = self.strategy_evaluator
+        if alignment.resynced or alignment.corrected or not evaluator.rounds:
+            evaluator.seed(reversed(current_results[len(alignment.rounds):]))
+        
+        if not alignment.rounds:
+            if alignment.corrected:
+                self.notify_state_change()
+            return 0
+        
+        # Atualizar saldo (já lido no mesmo snapshot do histórico)
+        self.current_balance = self.get_current_balance()
+        
+        # Cada rodada nova é avaliada com a janela como estava logo após ela
+        for aligned in alignment.rounds:
+            self.session_stats.total_rounds += 1
+            window = current_results[aligned.position:]
+            is_latest = aligned.position == 0
+            
+            # A aposta feita antes desta rodada é liquidada pelo seu crash
+            bet_result: Dict[str, Any] = {}
+            if self.active_bet:
+                bet_result = await self.settle_bet(aligned.multiplier)
+            
+            # Verificar estratégia (regra ativa e candidatas em uma atualização)
+            evaluator.update(aligned.multiplier)
+            strategy_triggered = evaluator.is_triggered(ACTIVE_STRATEGY)
+            self.paper_trading.on_round(aligned.multiplier, can_bet=is_latest)
+            triggered_at = time.monotonic()
+            if strategy_triggered:
+                self.session_stats.strategies_found += 1
+                logger.info("🎯 ESTRATÉGIA ENCONTRADA! Últimos resultados: %s", window[:4])
+                
+                # Só a rodada mais recente ainda permite apostar na próxima
+                if is_latest and self.is_betting_active and self.betting_strategy:
+                    await self.execute_betting_strategy(triggered_at)
+            
+            else:
+                logger.info("📈 Resultados atuais: %s (estratégia não ativada)", window[:4])
+            
+            # Registrar resultado
+            game_result = GameResult(
+                multiplier=aligned.multiplier,
+                round_seq=aligned.seq,
+                strategy_triggered=strategy_triggered,
+                **bet_result
+            )
+            self.round_store.append(game_result)
+            self.results.append(aligned.multiplier)
+            self.multiplier_stats.add(aligned.multiplier)
+        
+        # Uma notificação por lote de rodadas (saldo, resultados e estatísticas)
+        self.notify_state_change()
+        return len(alignment.rounds)
+    
+    def apply_round_correction(self, corrected: AlignedRound) -> None:
+        """Corrige a última rodada registrada, relida com outro valor"""
+        logger.warning("Rodada %s corrigida para %sx após releitura do histórico", corrected.seq, corrected.multiplier)
+        self.session_stats.history_corrections += 1
+        self.round_store.correct(corrected.seq, corrected.multiplier)
+        self.results.replace_last(corrected.multiplier)
+        # Estatísticas agregadas e apostas já liquidadas com o valor antigo ficam como estão
+    
+    def observe_phase(self, snapshot: Optional[PageSnapshot], new_round: bool = False) -> None:
+        """Atualiza a fase da rodada, notificando quando ela muda"""
+        previous = self.phase_scheduler.phase
+        if self.phase_scheduler.observe(snapshot, new_round) != previous:
+            self.notify_state_change("phase")
+    
+    async def poll_results(self) -> bool:
+        """Lê o estado da página diretamente (modo polling)"""
+        snapshot = await self.driver_worker.run(self.read_page_state)
+        if not snapshot or not snapshot.history:
+            self.observe_phase(None)
+            logger.warning("Não foi possível obter resultados")
+            return False
+        
+        await self.track_cashout(snapshot)
+        new_rounds = await self.process_results(snapshot.history)
+        self.observe_phase(snapshot, new_round=new_rounds > 0)
+        await self.prearm_bet()
+        return True
+    
+    async def drain_observed_results(self) -> Optional[int]:
+        """
+        Aguarda novas rodadas do observador da página (modo observer).
+        Retorna o número de eventos processados ou None se o observador
+        não está disponível.
+        """
+        if not self.result_observer:
+            self.result_observer = ResultObserver(self.driver, self.elements.result_history)
+        
+        # Sem apostas ativas só o crash importa e ele chega por push; com apostas
+        # o agendador de fases limita a espera para acompanhar a rodada
+        timeout = self.config.observer_timeout
+        if self.is_betting_active:
+            timeout = min(timeout, self.phase_scheduler.next_interval())
+        
+        # A chamada assíncrona bloqueia até a próxima mutação na thread do driver;
+        # alteração de configuração feita durante a espera entra no laço logo
+        # depois que ela termina (rodada nova, cashout ou timeout)
+        payload = await self.driver_worker.run(
+            self.result_observer.drain,
+            timeout,
+            state_selectors(self.elements)
+        )
+        if payload is None:
+            return None
+        
+        snapshot = parse_page_state(payload.get("state"), self.config.history_size)
+        if snapshot:
+            self.page_state = snapshot
+            await self.track_cashout(snapshot)
+        
+        events = payload.get("events") or []
+        new_rounds = 0
+        for event in events:
+            results = event.get("history") or []
+            new_rounds += await self.process_results(results[:self.config.history_size])
+        self.observe_phase(snapshot, new_round=new_rounds > 0)
+        await self.prearm_bet()
+        
+        if events:
+            latency_ms = datetime.now().timestamp() * 1000 - events[-1].get("ts", 0)
+            logger.debug("Latência de detecção da rodada: %.0f ms", latency_ms)
+        return len(events)
+    
     async def monitor_game(self) -> None:
         """Monitora o jogo e aplica estratégias"""
-        logger.info("Iniciando monitoramento do jogo")
+        logger.info(f"Iniciando monitoramento do jogo (modo {self.config.ingestion_mode})")
         self.status = BotStatusEnum.MONITORING
         
         while self._running and not self._stop_requested:
             try:
-                # Obter resultados atuais
-                current_results = self.get_game_results()
+                # Configuração alterada durante a sessão entra entre dois ciclos
+                self.apply_pending_updates()
                 
-                if current_results is None:
-                    logger.warning("Não foi possível obter resultados")
+                if self.config.ingestion_mode == "observer":
+                    if await self.drain_observed_results() is not None:
+                        continue
+                    # Observador indisponível: faz uma leitura direta nesta iteração
+                    logger.warning("Observador indisponível, usando leitura direta")
+                
+                if not await self.poll_results():
                     await asyncio.sleep(5)
                     continue
                 
-                # Verificar se houve mudança nos resultados
-                if current_results != self.recent_results:
-                    self.recent_results = current_results
-                    self.session_stats.total_rounds += 1
-                    
-                    # Atualizar saldo
-                    self.current_balance = self.get_current_balance()
-                    
-                    # Verificar estratégia
-                    if self.verify_strategy(current_results):
-                        self.session_stats.strategies_found += 1
-                        logger.info(f"🎯 ESTRATÉGIA ENCONTRADA! Últimos resultados: {current_results[:4]}")
-                        
-                        # Se apostas automáticas estão ativas, realizar aposta
-                        if self.is_betting_active and self.betting_strategy:
-                            await self.execute_betting_strategy()
-                    
-                    else:
-                        logger.info(f"📈 Resultados atuais: {current_results[:4]} (estratégia não ativada)")
-                    
-                    # Registrar resultado
-                    game_result = GameResult(
-                        multiplier=current_results[0],
-                        strategy_triggered=self.verify_strategy(current_results)
-                    )
-                    self.game_results.append(game_result)
-                    
-                    # Manter apenas os últimos 100 resultados
-                    if len(self.game_results) > 100:
-                        self.game_results = self.game_results[-100:]
-                
-                await asyncio.sleep(self.config.update_interval)
+                await asyncio.sleep(self.phase_scheduler.next_interval())
                 
             except Exception as e:
-                logger.error(f"Erro durante monitoramento: {e}")
+                logger.error("Erro durante monitoramento: %s", e)
                 self.session_stats.errors += 1
+                self.notify_state_change()
                 await asyncio.sleep(5)
     
-    async def execute_betting_strategy(self) -> None:
+    async def execute_betting_strategy(self, triggered_at: Optional[float] = None) -> None:
         """Executa a estratégia de aposta"""
         try:
             if not self.betting_strategy:
@@ -463,25 +1031,36 @@ class AviatorBotController:
                     self.stop_betting()
                     return
             
-            # Calcular valor da aposta
-            bet_amount = self.betting_strategy.amount
+            # Calcular valor da aposta (com progressão)
+            bet_amount = self.betting_strategy.calculate_bet_amount(self.session_stats)
             
-            # Aposta progressiva
-            if self.betting_strategy.progressive_betting and self.session_stats.losses > 0:
-                bet_amount *= (self.betting_strategy.progression_factor ** self.session_stats.losses)
+            # Modo simulado: mesma decisão, sem clique; liquidada pelo crash observado
+            if self.config.paper_mode:
+                self.session_stats.bets_placed += 1
+                self.session_stats.total_bet += bet_amount
+                self.active_bet = {
+                    "amount": bet_amount, "target": self.betting_strategy.auto_cashout,
+                    "cashout": None, "paper": True
+                }
+                self.notify_state_change()
+                logger.info("Aposta simulada: R$ %s", bet_amount)
+                return
             
             # Realizar aposta
-            if await self.place_bet(bet_amount):
+            if await self.place_bet(bet_amount, triggered_at):
                 self.status = BotStatusEnum.BETTING
+                target = self.betting_strategy.auto_cashout
+                self.active_bet = {"amount": bet_amount, "target": target, "cashout": None}
                 
-                # Aguardar resultado da aposta
-                # Aqui você implementaria a lógica para aguardar o resultado
-                # e realizar cashout automático se configurado
+                # Cashout automático: o rastreador da página clica ao atingir o alvo
+                if target:
+                    await self.driver_worker.run(self.multiplier_tracker.arm, self.driver, self.elements, target)
                 
-                logger.info(f"Aposta executada: R$ {bet_amount}")
+                self.notify_state_change()
+                logger.info("Aposta executada: R$ %s", bet_amount)
             
         except Exception as e:
-            logger.error(f"Erro ao executar estratégia de aposta: {e}")
+            logger.error("Erro ao executar estratégia de aposta: %s", e)
     
     async def start(self) -> None:
         """Inicia o bot"""
@@ -492,12 +1071,21 @@ class AviatorBotController:
             self._running = True
             self._stop_requested = False
             self.session_stats = SessionStats()  # Reset stats
+            self.multiplier_stats = RunningStats()
+            self.active_bet = None
+            # Sequência de rodadas continua a partir do que já está gravado
+            self.history_aligner = HistoryAligner(start_seq=self.round_store.last_seq() + 1)
+            self.strategy_evaluator.reset()
+            self.phase_scheduler = PhaseScheduler(self.config)
             self.error_message = None
+            self.startup_timeline = StartupTimeline()
             
             logger.info("🚀 Iniciando Bot Aviator")
             
-            # Configurar driver
-            self.setup_driver()
+            # Configurar driver (criado e usado somente pela thread do worker)
+            self.driver_worker.start()
+            await self.driver_worker.run(self.setup_driver)
+            self.mark_startup("driver_spawn")
             
             # Fazer login
             if not await self.login():
@@ -507,6 +1095,9 @@ class AviatorBotController:
             if not await self.access_game():
                 raise Exception("Falha ao acessar jogo")
             
+            total = self.startup_timeline.finish()
+            logger.info("⏱️ Início a frio até o monitoramento: %.2fs (%s)", total, self.startup_timeline.describe())
+            
             # Monitorar jogo
             await self.monitor_game()
             
@@ -543,10 +1134,13 @@ class AviatorBotController:
         """Limpa recursos e fecha o driver"""
         try:
             if self.driver:
-                self.driver.quit()
+                await self.driver_worker.run(self.driver.quit)
                 logger.info("Driver fechado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao fechar driver: {e}")
+        finally:
+            self.driver_worker.stop()
+            self.round_store.close()
     
     def save_config(self) -> None:
         """Salva configurações em arquivo"""
@@ -556,8 +1150,7 @@ class AviatorBotController:
                 "elements": self.elements.dict()
             }
             
-            with open('bot_config.json', 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+            atomic_write_json(Path('bot_config.json'), config_data, indent=4)
             
             logger.info("Configurações salvas")
         except Exception as e:
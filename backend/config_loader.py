@@ -2,16 +2,60 @@
 # -*- coding: utf-8 -*-
 """
 Carregador de configurações seguras do Aviator Bot
+
+O conteúdo de credentials.json fica em memória e só é relido quando o mtime
+ou o tamanho do arquivo mudam (conferidos no máximo a cada STAT_INTERVAL),
+já que a pasta pode estar em um pen drive lento. Gravações atualizam a
+memória na hora e vão para o disco depois de WRITE_DEBOUNCE segundos, uma
+única vez para uma rajada de alterações, sempre via arquivo temporário +
+rename para que o arquivo nunca fique pela metade. save_credentials grava na
+hora e só informa sucesso depois do fsync.
+
+O JSON é montado sob o lock do cache; a gravação e o fsync (lentos no pen
+drive) acontecem fora dele, para não travar leituras nem alterações. Um
+segundo lock mantém as gravações em ordem.
 """
 
+import copy
 import json
 import os
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Intervalo mínimo entre verificações do arquivo (s)
+STAT_INTERVAL = 1.0
+# Espera para agrupar gravações (s)
+WRITE_DEBOUNCE = 0.5
+
+
+def atomic_write_json(path: Path, data: Any, indent: int = 2) -> None:
+    """Grava JSON em um temporário na mesma pasta e substitui o arquivo de uma vez"""
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Grava texto em um temporário na mesma pasta e substitui o arquivo de uma vez"""
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
 class ConfigLoader:
     """Carregador de configurações seguras"""
     
@@ -32,6 +76,23 @@ class ConfigLoader:
             
         self.credentials_file = self.aviator_folder / "credentials.json"
         
+        # Cache do arquivo: conteúdo, (mtime_ns, tamanho) e última verificação
+        self._lock = threading.RLock()
+        # Uma gravação por vez, na ordem das alterações (tomado antes de _lock)
+        self._write_lock = threading.Lock()
+        # Incrementada a cada alteração em memória
+        self._generation = 0
+        self._data: Optional[Dict[str, Any]] = None
+        self._file_key: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self.disk_reads = 0
+        self.disk_writes = 0
+        self.coalesced_writes = 0
+        # Chamados com (seção, valores) após cada update_config
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        
     def ensure_aviator_folder(self) -> bool:
         """Garante que a pasta AVIATOR existe"""
         try:
@@ -41,62 +102,144 @@ class ConfigLoader:
             logger.error(f"Erro ao criar pasta AVIATOR: {e}")
             return False
     
-    def load_credentials(self) -> Optional[Dict[str, Any]]:
-        """Carrega as credenciais do arquivo seguro"""
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
         try:
-            if not self.credentials_file.exists():
-                logger.warning(f"Arquivo de credenciais não encontrado: {self.credentials_file}")
+            stat = self.credentials_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """Conteúdo do arquivo (cache em memória); None se não existe"""
+        with self._lock:
+            # Alterações ainda não gravadas valem mais que o disco
+            if self._dirty:
+                return self._data
+            
+            now = time.monotonic()
+            if self._checked_at and now - self._checked_at < STAT_INTERVAL:
+                return self._data
+            first_check = not self._checked_at
+            self._checked_at = now
+            
+            key = self._stat_key()
+            if key is None:
+                if first_check or self._file_key is not None:
+                    logger.warning(f"Arquivo de credenciais não encontrado: {self.credentials_file}")
+                self._data, self._file_key = None, None
                 return None
-                
+            if key == self._file_key:
+                return self._data
+            
             with open(self.credentials_file, 'r', encoding='utf-8') as f:
-                credentials = json.load(f)
+                self._data = json.load(f)
+            self._file_key = key
+            self.disk_reads += 1
+            logger.info("Credenciais carregadas com sucesso")
+            return self._data
+    
+    def _configured(self) -> Optional[Dict[str, Any]]:
+        """Credenciais em cache (sem cópia) ou None se ausentes/não configuradas"""
+        try:
+            credentials = self._read()
+            if credentials is None:
+                return None
                 
             # Validar se as credenciais foram configuradas
             if credentials.get('username') == 'seu_usuario_aqui':
                 logger.warning("Credenciais não foram configuradas ainda")
                 return None
                 
-            logger.info("Credenciais carregadas com sucesso")
             return credentials
             
         except Exception as e:
             logger.error(f"Erro ao carregar credenciais: {e}")
             return None
     
+    def load_credentials(self) -> Optional[Dict[str, Any]]:
+        """Carrega as credenciais do arquivo seguro (cópia; alterar não afeta o cache)"""
+        credentials = self._configured()
+        return copy.deepcopy(credentials) if credentials is not None else None
+    
+    def _section(self, name: str, default: Dict[str, Any]) -> Dict[str, Any]:
+        credentials = self._configured()
+        if not credentials or name not in credentials:
+            return default
+        # Seções são planas: cópia rasa basta para o chamador poder alterar
+        return copy.copy(credentials[name])
+    
     def save_credentials(self, credentials: Dict[str, Any]) -> bool:
-        """Salva as credenciais no arquivo seguro"""
+        """Salva as credenciais e grava no disco; True só depois da gravação"""
         try:
-            self.ensure_aviator_folder()
-            
-            with open(self.credentials_file, 'w', encoding='utf-8') as f:
-                json.dump(credentials, f, indent=2, ensure_ascii=False)
-                
-            logger.info("Credenciais salvas com sucesso")
-            return True
-            
+            self._store(credentials)
         except Exception as e:
             logger.error(f"Erro ao salvar credenciais: {e}")
             return False
+        return self.flush()
+    
+    def _store(self, credentials: Dict[str, Any]) -> None:
+        """Atualiza a memória e agenda a gravação (debounce)"""
+        with self._lock:
+            self._data = copy.deepcopy(credentials)
+            self._generation += 1
+            self._schedule_flush()
+    
+    def _schedule_flush(self) -> None:
+        self._dirty = True
+        if self._flush_timer is not None:
+            # Já existe uma gravação agendada: esta alteração vai junto
+            self.coalesced_writes += 1
+            return
+        self._flush_timer = threading.Timer(WRITE_DEBOUNCE, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def flush(self) -> bool:
+        """Grava alterações pendentes agora (também chamado no encerramento)"""
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return True
+                # Cópia serializada da versão atual; alterações daqui em diante
+                # agendam outra gravação
+                generation = self._generation
+                try:
+                    text = json.dumps(self._data, indent=2, ensure_ascii=False)
+                except Exception as e:
+                    logger.error(f"Erro ao salvar credenciais: {e}")
+                    return False
+            
+            try:
+                self.ensure_aviator_folder()
+                atomic_write_text(self.credentials_file, text)
+            except Exception as e:
+                # Continua pendente: a próxima alteração ou flush tenta de novo
+                logger.error(f"Erro ao salvar credenciais: {e}")
+                return False
+            
+            with self._lock:
+                self._file_key = self._stat_key()
+                self._checked_at = time.monotonic()
+                if self._generation == generation:
+                    self._dirty = False
+                self.disk_writes += 1
+            logger.info("Credenciais salvas com sucesso")
+            return True
     
     def get_bot_config(self) -> Dict[str, Any]:
         """Retorna configuração do bot"""
-        credentials = self.load_credentials()
-        if not credentials:
-            return self._get_default_config()
-            
-        return credentials.get('bot_settings', self._get_default_config())
+        return self._section('bot_settings', self._get_default_config())
     
     def get_element_config(self) -> Dict[str, Any]:
         """Retorna configuração de elementos"""
-        credentials = self.load_credentials()
-        if not credentials:
-            return self._get_default_elements()
-            
-        return credentials.get('elements', self._get_default_elements())
+        return self._section('elements', self._get_default_elements())
     
     def get_login_credentials(self) -> Optional[Dict[str, str]]:
         """Retorna credenciais de login"""
-        credentials = self.load_credentials()
+        credentials = self._configured()
         if not credentials:
             return None
             
@@ -113,11 +256,7 @@ class ConfigLoader:
     
     def get_betting_strategy(self) -> Dict[str, Any]:
         """Retorna estratégia de apostas"""
-        credentials = self.load_credentials()
-        if not credentials:
-            return self._get_default_strategy()
-            
-        return credentials.get('betting_strategy', self._get_default_strategy())
+        return self._section('betting_strategy', self._get_default_strategy())
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Configuração padrão do bot"""
@@ -130,7 +269,8 @@ class ConfigLoader:
             "history_size": 10,
             "min_strategy_checks": 4,
             "update_interval": 2,
-            "max_retries": 3
+            "max_retries": 3,
+            "paper_mode": False
         }
     
     def _get_default_elements(self) -> Dict[str, Any]:
@@ -164,19 +304,41 @@ class ConfigLoader:
             "reset_on_win": True
         }
     
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Registra quem deve receber as alterações de configuração (ex.: o controlador)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, Dict[str, Any]], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
     def update_config(self, section: str, config: Dict[str, Any]) -> bool:
-        """Atualiza uma seção específica da configuração"""
+        """
+        Atualiza campos de uma seção da configuração; os campos não informados
+        mantêm o valor salvo (PUTs parciais)
+        """
         try:
-            credentials = self.load_credentials() or {}
-            credentials[section] = config
-            return self.save_credentials(credentials)
+            # Leitura e alteração sob o mesmo lock: PUTs simultâneos não se sobrescrevem
+            with self._lock:
+                credentials = self._read() or {}
+                merged = {**credentials.get(section, {}), **copy.deepcopy(config)}
+                credentials = {**credentials, section: merged}
+                self._store(credentials)
         except Exception as e:
             logger.error(f"Erro ao atualizar configuração {section}: {e}")
             return False
+        
+        for listener in list(self._listeners):
+            try:
+                listener(section, copy.deepcopy(config))
+            except Exception as e:
+                logger.error(f"Erro ao propagar configuração {section}: {e}")
+        return True
     
     def is_configured(self) -> bool:
         """Verifica se as credenciais foram configuradas"""
-        credentials = self.load_credentials()
+        credentials = self._configured()
         if not credentials:
             return False
             
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Worker dedicado ao WebDriver
+Uma única thread é dona do webdriver.Chrome e executa os comandos recebidos
+por uma fila, devolvendo futures; o loop da API nunca bloqueia no navegador
+"""
+
+import time
+import queue
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class DriverWorker:
+    """Executa chamadas ao Selenium em uma thread dedicada"""
+
+    def __init__(self, name: str = "selenium-driver"):
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.commands = 0
+        self.busy_time = 0.0
+
+    @property
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Inicia a thread do driver (idempotente)"""
+        if self.is_alive:
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info("Worker do driver iniciado")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Finaliza a thread depois de executar os comandos pendentes"""
+        if not self.is_alive:
+            return
+        self._queue.put(_STOP)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+        logger.info("Worker do driver finalizado")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            fn, args, kwargs, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            start = time.perf_counter()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self.commands += 1
+                self.busy_time += time.perf_counter() - start
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Enfileira uma chamada e retorna o future com o resultado"""
+        future: Future = Future()
+
+        # Chamadas feitas de dentro da própria thread rodam direto (evita deadlock)
+        if threading.current_thread() is self._thread:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        if not self.is_alive:
+            self.start()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Versão assíncrona de submit para uso no loop da API"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso do worker"""
+        return {
+            "alive": self.is_alive,
+            "commands": self.commands,
+            "pending": self._queue.qsize(),
+            "busy_time": self.busy_time,
+            "avg_command_ms": (self.busy_time / self.commands * 1000) if self.commands else 0.0,
+        }
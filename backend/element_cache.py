@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de WebElements por seletor
+Evita reavaliar XPaths caros a cada clique; o elemento só é resolvido de novo
+quando fica obsoleto (StaleElementReferenceException) ou o contexto muda
+"""
+
+import time
+import logging
+from typing import Callable, Dict, Tuple, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ElementCache:
+    """Cache de elementos com contagem de acertos e falhas"""
+
+    def __init__(self):
+        self._elements: Dict[Tuple[str, str], Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+        self.resolve_time = 0.0
+
+    def get(self, by: str, value: str, resolver: Callable[[], Any]) -> Any:
+        """Retorna o elemento em cache ou resolve com `resolver`"""
+        key = (by, value)
+        element = self._elements.get(key)
+        if element is not None:
+            self.hits += 1
+            return element
+
+        self.misses += 1
+        start = time.perf_counter()
+        element = resolver()
+        self.resolve_time += time.perf_counter() - start
+        self._elements[key] = element
+        return element
+
+    def mark_stale(self, by: str, value: str) -> None:
+        """Descarta um elemento que ficou obsoleto no DOM"""
+        if self._elements.pop((by, value), None) is not None:
+            self.stale += 1
+            logger.debug("Elemento obsoleto descartado do cache: %s", value)
+
+    def invalidate(self, by: Optional[str] = None, value: Optional[str] = None) -> None:
+        """Descarta um seletor específico ou, sem argumentos, todo o cache"""
+        if by is None and value is None:
+            if self._elements:
+                self.invalidations += 1
+            self._elements.clear()
+            return
+        self._elements.pop((by, value), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso do cache"""
+        lookups = self.hits + self.misses
+        avg_resolve = self.resolve_time / self.misses if self.misses else 0.0
+        return {
+            "size": len(self._elements),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits / lookups * 100) if lookups else 0.0,
+            "avg_resolve_ms": avg_resolve * 1000,
+            # Estimativa: cada acerto economizou uma resolução média
+            "saved_ms": self.hits * avg_resolve * 1000,
+        }
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline de logging fora do caminho crítico
+
+Quem loga (laço de monitoramento, endpoints) só coloca o LogRecord em uma
+fila: a formatação da mensagem e toda a E/S (arquivo, console, /logs/stream)
+acontecem na thread do QueueListener. O arquivo recebe uma linha JSON por
+registro, no formato do modelo LogEntry (timestamp, level, message,
+component).
+
+O listener trabalha em lotes: tira da fila até MAX_BATCH registros e os
+handlers de arquivo e console gravam o lote em um único write + flush. Entre
+um lote e outro o listener cede o GIL: sem isso, com a fila cheia ele o
+segura pelo intervalo de troca inteiro (5 ms) e quem loga fica parado esse
+tempo, que é o que aparecia na cauda da latência de logger.info.
+
+Para a formatação ser de fato adiada, use o estilo preguiçoso nos trechos
+quentes: logger.info("Rodada %s", valor) em vez de f-strings.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Iterable, Optional
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Registros por lote do listener (mantém curto o tempo sem ceder o GIL)
+MAX_BATCH = 16
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos de LogEntry"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "message": message,
+            "component": record.name,
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def parse_log_line(line: str) -> Dict[str, Any]:
+    """Converte uma linha do arquivo em LogEntry (linhas antigas em texto viram só mensagem)"""
+    try:
+        entry = json.loads(line)
+        if isinstance(entry, dict) and "message" in entry:
+            return entry
+    except ValueError:
+        pass
+    return {"timestamp": None, "level": None, "message": line, "component": None}
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler que enfileira o registro sem formatá-lo: o padrão do
+    QueueHandler chama format() na thread de quem loga
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _BatchEmit:
+    """
+    Handler de stream que grava um lote de registros de uma vez: cada registro
+    é formatado uma vez e o lote vai em um único write + flush
+    """
+
+    def handle_batch(self, records: Iterable[logging.LogRecord]) -> None:
+        lines, last = [], None
+        for record in records:
+            if record.levelno < self.level or not self.filter(record):
+                continue
+            try:
+                lines.append(self.format(record))
+                last = record
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        text = self.terminator.join(lines) + self.terminator
+        self.acquire()
+        try:
+            self.write_batch(text)
+        except Exception:
+            self.handleError(last)
+        finally:
+            self.release()
+
+    def write_batch(self, text: str) -> None:
+        self.stream.write(text)
+        self.flush()
+
+
+class BatchStreamHandler(_BatchEmit, logging.StreamHandler):
+    pass
+
+
+class BatchRotatingFileHandler(_BatchEmit, RotatingFileHandler):
+    """
+    RotatingFileHandler com gravação em lote. O emit padrão formata cada
+    registro duas vezes e faz stat/seek/tell por linha para decidir a rotação;
+    aqui a decisão é tomada uma vez por lote
+    """
+
+    def write_batch(self, text: str) -> None:
+        if self.stream is None:
+            self.stream = self._open()
+        # Como no shouldRollover padrão: nunca rotacionar o que não é arquivo comum
+        regular = not os.path.exists(self.baseFilename) or os.path.isfile(self.baseFilename)
+        if self.maxBytes > 0 and regular:
+            self.stream.seek(0, 2)
+            position = self.stream.tell()
+            if position and position + len(text) >= self.maxBytes:
+                self.doRollover()
+        super().write_batch(text)
+
+
+class _Listener(QueueListener):
+    """
+    QueueListener que trata a fila em lotes e cujo stop pode ser chamado
+    mais de uma vez (ex.: manual e no atexit)
+    """
+
+    def _monitor(self) -> None:
+        q = self.queue
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = self._sentinel in batch
+            if stop:
+                batch = [record for record in batch if record is not self._sentinel]
+            if batch:
+                self.handle_batch(batch)
+            if stop:
+                break
+            # Cede o GIL a quem loga antes do próximo lote
+            time.sleep(0)
+
+    def handle_batch(self, records) -> None:
+        for handler in self.handlers:
+            if isinstance(handler, _BatchEmit):
+                handler.handle_batch(records)
+                continue
+            for record in records:
+                if not self.respect_handler_level or record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+
+def setup_logging(log_file: Optional[str] = None, level: int = logging.INFO,
+                  max_bytes: int = 5 * 1024 * 1024, backups: int = 3,
+                  handlers: Iterable[logging.Handler] = (), console: bool = True) -> QueueListener:
+    """
+    Instala o handler de fila no logger raiz e inicia o listener com os
+    handlers de E/S; o listener é parado (com a fila esvaziada) na saída
+    """
+    targets = []
+    if log_file:
+        file_handler = BatchRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        targets.append(file_handler)
+    if console:
+        console_handler = BatchStreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        targets.append(console_handler)
+    targets.extend(handlers)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener = _Listener(log_queue, *targets, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Acesso aos logs do backend
+
+- tail_lines: últimas N linhas lendo o arquivo de trás para frente em blocos
+  fixos (custo proporcional a N, não ao tamanho do arquivo), continuando nos
+  arquivos rotacionados (backend.log.1, .2, ...) se o atual não bastar.
+- LogStreamHandler: handler que entrega cada registro, já como LogEntry, às
+  assinaturas abertas (ex.: /logs/stream via SSE), com filtro de nível e de
+  componente (nome do logger) e fila limitada por assinante.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BLOCK_SIZE = 8192
+# Limite de linhas por consulta em /logs
+MAX_TAIL_LINES = 5000
+
+
+def _tail_file(path: str, lines: int, block_size: int = BLOCK_SIZE) -> List[bytes]:
+    """Até `lines` últimas linhas de um arquivo (bytes, ordem cronológica)"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b""
+        # Uma quebra a mais que o pedido garante que a primeira linha está completa
+        while position > 0 and buffer.count(b"\n") <= lines:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+    result = buffer.splitlines()
+    return result[-lines:] if lines else []
+
+
+def tail_lines(path: str, lines: int = 100, backups: int = 0, block_size: int = BLOCK_SIZE) -> List[str]:
+    """
+    Últimas `lines` linhas do log, incluindo os `backups` arquivos rotacionados
+    (path.1 é o mais recente) quando o atual tem menos linhas que o pedido
+    """
+    lines = max(0, min(lines, MAX_TAIL_LINES))
+    collected: List[bytes] = []
+    candidates = [path] + [f"{path}.{index}" for index in range(1, backups + 1)]
+    for candidate in candidates:
+        missing = lines - len(collected)
+        if missing <= 0:
+            break
+        if not os.path.exists(candidate):
+            # Rotação mantém a numeração contígua: sem .N não há .N+1
+            if candidate == path:
+                continue
+            break
+        collected = _tail_file(candidate, missing, block_size) + collected
+    return [line.decode('utf-8', errors='replace').rstrip() for line in collected]
+
+
+class LogSubscription:
+    """Fila de registros de um assinante, com filtros"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, level: int, component: Optional[str], max_queue: int):
+        self.loop = loop
+        self.level = level
+        self.component = component
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def accepts(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return False
+        if self.component and not (record.name == self.component or record.name.startswith(self.component + ".")):
+            return False
+        return True
+
+    def put(self, entry: Dict[str, Any]) -> None:
+        """Enfileira no loop do assinante; cheio, descarta o registro mais antigo"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(entry)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class LogStreamHandler(logging.Handler):
+    """Publica registros de log para as assinaturas abertas"""
+
+    def __init__(self, max_queue: int = 1000):
+        super().__init__()
+        self.max_queue = max_queue
+        self._subscriptions: List[LogSubscription] = []
+        self._subscriptions_lock = threading.Lock()
+
+    @staticmethod
+    def to_entry(record: logging.LogRecord) -> Dict[str, Any]:
+        """Registro no formato do modelo LogEntry"""
+        return {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "component": record.name,
+        }
+
+    def subscribe(self, level: str = "INFO", component: Optional[str] = None) -> LogSubscription:
+        """Nova assinatura no loop atual; `level` é o nível mínimo"""
+        levelno = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+        if not isinstance(levelno, int):
+            raise ValueError(f"Nível de log inválido: {level}")
+        subscription = LogSubscription(asyncio.get_running_loop(), levelno, component, self.max_queue)
+        with self._subscriptions_lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription) -> None:
+        with self._subscriptions_lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self._subscriptions:
+            return
+        try:
+            with self._subscriptions_lock:
+                targets = [subscription for subscription in self._subscriptions if subscription.accepts(record)]
+            if not targets:
+                return
+            entry = self.to_entry(record)
+            for subscription in targets:
+                if subscription.loop.is_closed():
+                    continue
+                # emit pode rodar em qualquer thread; a fila pertence ao loop do assinante
+                subscription.loop.call_soon_threadsafe(subscription.put, entry)
+        except Exception:
+            self.handleError(record)
@@ -10,11 +10,12 @@ import json
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Literal, Optional, Any
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 import uvicorn
@@ -29,22 +30,41 @@ from models import (
     LoginCredentials
 )
 from websocket_manager import ConnectionManager
+from status_stream import StatusStream, VOLATILE_FIELDS
+from state_cache import StateCache, CachedState
+from strategy_sweep import grid_combinations, random_combinations, run_sweep, validate_combinations
 from config_loader import config_loader
-
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('backend.log'),
-        logging.StreamHandler()
-    ]
-)
+from log_stream import LogStreamHandler, tail_lines
+from log_pipeline import parse_log_line, setup_logging
+
+# Arquivo de log com tamanho limitado (backend.log, backend.log.1, ...)
+LOG_FILE = 'backend.log'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+# Registros ao vivo para /logs/stream
+log_stream = LogStreamHandler()
+
+# Configuração de logging: fila no caminho crítico, E/S na thread do listener.
+# Processos spawn (servidor do reload do uvicorn, pool do /strategy/sweep)
+# reexecutam este arquivo como __mp_main__; só a importação real abre o log.
+log_listener = None
+if __name__ != "__mp_main__":
+    log_listener = setup_logging(LOG_FILE, logging.INFO, LOG_MAX_BYTES, LOG_BACKUPS, handlers=[log_stream])
 logger = logging.getLogger(__name__)
 
 # Gerenciador de conexões WebSocket
 manager = ConnectionManager()
 
+# Último status publicado (snapshot + deltas)
+status_stream = StatusStream()
+
+# Estados serializados uma vez por versão para REST e WebSocket
+state_cache = StateCache()
+
+# Sem eventos, o estado é conferido neste intervalo (mudanças fora dos pontos notificados)
+STATUS_FALLBACK_INTERVAL = 10.0
+
 # Controlador do bot
 bot_controller = None
 
@@ -53,8 +73,17 @@ async def lifespan(app: FastAPI):
     """Gerencia o ciclo de vida da aplicação"""
     global bot_controller
     bot_controller = AviatorBotController()
+    # PUT /config e /elements chegam ao controlador sem reiniciar a sessão
+    config_loader.add_listener(bot_controller.stage_update)
+    # Primeira versão publicada antes de aceitar clientes: o snapshot já sai completo
+    await publish_status(full=True)
+    publisher = asyncio.create_task(publish_status_changes())
     logger.info("Backend iniciado")
     yield
+    publisher.cancel()
+    config_loader.remove_listener(bot_controller.stage_update)
+    # Alterações de configuração ainda no debounce vão para o disco
+    config_loader.flush()
     if bot_controller:
         await bot_controller.cleanup()
     logger.info("Backend finalizado")
@@ -85,6 +114,16 @@ class ConfigUpdateRequest(BaseModel):
     strategy_threshold: Optional[float] = None
     history_size: Optional[int] = None
     min_strategy_checks: Optional[int] = None
+    paper_mode: Optional[bool] = None
+    ingestion_mode: Optional[Literal["polling", "observer"]] = None
+    observer_timeout: Optional[float] = Field(default=None, ge=1.0, le=120.0)
+    poll_interval_betting: Optional[float] = Field(default=None, ge=0.05, le=10.0)
+    poll_interval_flying: Optional[float] = Field(default=None, ge=0.05, le=10.0)
+    poll_interval_crashed: Optional[float] = Field(default=None, ge=0.05, le=10.0)
+    poll_interval_waiting: Optional[float] = Field(default=None, ge=0.5, le=60.0)
+    poll_interval_transition: Optional[float] = Field(default=None, ge=0.02, le=2.0)
+    phase_transition_margin: Optional[float] = Field(default=None, ge=0.0, le=5.0)
+    chromedriver_path: Optional[str] = None
 
 class ElementUpdateRequest(BaseModel):
     cookies_button: Optional[str] = None
@@ -96,6 +135,8 @@ class ElementUpdateRequest(BaseModel):
     bet_input: Optional[str] = None
     bet_button: Optional[str] = None
     cashout_button: Optional[str] = None
+    multiplier_display: Optional[str] = None
+    balance_display: Optional[str] = None
 
 class CredentialsRequest(BaseModel):
     username: str = Field(..., min_length=1)
@@ -107,6 +148,28 @@ class BettingRequest(BaseModel):
     auto_cashout: Optional[float] = None
     max_loss: Optional[float] = None
     max_win: Optional[float] = None
+    rule: Optional[Dict[str, Any]] = None
+
+class PaperRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=64)
+    strategy: BettingStrategy
+
+class WatchRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=64)
+    rule: Dict[str, Any]
+
+class SweepRequest(BaseModel):
+    grid: Dict[str, List[float]] = Field(default_factory=dict)
+    samples: Optional[int] = Field(None, gt=0, le=100000)
+    seed: Optional[int] = None
+    metric: str = Field(default="total_profit", pattern="^(total_profit|roi|win_rate|max_drawdown)$")
+    limit: Optional[int] = Field(None, gt=0, description="Usar apenas as últimas N rodadas")
+    workers: Optional[int] = Field(None, gt=0)
+    top: int = Field(default=20, gt=0, le=1000)
+    amount: float = Field(default=1.0, gt=0)
+    max_loss: Optional[float] = None
+    max_win: Optional[float] = None
+    progressive_betting: bool = False
 
 # Endpoints da API
 
@@ -204,8 +267,8 @@ async def set_credentials(credentials: CredentialsRequest):
         current_config['username'] = credentials.username
         current_config['password'] = credentials.password
         
-        # Salvar na pasta AVIATOR
-        success = config_loader.save_credentials(current_config)
+        # Salvar na pasta AVIATOR (gravação síncrona com fsync, fora do loop)
+        success = await asyncio.to_thread(config_loader.save_credentials, current_config)
         
         if success:
             logger.info("Credenciais salvas com sucesso na pasta AVIATOR")
@@ -249,19 +312,55 @@ async def stop_bot():
         logger.error(f"Erro ao parar bot: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
+def cached_response(request: Request, entry: CachedState, volatile: Optional[Dict[str, Any]] = None) -> Response:
+    """
+    Resposta com os bytes do cache; 304 se o cliente já tem esta versão.
+    `volatile` (fora do cache e do ETag) é calculado a cada requisição.
+    """
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body_with(volatile or {}), media_type="application/json", headers=headers)
+
 @app.get("/bot/status", response_model=BotStatus)
-async def get_bot_status():
+async def get_bot_status(request: Request):
     """Obter status do bot"""
     if not bot_controller:
         raise HTTPException(status_code=500, detail="Bot controller not initialized")
-    return bot_controller.get_detailed_status()
+    entry = state_cache.get("status", bot_controller.state_version,
+                            lambda: bot_controller.get_detailed_status().dict(exclude=VOLATILE_FIELDS))
+    return cached_response(request, entry, {"last_update": datetime.now()})
 
 @app.get("/bot/stats", response_model=SessionStats)
-async def get_session_stats():
+async def get_session_stats(request: Request):
     """Obter estatísticas da sessão"""
     if not bot_controller:
         raise HTTPException(status_code=500, detail="Bot controller not initialized")
-    return bot_controller.get_session_stats()
+    entry = state_cache.get("stats", bot_controller.state_version,
+                            lambda: bot_controller.get_session_stats().dict(exclude=VOLATILE_FIELDS))
+    return cached_response(request, entry, {"uptime": bot_controller.get_uptime()})
+
+@app.get("/rounds")
+async def get_rounds(limit: int = 100, since_seq: Optional[int] = None):
+    """Obter rodadas registradas no histórico persistente"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    rounds = await asyncio.to_thread(bot_controller.get_recent_rounds, limit, since_seq)
+    return {"rounds": rounds}
+
+@app.get("/bot/phases")
+async def get_round_phases():
+    """Obter a fase atual da rodada e os tempos observados de cada fase"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    return bot_controller.get_phase_timings()
+
+@app.get("/bot/metrics")
+async def get_performance_metrics():
+    """Obter métricas de desempenho do bot"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    return bot_controller.get_performance_metrics()
 
 # Endpoints de apostas
 
@@ -280,7 +379,8 @@ async def start_betting(betting_config: BettingRequest):
             strategy_type=betting_config.strategy,
             auto_cashout=betting_config.auto_cashout,
             max_loss=betting_config.max_loss,
-            max_win=betting_config.max_win
+            max_win=betting_config.max_win,
+            rule=betting_config.rule
         )
         bot_controller.start_betting(strategy)
         await manager.broadcast({"type": "betting_started", "data": strategy.dict()})
@@ -303,58 +403,227 @@ async def stop_betting():
         logger.error(f"Erro ao parar apostas: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
+# Endpoints de paper trading
+
+@app.get("/paper")
+async def get_paper_portfolios(metric: str = "total_profit"):
+    """Comparar os portfólios simulados"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    try:
+        return bot_controller.paper_trading.get_status(metric)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/paper")
+async def create_paper_portfolio(request: PaperRequest):
+    """Criar um portfólio simulado sobre as rodadas ao vivo"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    try:
+        return bot_controller.add_paper_portfolio(request.name, request.strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/paper/{name}")
+async def get_paper_portfolio(name: str):
+    """Obter um portfólio simulado"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    portfolio = bot_controller.paper_trading.get(name)
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfólio não encontrado")
+    return portfolio.summary()
+
+@app.delete("/paper/{name}")
+async def delete_paper_portfolio(name: str):
+    """Remover um portfólio simulado"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    if not bot_controller.remove_paper_portfolio(name):
+        raise HTTPException(status_code=404, detail="Portfólio não encontrado")
+    return {"message": f"Portfólio {name} removido"}
+
+# Endpoints de estratégias
+
+@app.get("/strategy/watch")
+async def get_watched_strategies():
+    """Obter gatilhos da regra ativa e das estratégias candidatas"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    return bot_controller.get_watched_strategies()
+
+@app.post("/strategy/watch")
+async def watch_strategy(request: WatchRequest):
+    """Observar uma estratégia candidata a cada rodada (sem apostar)"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    try:
+        bot_controller.watch_strategy(request.name, request.rule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": f"Estratégia {request.name} observada"}
+
+@app.delete("/strategy/watch/{name}")
+async def unwatch_strategy(name: str):
+    """Parar de observar uma estratégia candidata"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    if not bot_controller.unwatch_strategy(name):
+        raise HTTPException(status_code=404, detail="Estratégia não observada")
+    return {"message": f"Estratégia {name} removida"}
+
+@app.post("/strategy/sweep")
+async def sweep_strategies(request: SweepRequest):
+    """Avaliar combinações de parâmetros de estratégia sobre o histórico gravado"""
+    if not bot_controller:
+        raise HTTPException(status_code=500, detail="Bot controller not initialized")
+    
+    try:
+        if request.samples:
+            combinations = random_combinations(request.samples, seed=request.seed)
+        else:
+            combinations = grid_combinations(request.grid)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    base = {
+        "amount": request.amount,
+        "max_loss": request.max_loss,
+        "max_win": request.max_win,
+        "progressive_betting": request.progressive_betting,
+    }
+    # Valores fora dos limites da estratégia ou da regra: erro do pedido, não do servidor
+    try:
+        validate_combinations(combinations, base)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    series = await asyncio.to_thread(bot_controller.round_store.multipliers, request.limit)
+    if not series:
+        raise HTTPException(status_code=400, detail="Nenhuma rodada gravada para avaliar")
+    
+    # A varredura usa um pool de processos; o loop de eventos só aguarda
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, run_sweep, series, combinations, base, request.metric, request.workers, request.top
+    )
+
 # Endpoints de logs
 
 @app.get("/logs")
 async def get_logs(lines: int = 100):
-    """Obter logs do sistema"""
+    """Obter logs do sistema (últimos registros, lidos do fim do arquivo)"""
     try:
-        if os.path.exists('backend.log'):
-            with open('backend.log', 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-                return {"logs": [line.strip() for line in recent_lines]}
-        return {"logs": []}
+        return {"logs": [parse_log_line(line) for line in tail_lines(LOG_FILE, lines, backups=LOG_BACKUPS)]}
     except Exception as e:
         logger.error(f"Erro ao obter logs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/logs/stream")
+async def stream_logs(request: Request, level: str = "INFO", component: Optional[str] = None):
+    """Logs ao vivo (Server-Sent Events) com filtro de nível mínimo e componente"""
+    try:
+        subscription = log_stream.subscribe(level, component)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    entry = await asyncio.wait_for(subscription.get(), 15)
+                except asyncio.TimeoutError:
+                    # Mantém a conexão viva através de proxies
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(entry, ensure_ascii=False)}\n\n"
+        finally:
+            log_stream.unsubscribe(subscription)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 # WebSocket para atualizações em tempo real
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """Endpoint WebSocket para atualizações em tempo real"""
+    # Só este cliente recebe o snapshot da versão publicada; os deltas seguintes
+    # (de publish_status_changes) partem dela. Nada é difundido aos demais.
     await manager.connect(websocket)
     try:
+        await send_status_snapshot(websocket)
         while True:
-            # Manter conexão ativa
-            await websocket.receive_text()
-    except WebSocketDisconnect:
+            text = await websocket.receive_text()
+            # Cliente que perdeu deltas pede o estado completo
+            try:
+                message = json.loads(text)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("type") == "snapshot_request":
+                await send_status_snapshot(websocket)
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: conexão fechada pela task escritora (cliente removido)
+        pass
+    finally:
         manager.disconnect(websocket)
 
+@app.get("/ws/stats")
+async def get_websocket_stats():
+    """Métricas de fan-out: filas, descartes e atraso por cliente"""
+    return {**manager.get_stats(), "state_cache": state_cache.get_stats()}
+
 # Funções auxiliares
 
+async def publish_status(full: bool = False) -> None:
+    """
+    Envia o que mudou: a fase em seu canal próprio e o delta das seções
+    marcadas pelo controlador (todas com `full`). Seções não marcadas não
+    são reconstruídas nem comparadas.
+    """
+    if not bot_controller:
+        return
+    dirty = bot_controller.take_dirty_sections()
+    if full:
+        dirty |= {"status", "stats", "phase"}
+    
+    if "phase" in dirty:
+        message = status_stream.update_phase(bot_controller.phase_scheduler.phase)
+        if message:
+            await manager.broadcast(message)
+    
+    sections = {}
+    if "status" in dirty:
+        sections["status"] = bot_controller.get_detailed_status().dict(exclude={"round_phase"})
+    if "stats" in dirty:
+        sections["stats"] = bot_controller.get_session_stats().dict()
+    if sections:
+        delta = status_stream.update(sections)
+        if delta:
+            await manager.broadcast(delta)
+
+async def send_status_snapshot(websocket: WebSocket) -> None:
+    """Snapshot da versão atual; clientes que conectam juntos compartilham os bytes"""
+    entry = state_cache.get("snapshot", status_stream.revision, status_stream.snapshot)
+    await manager.send_serialized(entry.text, websocket, "status_snapshot")
+
+async def publish_status_changes():
+    """Envia deltas de status quando o controlador sinaliza mudança"""
+    while True:
+        try:
+            # Sem sinal no intervalo, confere tudo (mudanças fora dos pontos notificados)
+            changed = await bot_controller.wait_state_change(STATUS_FALLBACK_INTERVAL)
+            await publish_status(full=not changed)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao publicar status: {e}")
+            await asyncio.sleep(1)
+
 async def run_bot_with_updates():
-    """Executa o bot e envia atualizações via WebSocket"""
+    """Executa o bot; o status é publicado por publish_status_changes"""
     try:
         await bot_controller.start()
-        
-        # Loop para enviar atualizações periódicas
-        while bot_controller.is_running():
-            status = bot_controller.get_detailed_status()
-            stats = bot_controller.get_session_stats()
-            
-            await manager.broadcast({
-                "type": "status_update",
-                "data": {
-                    "status": status.dict(),
-                    "stats": stats.dict(),
-                    "timestamp": datetime.now().isoformat()
-                }
-            })
-            
-            await asyncio.sleep(2)  # Atualizar a cada 2 segundos
-            
     except Exception as e:
         logger.error(f"Erro durante execução do bot: {e}")
         await manager.broadcast({
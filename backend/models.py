@@ -28,6 +28,14 @@ class StrategyTypeEnum(str, Enum):
     AGGRESSIVE = "aggressive"
     CUSTOM = "custom"
 
+class RoundPhaseEnum(str, Enum):
+    """Fases de uma rodada do jogo"""
+    UNKNOWN = "unknown"
+    WAITING = "waiting"
+    BETTING = "betting"
+    FLYING = "flying"
+    CRASHED = "crashed"
+
 class BotConfig(BaseModel):
     """Configuração principal do bot"""
     site_url: str = Field(default="https://estrelabet.com/ptb/bet/main", description="URL do site")
@@ -39,6 +47,19 @@ class BotConfig(BaseModel):
     min_strategy_checks: int = Field(default=4, ge=2, le=10, description="Mínimo de verificações para estratégia")
     update_interval: int = Field(default=2, ge=1, le=10, description="Intervalo de atualização (segundos)")
     max_retries: int = Field(default=3, ge=1, le=10, description="Máximo de tentativas")
+    ingestion_mode: str = Field(default="polling", pattern="^(polling|observer)$", description="Modo de leitura das rodadas (polling ou observer)")
+    observer_timeout: float = Field(default=30.0, ge=1.0, le=120.0, description="Espera máxima por nova rodada no modo observer (segundos)")
+    poll_interval_betting: float = Field(default=0.5, ge=0.05, le=10.0, description="Intervalo de leitura na janela de apostas (segundos)")
+    poll_interval_flying: float = Field(default=1.0, ge=0.05, le=10.0, description="Intervalo de leitura com o avião em voo (segundos)")
+    poll_interval_crashed: float = Field(default=0.5, ge=0.05, le=10.0, description="Intervalo de leitura logo após o crash (segundos)")
+    poll_interval_waiting: float = Field(default=5.0, ge=0.5, le=60.0, description="Intervalo de leitura aguardando a próxima fase (segundos)")
+    poll_interval_transition: float = Field(default=0.1, ge=0.02, le=2.0, description="Intervalo de leitura perto de uma transição de fase (segundos)")
+    phase_transition_margin: float = Field(default=0.5, ge=0.0, le=5.0, description="Janela em torno de uma transição esperada (segundos)")
+    round_store_path: str = Field(default="rounds.db", description="Arquivo SQLite do histórico de rodadas")
+    paper_mode: bool = Field(default=False, description="Apostas simuladas: decide e liquida sem clicar")
+    chromedriver_path: str = Field(default="", description="Caminho fixo do chromedriver (vazio: resolve uma vez e guarda em cache)")
+    driver_cache_path: str = Field(default="chromedriver.json", description="Arquivo com o caminho do chromedriver já resolvido")
+    optional_element_timeout: float = Field(default=5.0, ge=0.5, le=60.0, description="Espera máxima por elementos opcionais, como o aviso de cookies (segundos)")
     
 class ElementConfig(BaseModel):
     """Configuração de elementos da página"""
@@ -71,10 +92,19 @@ class BettingStrategy(BaseModel):
     progressive_betting: bool = Field(default=False, description="Aposta progressiva")
     progression_factor: float = Field(default=1.5, ge=1.1, le=3.0, description="Fator de progressão")
     reset_on_win: bool = Field(default=True, description="Resetar progressão ao ganhar")
+    rule: Optional[Dict[str, Any]] = Field(None, description="Regra declarativa de ativação (ver strategy_rules); padrão usa threshold e min_strategy_checks")
+    
+    def calculate_bet_amount(self, stats: "SessionStats") -> float:
+        """Calcula o valor da próxima aposta considerando a progressão"""
+        bet_amount = self.amount
+        if self.progressive_betting and stats.losses > 0:
+            bet_amount *= (self.progression_factor ** stats.losses)
+        return bet_amount
 
 class GameResult(BaseModel):
     """Resultado de uma rodada do jogo"""
     multiplier: float = Field(..., description="Multiplicador da rodada")
+    round_seq: Optional[int] = Field(None, description="Sequência monotônica da rodada")
     timestamp: datetime = Field(default_factory=datetime.now, description="Timestamp da rodada")
     bet_amount: Optional[float] = Field(None, description="Valor apostado")
     cashout_multiplier: Optional[float] = Field(None, description="Multiplicador do cashout")
@@ -94,7 +124,14 @@ class SessionStats(BaseModel):
     current_balance: Optional[float] = Field(None, description="Saldo atual")
     max_multiplier: float = Field(default=0.0, description="Maior multiplicador visto")
     avg_multiplier: float = Field(default=0.0, description="Multiplicador médio")
+    min_multiplier: Optional[float] = Field(None, description="Menor multiplicador visto")
+    std_multiplier: float = Field(default=0.0, description="Desvio padrão dos multiplicadores")
+    median_multiplier: Optional[float] = Field(None, description="Mediana dos multiplicadores (aproximada)")
+    p90_multiplier: Optional[float] = Field(None, description="Percentil 90 dos multiplicadores (aproximado)")
+    p99_multiplier: Optional[float] = Field(None, description="Percentil 99 dos multiplicadores (aproximado)")
     errors: int = Field(default=0, description="Número de erros")
+    history_gaps: int = Field(default=0, description="Perdas de sobreposição no histórico")
+    history_corrections: int = Field(default=0, description="Rodadas corrigidas após releitura do histórico")
     uptime: Optional[str] = Field(None, description="Tempo de execução")
     
     def calculate_win_rate(self) -> float:
@@ -120,6 +157,7 @@ class BotStatus(BaseModel):
     error_message: Optional[str] = Field(None, description="Mensagem de erro")
     current_strategy: Optional[BettingStrategy] = Field(None, description="Estratégia atual")
     recent_results: List[float] = Field(default_factory=list, description="Resultados recentes")
+    round_phase: RoundPhaseEnum = Field(default=RoundPhaseEnum.UNKNOWN, description="Fase atual da rodada")
     
 class LogEntry(BaseModel):
     """Entrada de log"""
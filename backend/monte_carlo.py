@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulação Monte Carlo de banca para uma BettingStrategy
+
+Gera crashes sintéticos (distribuição com margem da casa ou reamostragem das
+rodadas gravadas) e executa a estratégia em milhares de caminhos de banca ao
+mesmo tempo. As rodadas são geradas em blocos (caminhos x rodadas); a regra de
+ativação é avaliada em cada bloco inteiro e a liquidação das apostas avança
+rodada a rodada com operações sobre o vetor de caminhos, com as mesmas regras
+do controlador (ver backtester):
+- gatilho após a rodada i aposta na rodada i + 1
+- valor = amount * fator ** derrotas acumuladas (aposta progressiva)
+- max_loss/max_win verificados antes de cada aposta; com stop_on_* encerram
+  as apostas do caminho
+- o caminho quebra quando a banca não cobre a próxima aposta
+
+Tudo roda offline, sem driver nem rede.
+
+Uso:
+    python monte_carlo.py --paths 10000 --rounds 10000 --auto-cashout 2 --max-loss 50 --max-win 50
+    python monte_carlo.py --db rounds.db --empirical --bankroll 200 --progressive
+"""
+
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from models import BettingStrategy, BotConfig, StrategyTypeEnum
+from strategy_rules import CompiledRule
+from backtester import strategy_rule, load_series, load_round_store
+
+# Estados finais de cada caminho
+ACTIVE, STOP_LOSS, STOP_WIN, RUINED = 0, 1, 2, 3
+
+
+@dataclass
+class HouseEdgeGenerator:
+    """
+    Crash com margem da casa: P(crash >= m) = (1 - house_edge) / m, truncado
+    em 2 casas decimais e com mínimo de 1.00x como no jogo
+    """
+    house_edge: float = 0.01
+    max_multiplier: Optional[float] = None
+
+    def __call__(self, rng: np.random.Generator, shape: tuple) -> np.ndarray:
+        uniform = rng.random(shape)
+        crashes = np.floor(100 * (1 - self.house_edge) / (1 - uniform)) / 100
+        np.maximum(crashes, 1.0, out=crashes)
+        if self.max_multiplier:
+            np.minimum(crashes, self.max_multiplier, out=crashes)
+        return crashes
+
+
+@dataclass
+class EmpiricalGenerator:
+    """Reamostragem (com reposição) de multiplicadores observados"""
+    history: np.ndarray
+
+    def __post_init__(self):
+        self.history = np.ascontiguousarray(self.history, dtype=np.float64)
+        if not self.history.size:
+            raise ValueError("Histórico vazio para reamostragem")
+
+    def __call__(self, rng: np.random.Generator, shape: tuple) -> np.ndarray:
+        return self.history[rng.integers(0, self.history.size, size=shape)]
+
+
+@dataclass
+class MonteCarloResult:
+    """Distribuições finais dos caminhos simulados"""
+    paths: int
+    rounds: int
+    bankroll: float
+    outcome: np.ndarray = field(repr=False)
+    stop_round: np.ndarray = field(repr=False)
+    final_profit: np.ndarray = field(repr=False)
+    bets_placed: np.ndarray = field(repr=False)
+    elapsed: float = 0.0
+
+    def probability(self, state: int) -> float:
+        return float(np.mean(self.outcome == state)) if self.paths else 0.0
+
+    def stop_times(self, state: int) -> np.ndarray:
+        """Rodada em que cada caminho atingiu o estado (só os que atingiram)"""
+        return self.stop_round[self.outcome == state]
+
+    @staticmethod
+    def _distribution(values: np.ndarray) -> Optional[Dict[str, float]]:
+        if not values.size:
+            return None
+        p10, p50, p90 = np.percentile(values, [10, 50, 90])
+        return {
+            "count": int(values.size),
+            "mean": round(float(values.mean()), 2),
+            "p10": round(float(p10), 2),
+            "median": round(float(p50), 2),
+            "p90": round(float(p90), 2),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "paths": self.paths,
+            "rounds": self.rounds,
+            "bankroll": self.bankroll,
+            "ruin_probability": round(self.probability(RUINED), 4),
+            "max_loss_probability": round(self.probability(STOP_LOSS), 4),
+            "max_win_probability": round(self.probability(STOP_WIN), 4),
+            "time_to_ruin": self._distribution(self.stop_times(RUINED)),
+            "time_to_max_loss": self._distribution(self.stop_times(STOP_LOSS)),
+            "time_to_max_win": self._distribution(self.stop_times(STOP_WIN)),
+            "final_profit": self._distribution(self.final_profit),
+            "bets_per_path": round(float(self.bets_placed.mean()), 2) if self.paths else 0.0,
+            "elapsed_s": round(self.elapsed, 3),
+        }
+
+
+def simulate(strategy: BettingStrategy, paths: int = 10000, rounds: int = 10000,
+             generator=None, bankroll: Optional[float] = None,
+             config: Optional[BotConfig] = None, rule: Optional[CompiledRule] = None,
+             block_size: int = 256, seed: Optional[int] = None) -> MonteCarloResult:
+    """
+    Executa a estratégia em `paths` caminhos de `rounds` rodadas.
+    Sem `bankroll` a banca é ilimitada e só os limites de perda/ganho param.
+    """
+    rng = np.random.default_rng(seed)
+    generator = generator or HouseEdgeGenerator()
+    rule = rule or strategy_rule(strategy, config)
+    carry = max(rule.lookback - 1, 0)
+    start = time.perf_counter()
+
+    target = strategy.auto_cashout
+    win_payout = (target - 1) if target else 0.0
+    max_loss = strategy.max_loss if strategy.max_loss and strategy.stop_on_loss else None
+    max_win = strategy.max_win if strategy.max_win and strategy.stop_on_win else None
+
+    profit = np.zeros(paths)
+    losses = np.zeros(paths)
+    bets_placed = np.zeros(paths, dtype=np.int64)
+    alive = np.ones(paths, dtype=bool)
+    outcome = np.full(paths, ACTIVE, dtype=np.int8)
+    stop_round = np.full(paths, -1, dtype=np.int64)
+    previous = np.empty((paths, 0))
+    # Apostas em aberto: índices dos caminhos e valores (só os que apostaram)
+    bet_paths = np.zeros(0, dtype=np.int64)
+    bet_stakes = np.zeros(0)
+
+    def stop(candidates: np.ndarray, hit: np.ndarray, state: int, round_index: int) -> np.ndarray:
+        stopped = candidates[hit]
+        outcome[stopped] = state
+        stop_round[stopped] = round_index
+        alive[stopped] = False
+        return ~hit
+
+    for block_start in range(0, rounds, block_size):
+        count = min(block_size, rounds - block_start)
+        crashes = generator(rng, (paths, count))
+        # Prefixo com as últimas rodadas do bloco anterior para as janelas da regra
+        window = np.concatenate((previous, crashes), axis=1)
+        triggers = rule.vectorized(window)[:, previous.shape[1]:]
+        previous = window[:, window.shape[1] - carry:] if carry else np.empty((paths, 0))
+        # Uma linha contígua por rodada para o laço de liquidação
+        crashes = np.ascontiguousarray(crashes.T)
+        triggers = np.ascontiguousarray(triggers.T)
+
+        for offset in range(count):
+            round_index = block_start + offset
+
+            # Liquida as apostas feitas após a rodada anterior
+            if bet_paths.size:
+                if target:
+                    won = crashes[offset, bet_paths] >= target
+                else:
+                    won = np.zeros(bet_paths.size, dtype=bool)
+                profit[bet_paths] += np.where(won, bet_stakes * win_payout, -bet_stakes)
+                losses[bet_paths] += ~won
+                bet_paths = bet_paths[:0]
+
+            # Só os caminhos com gatilho nesta rodada são processados
+            candidates = np.flatnonzero(triggers[offset] & alive)
+            if not candidates.size:
+                continue
+
+            # Limites verificados antes da aposta (perda antes de ganho)
+            if max_loss is not None:
+                keep = stop(candidates, profit[candidates] <= -max_loss, STOP_LOSS, round_index)
+                candidates = candidates[keep]
+            if max_win is not None:
+                keep = stop(candidates, profit[candidates] >= max_win, STOP_WIN, round_index)
+                candidates = candidates[keep]
+
+            if strategy.progressive_betting:
+                with np.errstate(over="ignore"):
+                    stakes = strategy.amount * np.power(strategy.progression_factor, losses[candidates])
+            else:
+                stakes = np.full(candidates.size, strategy.amount)
+
+            if bankroll is not None:
+                keep = stop(candidates, bankroll + profit[candidates] < stakes, RUINED, round_index)
+                candidates, stakes = candidates[keep], stakes[keep]
+
+            # A última rodada não tem uma seguinte para liquidar a aposta
+            if round_index + 1 < rounds:
+                bet_paths, bet_stakes = candidates, stakes
+                bets_placed[candidates] += 1
+
+        if not alive.any():
+            break
+
+    return MonteCarloResult(
+        paths=paths,
+        rounds=rounds,
+        bankroll=bankroll,
+        outcome=outcome,
+        stop_round=stop_round,
+        final_profit=profit,
+        bets_placed=bets_placed,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=10000, help="Caminhos de banca simulados")
+    parser.add_argument("--rounds", type=int, default=10000, help="Rodadas por caminho")
+    parser.add_argument("--house-edge", type=float, default=0.01, help="Margem da casa do gerador sintético")
+    parser.add_argument("--max-multiplier", type=float, help="Teto do multiplicador sintético")
+    parser.add_argument("--empirical", action="store_true", help="Reamostrar rodadas de --file/--db")
+    parser.add_argument("--file", help="Arquivo com multiplicadores para reamostragem")
+    parser.add_argument("--db", help="Banco SQLite do RoundStore para reamostragem")
+    parser.add_argument("--bankroll", type=float, help="Banca inicial (padrão: ilimitada)")
+    parser.add_argument("--amount", type=float, default=1.0, help="Valor da aposta")
+    parser.add_argument("--auto-cashout", type=float, help="Multiplicador de cashout automático")
+    parser.add_argument("--max-loss", type=float, help="Perda máxima")
+    parser.add_argument("--max-win", type=float, help="Ganho máximo")
+    parser.add_argument("--progressive", action="store_true", help="Aposta progressiva")
+    parser.add_argument("--factor", type=float, default=1.5, help="Fator de progressão")
+    parser.add_argument("--rule", help="Regra de ativação em JSON (ver strategy_rules)")
+    parser.add_argument("--threshold", type=float, default=2.0, help="Threshold da regra padrão")
+    parser.add_argument("--checks", type=int, default=4, help="Rodadas consecutivas da regra padrão")
+    parser.add_argument("--seed", type=int, help="Semente do gerador")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    if args.empirical:
+        if not (args.file or args.db):
+            sys.exit("--empirical requer --file ou --db")
+        history = load_round_store(args.db) if args.db else load_series(args.file)
+        generator = EmpiricalGenerator(history)
+    else:
+        generator = HouseEdgeGenerator(args.house_edge, args.max_multiplier)
+
+    strategy = BettingStrategy(
+        amount=args.amount,
+        strategy_type=StrategyTypeEnum.CUSTOM if args.rule else StrategyTypeEnum.MODERATE,
+        auto_cashout=args.auto_cashout,
+        max_loss=args.max_loss,
+        max_win=args.max_win,
+        progressive_betting=args.progressive,
+        progression_factor=args.factor,
+        rule=json.loads(args.rule) if args.rule else None,
+    )
+    config = BotConfig(strategy_threshold=args.threshold, min_strategy_checks=args.checks)
+
+    result = simulate(strategy, args.paths, args.rounds, generator, args.bankroll, config, seed=args.seed)
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rastreador do multiplicador em voo para o cashout automático
+Um observador na página acompanha o display do multiplicador e clica no
+cashout assim que o alvo é atingido, sem depender de ida e volta ao driver.
+O resumo do rastreador chega ao controlador junto com o snapshot da página.
+"""
+
+import logging
+from collections import deque
+from typing import Optional, Dict, Any
+
+from models import ElementConfig
+from page_state import TrackerState
+
+logger = logging.getLogger(__name__)
+
+# Instala o rastreador dentro do iframe. Cada mutação do display só atualiza
+# contadores (último, máximo, total de atualizações), então taxas altas de
+# atualização não acumulam fila. Ao atingir o alvo o clique acontece na
+# própria página e o observador de resultados é acordado.
+INSTALL_TRACKER_JS = r"""
+var multiplierXPath = arguments[0], cashoutXPath = arguments[1], target = arguments[2];
+function byXPath(xpath) {
+    if (!xpath) { return null; }
+    return document.evaluate(xpath, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+var old = window.__aviatorTracker;
+if (old && old.observer) { old.observer.disconnect(); }
+var display = byXPath(multiplierXPath);
+if (!display) { return false; }
+var state = {armed: true, fired: false, target: target, cashout: null, last: null,
+             max: null, updates: 0, observer: null};
+function onChange() {
+    var value = parseFloat((display.innerText || display.textContent || '')
+        .replace(/x/gi, '').replace(',', '.'));
+    if (isNaN(value)) { return; }
+    state.updates++;
+    state.last = value;
+    if (state.max === null || value > state.max) { state.max = value; }
+    if (state.armed && !state.fired && value >= state.target) {
+        var button = byXPath(cashoutXPath);
+        if (button) {
+            button.click();
+            state.fired = true;
+            state.cashout = value;
+            var results = window.__aviatorObserver;
+            if (results && results.waiter) { results.waiter(); }
+        }
+    }
+}
+state.observer = new MutationObserver(onChange);
+state.observer.observe(display, {childList: true, subtree: true, characterData: true});
+window.__aviatorTracker = state;
+return true;
+"""
+
+DISARM_TRACKER_JS = r"""
+var state = window.__aviatorTracker;
+if (!state) { return null; }
+if (state.observer) { state.observer.disconnect(); }
+state.armed = false;
+window.__aviatorTracker = null;
+return {armed: false, fired: state.fired, target: state.target, cashout: state.cashout,
+        last: state.last, max: state.max, updates: state.updates};
+"""
+
+
+class MultiplierTracker:
+    """Controla o rastreador da página e mede o desvio do cashout"""
+
+    def __init__(self, history: int = 200):
+        self.target: Optional[float] = None
+        self.overshoots: deque = deque(maxlen=history)
+        self.cashouts = 0
+        self.fallback_cashouts = 0
+        self.missed = 0
+
+    def arm(self, driver, elements: ElementConfig, target: float) -> bool:
+        """Instala o rastreador com o alvo de cashout (thread do driver)"""
+        if not elements.multiplier_display or not elements.cashout_button:
+            logger.warning("Display do multiplicador ou botão de cashout não configurados")
+            return False
+        try:
+            armed = bool(driver.execute_script(
+                INSTALL_TRACKER_JS, elements.multiplier_display, elements.cashout_button, target
+            ))
+        except Exception as e:
+            logger.warning(f"Erro ao instalar rastreador do multiplicador: {e}")
+            armed = False
+
+        self.target = target if armed else None
+        if armed:
+            logger.info("Cashout automático armado em %sx", target)
+        return armed
+
+    def disarm(self, driver) -> Optional[TrackerState]:
+        """Remove o rastreador e devolve o resumo final (thread do driver)"""
+        self.target = None
+        try:
+            return TrackerState.from_raw(driver.execute_script(DISARM_TRACKER_JS))
+        except Exception as e:
+            logger.warning(f"Erro ao remover rastreador do multiplicador: {e}")
+            return None
+
+    def needs_fallback(self, state: Optional[TrackerState]) -> bool:
+        """Alvo atingido mas o clique na página não aconteceu"""
+        return bool(
+            self.target and state and not state.fired
+            and state.last is not None and state.last >= self.target
+        )
+
+    def record_cashout(self, target: float, multiplier: float, fallback: bool = False) -> float:
+        """Registra um cashout e retorna o desvio em relação ao alvo"""
+        overshoot = multiplier - target
+        self.overshoots.append(overshoot)
+        self.cashouts += 1
+        if fallback:
+            self.fallback_cashouts += 1
+        return overshoot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas de cashout e desvio (multiplicador real - alvo)"""
+        stats: Dict[str, Any] = {
+            "armed_target": self.target,
+            "cashouts": self.cashouts,
+            "fallback_cashouts": self.fallback_cashouts,
+            "missed": self.missed,
+        }
+        if self.overshoots:
+            stats.update({
+                "last_overshoot": self.overshoots[-1],
+                "avg_overshoot": sum(self.overshoots) / len(self.overshoots),
+                "max_overshoot": max(self.overshoots),
+            })
+        return stats
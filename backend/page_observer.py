@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Observador de rodadas injetado na página do jogo
+Instala um MutationObserver no histórico de resultados e permite drenar
+as novas rodadas em uma única chamada assíncrona ao WebDriver
+"""
+
+import logging
+from typing import Optional, Dict, Any
+
+from page_state import PAGE_STATE_FN_JS, PARSE_HISTORY_FN_JS
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima dentro da página (s), o limite de observer_timeout. O timeout
+# de script da sessão é ajustado uma vez para cobri-la, sem um comando extra
+# ao WebDriver a cada espera de duração diferente.
+MAX_WAIT = 120.0
+SCRIPT_TIMEOUT_MARGIN = 5.0
+
+# Script instalado dentro do iframe do jogo. A cada mutação do container de
+# histórico o texto é convertido em números e, se mudou, o histórico completo
+# (mais recente primeiro) entra na fila junto com o instante da detecção.
+INSTALL_OBSERVER_JS = PARSE_HISTORY_FN_JS + r"""
+var locator = arguments[0], byXPath = arguments[1], maxQueue = arguments[2];
+function findContainer() {
+    if (byXPath) {
+        return document.evaluate(locator, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.getElementsByClassName(locator)[0] || null;
+}
+var old = window.__aviatorObserver;
+if (old && old.observer) { old.observer.disconnect(); }
+var container = findContainer();
+if (!container) { return false; }
+var state = {container: container, queue: [], last: '', waiter: null, observer: null};
+function capture() {
+    var history = parseHistory(container.innerText);
+    var key = history.join('|');
+    if (!history.length || key === state.last) { return; }
+    state.last = key;
+    state.queue.push({history: history, ts: Date.now()});
+    if (state.queue.length > maxQueue) { state.queue.shift(); }
+    if (state.waiter) { state.waiter(); }
+}
+state.observer = new MutationObserver(capture);
+state.observer.observe(container, {childList: true, subtree: true, characterData: true});
+window.__aviatorObserver = state;
+capture();
+return true;
+"""
+
+# Script assíncrono: devolve imediatamente o que estiver na fila ou bloqueia
+# dentro do navegador até a próxima mutação (ou até o timeout). Junto com os
+# eventos vai o estado completo da página lido no mesmo instante. Retorna null
+# quando o observador sumiu ou o container foi substituído pelo SPA.
+DRAIN_OBSERVER_JS = PAGE_STATE_FN_JS + r"""
+var timeoutMs = arguments[0], sel = arguments[1], done = arguments[arguments.length - 1];
+var state = window.__aviatorObserver;
+if (!state || !document.contains(state.container)) { done(null); return; }
+function finish() {
+    state.waiter = null;
+    done({events: state.queue.splice(0), state: readPageState(sel)});
+}
+if (state.queue.length) { finish(); return; }
+var timer = setTimeout(finish, timeoutMs);
+state.waiter = function () { clearTimeout(timer); finish(); };
+"""
+
+
+class ResultObserver:
+    """Ingestão de rodadas por push a partir de um observador na página"""
+
+    def __init__(self, driver, locator: str, by_xpath: bool = False, max_queue: int = 100):
+        self.driver = driver
+        self.locator = locator
+        self.by_xpath = by_xpath
+        self.max_queue = max_queue
+        self.installed = False
+        self._script_timeout: Optional[float] = None
+
+    def install(self) -> bool:
+        """Injeta o observador no container de histórico"""
+        try:
+            self.installed = bool(self.driver.execute_script(
+                INSTALL_OBSERVER_JS, self.locator, self.by_xpath, self.max_queue
+            ))
+        except Exception as e:
+            logger.warning(f"Erro ao instalar observador de resultados: {e}")
+            self.installed = False
+
+        if self.installed:
+            logger.info("Observador de resultados instalado")
+        return self.installed
+
+    def drain(self, timeout: float, selectors: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Aguarda novas rodadas por até `timeout` segundos (limitado a MAX_WAIT)
+        em uma única chamada. Retorna {"events": [{history, ts}, ...],
+        "state": <estado da página>} assim que a página acorda o script, com
+        events vazio no timeout ou quando o acordou outra mudança (ex.: cashout),
+        ou None se o observador precisou ser reinstalado e ainda não está ativo.
+        """
+        if not self.installed and not self.install():
+            return None
+
+        # O timeout do script precisa cobrir a maior espera feita dentro da página
+        if self._script_timeout is None:
+            self.driver.set_script_timeout(MAX_WAIT + SCRIPT_TIMEOUT_MARGIN)
+            self._script_timeout = MAX_WAIT + SCRIPT_TIMEOUT_MARGIN
+
+        timeout_ms = int(min(max(timeout, 0.0), MAX_WAIT) * 1000)
+        payload = self.driver.execute_async_script(DRAIN_OBSERVER_JS, timeout_ms, selectors)
+
+        if payload is None:
+            logger.info("Container de histórico substituído; reinstalando observador")
+            self.installed = False
+            return None
+        return payload
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leitura em lote do estado da página do jogo
+Histórico, saldo, multiplicador atual e estado dos botões em uma única
+chamada ao WebDriver
+"""
+
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
+
+if TYPE_CHECKING:
+    # Só para anotações: o bot standalone importa este módulo sem pydantic
+    from models import ElementConfig
+
+logger = logging.getLogger(__name__)
+
+# Conversão do texto do histórico em números (mais recente primeiro), a mesma
+# na leitura do estado e no observador de mutações
+PARSE_HISTORY_FN_JS = r"""
+function parseHistory(text) {
+    var out = [];
+    var chunks = (text || '').replace(/x/gi, ' ').split(/\s+/);
+    for (var i = 0; i < chunks.length; i++) {
+        var value = parseFloat(chunks[i].replace(',', '.'));
+        if (!isNaN(value)) { out.push(value); }
+    }
+    return out;
+}
+"""
+
+# Função JS compartilhada entre a leitura direta e o dreno do observador.
+# Cada seletor é resolvido dentro da página; nenhum WebElement cruza o driver.
+PAGE_STATE_FN_JS = PARSE_HISTORY_FN_JS + r"""
+function readPageState(sel) {
+    function byXPath(xpath) {
+        if (!xpath) { return null; }
+        try {
+            return document.evaluate(xpath, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } catch (e) { return null; }
+    }
+    function textOf(el) { return el ? (el.innerText || el.textContent || '').trim() : null; }
+    function buttonState(el) {
+        if (!el) { return null; }
+        var visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        var enabled = !el.disabled && el.getAttribute('aria-disabled') !== 'true'
+            && !/disabled/.test(el.className || '');
+        return {visible: visible, enabled: enabled};
+    }
+    var history = sel.result_history ? document.getElementsByClassName(sel.result_history)[0] : null;
+    return {
+        history: history ? parseHistory(history.innerText) : null,
+        balance: textOf(byXPath(sel.balance_display)),
+        multiplier: textOf(byXPath(sel.multiplier_display)),
+        bet_amount: (function (el) { return el ? el.value : null; })(byXPath(sel.bet_input)),
+        bet_button: buttonState(byXPath(sel.bet_button)),
+        cashout_button: buttonState(byXPath(sel.cashout_button)),
+        tracker: (function (t) {
+            return t ? {armed: t.armed, fired: t.fired, target: t.target, cashout: t.cashout,
+                        last: t.last, max: t.max, updates: t.updates} : null;
+        })(window.__aviatorTracker),
+        ts: Date.now()
+    };
+}
+"""
+
+READ_PAGE_STATE_JS = PAGE_STATE_FN_JS + "return readPageState(arguments[0]);"
+
+STATE_SELECTORS = (
+    "result_history",
+    "balance_display",
+    "multiplier_display",
+    "bet_input",
+    "bet_button",
+    "cashout_button",
+)
+
+
+@dataclass
+class ButtonState:
+    """Estado de um botão do jogo"""
+    visible: bool = False
+    enabled: bool = False
+
+    @property
+    def clickable(self) -> bool:
+        return self.visible and self.enabled
+
+
+@dataclass
+class TrackerState:
+    """Resumo do rastreador do multiplicador em voo"""
+    armed: bool = False
+    fired: bool = False
+    target: Optional[float] = None
+    cashout: Optional[float] = None
+    last: Optional[float] = None
+    max: Optional[float] = None
+    updates: int = 0
+
+    @classmethod
+    def from_raw(cls, raw: Optional[Dict[str, Any]]) -> Optional["TrackerState"]:
+        if not raw:
+            return None
+        return cls(
+            armed=bool(raw.get("armed")),
+            fired=bool(raw.get("fired")),
+            target=raw.get("target"),
+            cashout=raw.get("cashout"),
+            last=raw.get("last"),
+            max=raw.get("max"),
+            updates=int(raw.get("updates") or 0),
+        )
+
+
+@dataclass
+class PageSnapshot:
+    """Fotografia do estado da página em um instante"""
+    history: Optional[List[float]] = None
+    balance: Optional[float] = None
+    multiplier: Optional[float] = None
+    bet_amount: Optional[float] = None  # Valor atualmente preenchido no campo de aposta
+    bet_button: Optional[ButtonState] = None
+    cashout_button: Optional[ButtonState] = None
+    tracker: Optional[TrackerState] = None
+    page_timestamp: Optional[float] = None
+    captured_at: float = field(default_factory=time.monotonic)
+
+
+def state_selectors(elements: "ElementConfig") -> Dict[str, str]:
+    """Seletores enviados ao script de leitura"""
+    return {name: getattr(elements, name) or "" for name in STATE_SELECTORS}
+
+
+def parse_balance(text: Optional[str]) -> Optional[float]:
+    """Converte o texto do saldo (ex.: 'R$ 12,50') em número"""
+    if not text:
+        return None
+    try:
+        return float(text.replace('R$', '').replace(',', '.').strip())
+    except ValueError:
+        return None
+
+
+def parse_multiplier(text: Optional[str]) -> Optional[float]:
+    """Converte o texto do multiplicador (ex.: '1.45x') em número"""
+    if not text:
+        return None
+    try:
+        return float(text.lower().replace('x', '').replace(',', '.').strip())
+    except ValueError:
+        return None
+
+
+def _parse_button(raw: Optional[Dict[str, Any]]) -> Optional[ButtonState]:
+    if not raw:
+        return None
+    return ButtonState(visible=bool(raw.get("visible")), enabled=bool(raw.get("enabled")))
+
+
+def parse_page_state(raw: Optional[Dict[str, Any]], history_size: Optional[int] = None) -> Optional[PageSnapshot]:
+    """Converte o resultado bruto do script em um PageSnapshot"""
+    if not raw:
+        return None
+
+    history = raw.get("history")
+    if history is not None:
+        history = [float(value) for value in history]
+        if history_size:
+            history = history[:history_size]
+
+    return PageSnapshot(
+        history=history or None,
+        balance=parse_balance(raw.get("balance")),
+        multiplier=parse_multiplier(raw.get("multiplier")),
+        bet_amount=parse_balance(raw.get("bet_amount")),
+        bet_button=_parse_button(raw.get("bet_button")),
+        cashout_button=_parse_button(raw.get("cashout_button")),
+        tracker=TrackerState.from_raw(raw.get("tracker")),
+        page_timestamp=raw.get("ts"),
+    )
+
+
+def read_page_state(driver, elements: "ElementConfig", history_size: Optional[int] = None) -> Optional[PageSnapshot]:
+    """Lê todo o estado da página com uma única chamada ao WebDriver"""
+    raw = driver.execute_script(READ_PAGE_STATE_JS, state_selectors(elements))
+    return parse_page_state(raw, history_size)
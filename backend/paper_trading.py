@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paper trading: estratégias executadas sobre as rodadas ao vivo sem clicar
+Cada portfólio tem sua BettingStrategy e suas SessionStats. As decisões seguem
+as regras de execute_betting_strategy (limites antes da aposta, valor com
+progressão) e a aposta é liquidada virtualmente pelo crash observado: ganha
+se o crash atinge o auto_cashout.
+Os gatilhos vêm do StrategyEvaluator do controlador, então N portfólios
+custam uma atualização compartilhada mais O(1) cada por rodada.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from models import BettingStrategy, SessionStats
+from strategy_evaluator import StrategyEvaluator
+
+logger = logging.getLogger(__name__)
+
+# Prefixo das regras dos portfólios no avaliador de estratégias
+PAPER_PREFIX = "paper:"
+
+COMPARE_METRICS = ("total_profit", "roi", "win_rate", "bets_placed")
+
+
+def virtual_cashout(target: Optional[float], crash_multiplier: float) -> Optional[float]:
+    """Multiplicador do cashout automático se o alvo foi atingido na rodada"""
+    if target and crash_multiplier >= target:
+        return target
+    return None
+
+
+class PaperPortfolio:
+    """Uma estratégia apostando virtualmente"""
+
+    def __init__(self, name: str, strategy: BettingStrategy):
+        self.name = name
+        self.strategy = strategy
+        self.stats = SessionStats()
+        self.active_bet: Optional[Dict[str, Any]] = None
+        self.is_betting = True
+        self.stop_reason: Optional[str] = None
+
+    def on_round(self, crash_multiplier: float, triggered: bool, can_bet: bool = True) -> None:
+        """Liquida a aposta da rodada e decide a próxima"""
+        stats = self.stats
+        stats.total_rounds += 1
+
+        bet = self.active_bet
+        if bet:
+            self.active_bet = None
+            cashout = virtual_cashout(bet["target"], crash_multiplier)
+            if cashout is not None:
+                stats.wins += 1
+                stats.total_profit += bet["amount"] * (cashout - 1)
+            else:
+                stats.losses += 1
+                stats.total_profit -= bet["amount"]
+
+        if not triggered:
+            return
+        stats.strategies_found += 1
+        if not self.is_betting or not can_bet:
+            return
+
+        strategy = self.strategy
+        if strategy.max_loss and stats.total_profit <= -strategy.max_loss and strategy.stop_on_loss:
+            self.stop("max_loss")
+            return
+        if strategy.max_win and stats.total_profit >= strategy.max_win and strategy.stop_on_win:
+            self.stop("max_win")
+            return
+
+        amount = strategy.calculate_bet_amount(stats)
+        stats.bets_placed += 1
+        stats.total_bet += amount
+        self.active_bet = {"amount": amount, "target": strategy.auto_cashout}
+
+    def stop(self, reason: str) -> None:
+        self.is_betting = False
+        self.stop_reason = reason
+        logger.info(f"Portfólio simulado {self.name} parou: {reason}")
+
+    def summary(self) -> Dict[str, Any]:
+        stats = self.stats
+        return {
+            "name": self.name,
+            "strategy": self.strategy.dict(),
+            "is_betting": self.is_betting,
+            "stop_reason": self.stop_reason,
+            "active_bet": self.active_bet,
+            "total_rounds": stats.total_rounds,
+            "strategies_found": stats.strategies_found,
+            "bets_placed": stats.bets_placed,
+            "wins": stats.wins,
+            "losses": stats.losses,
+            "total_bet": round(stats.total_bet, 2),
+            "total_profit": round(stats.total_profit, 2),
+            "win_rate": round(stats.calculate_win_rate(), 2),
+            "roi": round(stats.calculate_roi(), 2),
+            "started_at": stats.start_time.isoformat(),
+        }
+
+
+class PaperTradingManager:
+    """Portfólios simulados em paralelo sobre o mesmo fluxo de rodadas"""
+
+    def __init__(self, evaluator: StrategyEvaluator):
+        self.evaluator = evaluator
+        self.portfolios: Dict[str, PaperPortfolio] = {}
+
+    def __len__(self) -> int:
+        return len(self.portfolios)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.portfolios
+
+    def add(self, name: str, strategy: BettingStrategy, rule: Dict[str, Any]) -> PaperPortfolio:
+        """Cria um portfólio; `rule` é a regra de ativação já resolvida"""
+        if name in self.portfolios:
+            raise ValueError(f"Portfólio já existe: {name}")
+        self.evaluator.watch(PAPER_PREFIX + name, rule)
+        portfolio = self.portfolios[name] = PaperPortfolio(name, strategy)
+        logger.info(f"Portfólio simulado criado: {name}")
+        return portfolio
+
+    def remove(self, name: str) -> bool:
+        if self.portfolios.pop(name, None) is None:
+            return False
+        self.evaluator.unwatch(PAPER_PREFIX + name)
+        logger.info(f"Portfólio simulado removido: {name}")
+        return True
+
+    def get(self, name: str) -> Optional[PaperPortfolio]:
+        return self.portfolios.get(name)
+
+    def on_round(self, crash_multiplier: float, can_bet: bool = True) -> None:
+        """Chamado após o avaliador processar a rodada"""
+        is_triggered = self.evaluator.is_triggered
+        for name, portfolio in self.portfolios.items():
+            portfolio.on_round(crash_multiplier, is_triggered(PAPER_PREFIX + name), can_bet)
+
+    def compare(self, metric: str = "total_profit") -> List[Dict[str, Any]]:
+        """Resumo de todos os portfólios, do melhor para o pior pela métrica"""
+        if metric not in COMPARE_METRICS:
+            raise ValueError(f"Métrica inválida: {metric} (válidas: {', '.join(COMPARE_METRICS)})")
+        summaries = [portfolio.summary() for portfolio in self.portfolios.values()]
+        return sorted(summaries, key=lambda summary: summary[metric], reverse=True)
+
+    def get_status(self, metric: str = "total_profit") -> Dict[str, Any]:
+        return {
+            "portfolios": self.compare(metric),
+            "metric": metric,
+            "timestamp": datetime.now().isoformat(),
+        }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alinhamento incremental do histórico de resultados
+Descobre quantas rodadas novas apareceram entre duas leituras do histórico
+(mais recente primeiro) sem perder nem contar rodadas em dobro
+
+Leituras que divergem da anterior só na posição 0 (rodada mais recente mal
+lida) não geram rodada: ficam pendentes e, se a leitura seguinte confirmar,
+viram a correção da última rodada emitida. Depois de uma perda de
+sobreposição, a ressincronização emite as rodadas da janela confirmada que
+vêm depois da última rodada conhecida.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AlignedRound:
+    """Rodada nova identificada pelo alinhador"""
+    seq: int
+    multiplier: float
+    position: int  # Posição da rodada na janela atual (0 = mais recente)
+
+
+@dataclass
+class AlignmentResult:
+    """Resultado do alinhamento de uma janela"""
+    rounds: List[AlignedRound] = field(default_factory=list)  # Em ordem cronológica
+    gap: bool = False        # Sobreposição perdida nesta janela
+    resynced: bool = False   # Nova janela de referência adotada após um gap já reportado
+    # Última rodada emitida relida com outro valor (confirmado); vem antes de `rounds`
+    corrected: Optional[AlignedRound] = None
+
+
+def build_failure(pattern: Sequence[float], failure: List[int]) -> None:
+    """Preenche `failure` (reaproveitando a lista) com a função de prefixo do KMP"""
+    size = len(pattern)
+    if len(failure) < size:
+        failure.extend([0] * (size - len(failure)))
+    if not size:
+        return
+
+    failure[0] = 0
+    k = 0
+    for i in range(1, size):
+        while k and pattern[i] != pattern[k]:
+            k = failure[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        failure[i] = k
+
+
+def find_shift(current: Sequence[float], previous: Sequence[float], failure: Sequence[int]) -> tuple:
+    """
+    Menor deslocamento k tal que a janela anterior reaparece em current[k:].
+
+    A janela anterior pode reaparecer inteira (histórico cresceu) ou apenas
+    seu prefixo no final da janela atual (rodadas antigas saíram da tela).
+    Retorna (k, sobreposição) em O(len(current) + len(previous)).
+    """
+    size = len(previous)
+    if not size:
+        return len(current), 0
+
+    q = 0
+    for i, value in enumerate(current):
+        while q and value != previous[q]:
+            q = failure[q - 1]
+        if value == previous[q]:
+            q += 1
+        if q == size:
+            return i + 1 - size, size
+    return len(current) - q, q
+
+
+class HistoryAligner:
+    """Emite exatamente as rodadas novas de cada janela com sequência crescente"""
+
+    def __init__(self, min_overlap: int = 3, start_seq: int = 0):
+        self.min_overlap = min_overlap
+        self.next_seq = start_seq
+        self._previous: List[float] = []
+        self._failure: List[int] = []
+        self._candidate: List[float] = []
+        # Janela que difere da referência só na posição 0, aguardando confirmação
+        self._pending: List[float] = []
+        # Sequência da rodada na posição 0 da referência (None se não foi emitida)
+        self._front_seq: Optional[int] = None
+        self.gaps = 0
+        self.corrections = 0
+
+    def reset(self, start_seq: Optional[int] = None) -> None:
+        """Descarta a janela de referência (ex.: troca de iframe)"""
+        self._previous.clear()
+        self._candidate.clear()
+        self._pending.clear()
+        self._front_seq = None
+        if start_seq is not None:
+            self.next_seq = start_seq
+
+    def _required_overlap(self, reference: Sequence[float]) -> int:
+        return min(self.min_overlap, len(reference))
+
+    def _adopt(self, current: Sequence[float]) -> None:
+        self._previous[:] = current
+        build_failure(self._previous, self._failure)
+        self._candidate.clear()
+        self._pending.clear()
+
+    def _emit(self, current: Sequence[float], shift: int, result: AlignmentResult) -> None:
+        for position in range(shift - 1, -1, -1):
+            result.rounds.append(AlignedRound(self.next_seq, current[position], position))
+            self.next_seq += 1
+        if shift:
+            self._front_seq = self.next_seq - 1
+
+    @staticmethod
+    def _match(current: Sequence[float], reference: Sequence[float]) -> tuple:
+        failure: List[int] = []
+        build_failure(reference, failure)
+        return find_shift(current, reference, failure)
+
+    def _front_only_change(self, current: Sequence[float]) -> bool:
+        """Mesma janela da referência, exceto pelo valor da posição 0"""
+        previous = self._previous
+        return (len(current) == len(previous) and current[0] != previous[0]
+                and len(current) - 1 >= self._required_overlap(previous)
+                and current[1:] == previous[1:])
+
+    def align(self, current: Sequence[float]) -> AlignmentResult:
+        """Alinha a janela atual com a anterior e devolve as rodadas novas"""
+        result = AlignmentResult()
+        if not current:
+            return result
+
+        # Primeira janela vira a referência; nada é contado como rodada nova
+        if not self._previous:
+            self._adopt(current)
+            return result
+
+        shift, overlap = find_shift(current, self._previous, self._failure)
+        if overlap >= self._required_overlap(self._previous):
+            self._emit(current, shift, result)
+            if shift or len(current) != len(self._previous):
+                self._adopt(current)
+            else:
+                self._candidate.clear()
+                self._pending.clear()
+            return result
+
+        # Posição 0 relida com outro valor: confirmada pela leitura seguinte
+        # (igual ou já com rodadas novas na frente), corrige a última rodada
+        if self._pending:
+            shift, overlap = self._match(current, self._pending)
+            if overlap >= self._required_overlap(self._pending):
+                self._correct(current, shift, result)
+                self._emit(current, shift, result)
+                self._adopt(current)
+                return result
+        if self._front_only_change(current):
+            self._pending[:] = current
+            self._candidate.clear()
+            logger.warning("Rodada mais recente relida com outro valor (%s -> %s); aguardando confirmação",
+                           self._previous[0], current[0])
+            return result
+
+        # Sobreposição perdida: pode ser uma leitura corrompida (transitória) ou
+        # rodadas perdidas de verdade. Só adota a nova janela quando a leitura
+        # seguinte confirma o candidato.
+        if self._candidate:
+            _, overlap = self._match(current, self._candidate)
+            if overlap >= self._required_overlap(self._candidate):
+                self._resync(current, result)
+                return result
+
+        result.gap = True
+        self.gaps += 1
+        self._candidate[:] = current
+        self._pending.clear()
+        logger.warning("Sobreposição do histórico perdida; aguardando confirmação da próxima leitura")
+        return result
+
+    def _correct(self, current: Sequence[float], position: int, result: AlignmentResult) -> None:
+        value = current[position]
+        self._previous[0] = value
+        self.corrections += 1
+        if self._front_seq is not None:
+            result.corrected = AlignedRound(self._front_seq, value, position)
+        logger.warning("Rodada mais recente corrigida para %s (seq=%s)", value, self._front_seq)
+
+    def _resync(self, current: Sequence[float], result: AlignmentResult) -> None:
+        """
+        Adota a janela confirmada emitindo tudo o que nela é posterior à última
+        rodada conhecida: a sobreposição parcial (menor que min_overlap) com a
+        referência antiga, se houver, marca onde as rodadas novas começam. As
+        que saíram da tela durante a perda ficam contadas só no gap.
+        """
+        shift, _ = find_shift(current, self._previous, self._failure)
+        self._emit(current, shift, result)
+        self._adopt(current)
+        result.resynced = True
+        logger.warning("Histórico ressincronizado após perda de sobreposição: %d rodada(s) recuperada(s) (seq=%d)",
+                       shift, self.next_seq)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detecção da fase da rodada e agendamento adaptativo das leituras
+Lê rápido perto das transições de fase e recua enquanto nada deve mudar
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+from models import BotConfig, RoundPhaseEnum
+from page_state import PageSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PhaseTiming:
+    """Durações observadas de uma fase"""
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    polls: int = 0
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.min = duration if self.min is None else min(self.min, duration)
+        self.max = duration if self.max is None else max(self.max, duration)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "last": self.last if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "polls": self.polls,
+        }
+
+
+def detect_phase(snapshot: Optional[PageSnapshot], previous_multiplier: Optional[float],
+                 new_round: bool) -> RoundPhaseEnum:
+    """Deduz a fase a partir do multiplicador e do estado dos botões"""
+    if new_round:
+        return RoundPhaseEnum.CRASHED
+    if snapshot is None:
+        return RoundPhaseEnum.UNKNOWN
+
+    cashout = snapshot.cashout_button
+    bet = snapshot.bet_button
+    multiplier = snapshot.multiplier
+
+    rising = (
+        multiplier is not None and previous_multiplier is not None
+        and multiplier > previous_multiplier
+    )
+    if rising or (cashout and cashout.clickable):
+        return RoundPhaseEnum.FLYING
+    if bet and bet.clickable:
+        return RoundPhaseEnum.BETTING
+    if multiplier is None and bet is None and cashout is None:
+        return RoundPhaseEnum.UNKNOWN
+    return RoundPhaseEnum.WAITING
+
+
+class PhaseScheduler:
+    """Escolhe o próximo intervalo de leitura conforme a fase da rodada"""
+
+    def __init__(self, config: BotConfig):
+        self.config = config
+        self.phase = RoundPhaseEnum.UNKNOWN
+        self.phase_started = time.monotonic()
+        self.timings: Dict[RoundPhaseEnum, PhaseTiming] = {phase: PhaseTiming() for phase in RoundPhaseEnum}
+        self._last_multiplier: Optional[float] = None
+
+    def observe(self, snapshot: Optional[PageSnapshot], new_round: bool = False) -> RoundPhaseEnum:
+        """Registra uma leitura e atualiza a fase atual"""
+        now = time.monotonic()
+        phase = detect_phase(snapshot, self._last_multiplier, new_round)
+        self._last_multiplier = snapshot.multiplier if snapshot else None
+
+        if phase != self.phase:
+            # UNKNOWN não tem duração significativa; não entra nas médias
+            if self.phase != RoundPhaseEnum.UNKNOWN:
+                self.timings[self.phase].add(now - self.phase_started)
+            logger.debug("Fase da rodada: %s -> %s", self.phase.value, phase.value)
+            self.phase = phase
+            self.phase_started = now
+        self.timings[self.phase].polls += 1
+        return self.phase
+
+    def _base_interval(self) -> float:
+        return {
+            RoundPhaseEnum.BETTING: self.config.poll_interval_betting,
+            RoundPhaseEnum.FLYING: self.config.poll_interval_flying,
+            RoundPhaseEnum.CRASHED: self.config.poll_interval_crashed,
+            RoundPhaseEnum.WAITING: self.config.poll_interval_waiting,
+        }.get(self.phase, float(self.config.update_interval))
+
+    def next_interval(self) -> float:
+        """Intervalo até a próxima leitura"""
+        base = self._base_interval()
+        margin = self.config.phase_transition_margin
+        elapsed = time.monotonic() - self.phase_started
+
+        # Logo após uma transição a fase seguinte costuma vir rápido
+        if elapsed < margin:
+            return min(base, self.config.poll_interval_transition)
+
+        # Perto do fim esperado da fase (pela média observada) lê rápido;
+        # antes disso dorme só até a janela de transição começar
+        mean = self.timings[self.phase].mean
+        if mean is not None:
+            remaining = mean - margin - elapsed
+            if remaining <= 0:
+                return min(base, self.config.poll_interval_transition)
+            return max(min(base, remaining), self.config.poll_interval_transition)
+        return base
+
+    def get_timings(self) -> Dict[str, Any]:
+        """Tempos observados por fase"""
+        return {
+            "current_phase": self.phase.value,
+            "phase_elapsed": time.monotonic() - self.phase_started,
+            "phases": {phase.value: timing.to_dict() for phase, timing in self.timings.items()},
+        }
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento persistente das rodadas
+SQLite em modo WAL com inserções em lote feitas por uma thread de escrita;
+o final da série fica em cache na memória para leituras rápidas
+"""
+
+import queue
+import sqlite3
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from models import GameResult
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    round_seq INTEGER,
+    timestamp REAL NOT NULL,
+    multiplier REAL NOT NULL,
+    bet_amount REAL,
+    cashout_multiplier REAL,
+    profit REAL,
+    strategy_triggered INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_rounds_timestamp ON rounds (timestamp);
+CREATE INDEX IF NOT EXISTS idx_rounds_seq ON rounds (round_seq);
+"""
+
+COLUMNS = (
+    "session_id", "round_seq", "timestamp", "multiplier",
+    "bet_amount", "cashout_multiplier", "profit", "strategy_triggered",
+)
+
+_FLUSH = object()
+_STOP = object()
+_CORRECT = object()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # Em WAL, NORMAL só sincroniza no checkpoint: sem fsync por rodada
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def _row_to_result(row: sqlite3.Row) -> GameResult:
+    return GameResult(
+        multiplier=row["multiplier"],
+        round_seq=row["round_seq"],
+        timestamp=datetime.fromtimestamp(row["timestamp"]),
+        bet_amount=row["bet_amount"],
+        cashout_multiplier=row["cashout_multiplier"],
+        profit=row["profit"],
+        strategy_triggered=bool(row["strategy_triggered"]),
+    )
+
+
+class RoundStore:
+    """Histórico de rodadas append-only com escrita em lote"""
+
+    def __init__(self, path: str = "rounds.db", batch_size: int = 50,
+                 flush_interval: float = 1.0, cache_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        self.tail: deque = deque(maxlen=cache_size)
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._read_lock = threading.Lock()
+
+        self._reader = _connect(path)
+        self._reader.row_factory = sqlite3.Row
+        self._reader.executescript(SCHEMA)
+        self._load_tail()
+
+    def _load_tail(self) -> None:
+        rows = self._reader.execute(
+            "SELECT * FROM rounds ORDER BY id DESC LIMIT ?", (self.tail.maxlen,)
+        ).fetchall()
+        self.tail.extend(_row_to_result(row) for row in reversed(rows))
+
+    def start(self) -> None:
+        """Inicia a thread de escrita (idempotente)"""
+        if self._writer and self._writer.is_alive():
+            return
+        self._writer = threading.Thread(target=self._write_loop, name="round-store", daemon=True)
+        self._writer.start()
+
+    def _write_loop(self) -> None:
+        connection = _connect(self.path)
+        batch: List[tuple] = []
+        corrections: List[tuple] = []
+        waiters: List[threading.Event] = []
+        running = True
+
+        while running:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = _FLUSH
+
+            if item is _STOP:
+                running = False
+            elif isinstance(item, tuple) and item[0] is _FLUSH:
+                waiters.append(item[1])
+            elif isinstance(item, tuple) and item[0] is _CORRECT:
+                corrections.append(item[1:])
+            elif item is not _FLUSH:
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(
+                            f"INSERT INTO rounds ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                            batch
+                        )
+                    self.written += len(batch)
+                except Exception as e:
+                    logger.error(f"Erro ao gravar rodadas: {e}")
+                batch = []
+
+            # Depois do lote: a rodada corrigida pode estar nele
+            if corrections:
+                try:
+                    with connection:
+                        connection.executemany(
+                            "UPDATE rounds SET multiplier = ? WHERE session_id = ? AND round_seq = ?",
+                            corrections
+                        )
+                except Exception as e:
+                    logger.error(f"Erro ao corrigir rodadas: {e}")
+                corrections = []
+
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+        connection.close()
+
+    def append(self, result: GameResult) -> None:
+        """Registra uma rodada (não bloqueia; a gravação é feita em lote)"""
+        self.tail.append(result)
+        if not self._writer or not self._writer.is_alive():
+            self.start()
+        self._queue.put((
+            self.session_id,
+            result.round_seq,
+            result.timestamp.timestamp(),
+            result.multiplier,
+            result.bet_amount,
+            result.cashout_multiplier,
+            result.profit,
+            int(result.strategy_triggered),
+        ))
+
+    def correct(self, round_seq: int, multiplier: float) -> None:
+        """Corrige o multiplicador de uma rodada desta sessão (leitura corrigida)"""
+        for index in range(len(self.tail) - 1, -1, -1):
+            if self.tail[index].round_seq == round_seq:
+                self.tail[index] = self.tail[index].copy(update={"multiplier": multiplier})
+                break
+        if not self._writer or not self._writer.is_alive():
+            self.start()
+        self._queue.put((_CORRECT, multiplier, self.session_id, round_seq))
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Aguarda a gravação de tudo o que já foi enfileirado"""
+        if not self._writer or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Grava o lote pendente e encerra a thread de escrita"""
+        if self._writer and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join(10)
+        with self._read_lock:
+            self._reader.close()
+
+    def last_seq(self) -> int:
+        """Maior sequência de rodada já registrada (-1 se vazio)"""
+        seqs = [result.round_seq for result in self.tail if result.round_seq is not None]
+        if seqs:
+            return max(seqs)
+        with self._read_lock:
+            row = self._reader.execute("SELECT MAX(round_seq) FROM rounds").fetchone()
+        return row[0] if row and row[0] is not None else -1
+
+    def recent(self, limit: int = 100) -> List[GameResult]:
+        """Últimas rodadas a partir do cache em memória"""
+        if limit >= len(self.tail):
+            return list(self.tail)
+        return [self.tail[i] for i in range(len(self.tail) - limit, len(self.tail))]
+
+    def query(self, limit: int = 100, since_seq: Optional[int] = None,
+              since: Optional[datetime] = None) -> List[GameResult]:
+        """Consulta rodadas gravadas (mais antigas primeiro)"""
+        if since_seq is None and since is None and limit <= len(self.tail):
+            return self.recent(limit)
+
+        self.flush()
+        clauses, params = [], []
+        if since_seq is not None:
+            clauses.append("round_seq > ?")
+            params.append(since_seq)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.timestamp())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._read_lock:
+            rows = self._reader.execute(
+                f"SELECT * FROM (SELECT * FROM rounds {where} ORDER BY id DESC LIMIT ?) ORDER BY id",
+                (*params, limit)
+            ).fetchall()
+        return [_row_to_result(row) for row in rows]
+
+    def multipliers(self, limit: Optional[int] = None) -> List[float]:
+        """Série de multiplicadores em ordem cronológica"""
+        self.flush()
+        with self._read_lock:
+            if limit:
+                rows = self._reader.execute(
+                    "SELECT multiplier FROM (SELECT id, multiplier FROM rounds ORDER BY id DESC LIMIT ?) ORDER BY id",
+                    (limit,)
+                ).fetchall()
+            else:
+                rows = self._reader.execute("SELECT multiplier FROM rounds ORDER BY id").fetchall()
+        return [row[0] for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas do armazenamento"""
+        return {
+            "path": self.path,
+            "session_id": self.session_id,
+            "written": self.written,
+            "pending": self._queue.qsize(),
+            "cached": len(self.tail),
+        }
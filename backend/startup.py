@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inicialização rápida do bot
+
+- resolve_chromedriver: caminho do chromedriver resolvido uma vez e guardado
+  em arquivo; os próximos inícios não passam pelo ChromeDriverManager (que
+  consulta a versão pela rede a cada chamada).
+- Condições de prontidão para o WebDriverWait, no lugar das esperas fixas
+  depois de navegar, clicar e entrar no iframe.
+- StartupTimeline: duração de cada fase do início a frio até o monitoramento.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config_loader import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+# Caminho resolvido nesta execução (evita até a leitura do arquivo de cache)
+_resolved_path: Optional[str] = None
+_resolve_lock = threading.Lock()
+
+
+def _usable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_cached_path(cache_file: str) -> Optional[str]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get("path")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def resolve_chromedriver(cache_file: str, explicit_path: str = "", refresh: bool = False,
+                         installer: Optional[Callable[[], str]] = None) -> str:
+    """
+    Caminho do chromedriver, na ordem: caminho configurado, o já resolvido
+    nesta execução, o gravado em `cache_file` e, só se nenhum existir (ou com
+    `refresh`), o ChromeDriverManager, cujo resultado é gravado no cache
+    """
+    global _resolved_path
+    if _usable(explicit_path):
+        return explicit_path
+
+    with _resolve_lock:
+        if not refresh:
+            if _usable(_resolved_path):
+                return _resolved_path
+            cached = _read_cached_path(cache_file)
+            if _usable(cached):
+                _resolved_path = cached
+                return cached
+
+        if installer is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            installer = ChromeDriverManager().install
+        logger.info("Resolvendo chromedriver (consulta de versão)...")
+        path = installer()
+        _resolved_path = path
+        try:
+            atomic_write_json(cache_file, {"path": path, "resolved_at": datetime.now().isoformat()})
+        except OSError as e:
+            logger.warning("Não foi possível gravar o cache do chromedriver: %s", e)
+        return path
+
+
+def document_ready(driver) -> bool:
+    """Condição: DOM do documento atual (página ou iframe) pronto para busca"""
+    return driver.execute_script("return document.readyState") in ("interactive", "complete")
+
+
+class StartupTimeline:
+    """Duração de cada fase do início (marcações sequenciais, relógio monotônico)"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._start = time.monotonic()
+        self._last = self._start
+        self.phases: List[Tuple[str, float]] = []
+        self.total: Optional[float] = None
+
+    def mark(self, phase: str) -> float:
+        """Fecha a fase `phase` (desde a marcação anterior) e devolve sua duração"""
+        now = time.monotonic()
+        duration = now - self._last
+        self._last = now
+        self.phases.append((phase, duration))
+        return duration
+
+    def finish(self) -> float:
+        """Tempo total do início a frio até aqui (início do monitoramento)"""
+        self.total = time.monotonic() - self._start
+        return self.total
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "phases_ms": {phase: round(duration * 1000, 1) for phase, duration in self.phases},
+            "total_ms": round(self.total * 1000, 1) if self.total is not None else None,
+            "completed": self.total is not None,
+        }
+
+    def describe(self) -> str:
+        return ", ".join(f"{phase}={duration:.2f}s" for phase, duration in self.phases)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de estado pré-serializado
+
+Cada estado (status, estatísticas, snapshot do /ws) é serializado uma vez por
+versão e os mesmos bytes atendem todos os leitores: respostas REST (com ETag
+e 304) e clientes WebSocket. A versão vem do controlador (state_version, que
+avança a cada notificação de mudança); `max_age` limita por quanto tempo uma
+versão é reaproveitada, cobrindo mudanças que não passam por notificação.
+Campos que mudam a cada leitura (uptime, last_update) ficam fora do corpo em
+cache e do ETag: são calculados por requisição e acrescentados com body_with().
+
+Usa orjson quando instalado; sem ele, json da biblioteca padrão.
+"""
+
+import json
+import time
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+# Reuso máximo de uma versão (s)
+DEFAULT_MAX_AGE = 1.0
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serializa para JSON em bytes (datas em ISO 8601)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@dataclass(frozen=True)
+class CachedState:
+    """Uma versão serializada de um estado"""
+    version: int
+    body: bytes
+    text: str  # mesmo conteúdo para send_text do WebSocket
+    etag: str
+    created_at: float
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Se o cabeçalho If-None-Match do cliente já cobre esta versão"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+
+    def body_with(self, fields: Dict[str, Any]) -> bytes:
+        """Corpo (objeto JSON) com `fields` acrescentados, sem reserializar o resto"""
+        if not fields:
+            return self.body
+        extra = dumps(fields)
+        if self.body == b"{}":
+            return extra
+        return self.body[:-1] + b"," + extra[1:]
+
+
+class StateCache:
+    """Estados nomeados, serializados uma vez por versão"""
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE):
+        self.max_age = max_age
+        self._entries: Dict[str, CachedState] = {}
+        self.serializations = 0
+        self.hits = 0
+
+    def get(self, name: str, version: int, build: Callable[[], Any]) -> CachedState:
+        """Bytes do estado `name` na versão; `build` só roda quando a versão muda"""
+        entry = self._entries.get(name)
+        now = time.monotonic()
+        if entry and entry.version == version and now - entry.created_at < self.max_age:
+            self.hits += 1
+            return entry
+
+        body = dumps(build())
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        entry = self._entries[name] = CachedState(version, body, body.decode(), etag, now)
+        self.serializations += 1
+        return entry
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        reads = self.hits + self.serializations
+        return {
+            "entries": len(self._entries),
+            "serializations": self.serializations,
+            "hits": self.hits,
+            "hit_rate": self.hits / reads if reads else 0.0,
+            "encoder": "orjson" if orjson is not None else "json",
+        }
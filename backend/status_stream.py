@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fluxo de status do bot por deltas
+
+Protocolo do /ws:
+- ao conectar (ou quando pede com {"type": "snapshot_request"}) o cliente
+  recebe `status_snapshot` com o estado completo e a versão atual;
+- a cada mudança de estado é enviado `status_delta` só com os campos que
+  mudaram em cada seção (`status`, `stats`), com `base` (versão anterior) e
+  `version`. Um cliente cuja versão difere de `base` perdeu mensagens (fila
+  cheia) e deve pedir um novo snapshot.
+- a fase da rodada (`round_phase`) muda a cada poucos segundos e vai em um
+  canal próprio, sem versão: {"type": "round_phase", "data": {"phase": ...}}.
+  Vale sempre a mais recente; o snapshot traz a atual em `phase`.
+
+Só as seções informadas em update() são comparadas: quem publica passa
+apenas as que mudaram, sem reconstruir nem comparar as outras. Campos que
+mudam a cada leitura (last_update, uptime) não disparam deltas; seguem junto
+quando outro campo muda.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# Campos que sozinhos não caracterizam mudança de estado
+VOLATILE_FIELDS = {"last_update", "uptime"}
+
+
+def diff_section(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos de `new` que diferem de `old` (valores aninhados são trocados inteiros)"""
+    changes = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    for key in old.keys() - new.keys():
+        changes[key] = None
+    return changes
+
+
+class StatusStream:
+    """Mantém o último estado publicado e gera snapshots e deltas versionados"""
+
+    def __init__(self):
+        self.version = 0
+        # Muda a cada mensagem publicada (deltas e fase): chave do snapshot em cache
+        self.revision = 0
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.phase: Optional[str] = None
+        self.deltas = 0
+        self.phase_messages = 0
+
+    def update(self, sections: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Registra o estado atual das seções informadas ({seção: campos}; as
+        demais ficam como estão) e retorna a mensagem de delta, ou None se
+        nada relevante mudou
+        """
+        changes = {}
+        relevant = False
+        for section, fields in sections.items():
+            section_changes = diff_section(self.state.get(section, {}), fields)
+            if section_changes:
+                changes[section] = section_changes
+                relevant = relevant or any(key not in VOLATILE_FIELDS for key in section_changes)
+        if not relevant:
+            return None
+
+        self.state = {**self.state, **sections}
+        self.version += 1
+        self.revision += 1
+        self.deltas += 1
+        return {
+            "type": "status_delta",
+            "data": {
+                "base": self.version - 1,
+                "version": self.version,
+                "changes": changes,
+                "timestamp": datetime.now().isoformat(),
+            },
+        }
+
+    def update_phase(self, phase: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Mensagem de fase da rodada, ou None se ela não mudou"""
+        if phase == self.phase:
+            return None
+        self.phase = phase
+        self.revision += 1
+        self.phase_messages += 1
+        return {
+            "type": "round_phase",
+            "data": {"phase": phase, "timestamp": datetime.now().isoformat()},
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Mensagem com o estado completo da versão atual"""
+        return {
+            "type": "status_snapshot",
+            "data": {
+                "version": self.version,
+                **self.state,
+                "phase": self.phase,
+                "timestamp": datetime.now().isoformat(),
+            },
+        }
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Avaliação incremental de várias estratégias sobre o mesmo fluxo de rodadas
+
+As condições das regras (ver strategy_rules) viram células de estado
+compartilhadas, atualizadas uma única vez por rodada:
+- sequência atual abaixo/acima de cada threshold
+- soma móvel de cada tamanho de janela
+- contagem móvel abaixo/acima de cada (threshold, janela)
+Cada estratégia observada é uma closure que só lê essas células, então o
+custo por rodada é O(condições distintas) + O(1) por estratégia, sem fatiar
+nem percorrer o histórico.
+
+As últimas rodadas ficam retidas para que uma regra registrada no meio do
+fluxo (troca de threshold, estratégia personalizada, carteira simulada)
+comece com as células reconstruídas e dê o mesmo resultado que a regra
+avaliada desde o início.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from strategy_rules import SUM_TOLERANCE, compile_rule
+
+# Somas móveis são recalculadas periodicamente para não acumular erro de float
+RESYNC_INTERVAL = 10000
+# Rodadas retidas para reconstruir células de regras novas (no mínimo; regras
+# com janela maior aumentam a retenção)
+RETAINED_ROUNDS = 1000
+
+Predicate = Callable[[], bool]
+
+
+class RoundFeatures:
+    """Estado por rodada compartilhado entre todas as regras observadas"""
+
+    def __init__(self, retained: int = RETAINED_ROUNDS):
+        self.history: deque = deque(maxlen=max(1, retained))
+        self.rounds = [0]  # rodadas desde o último reset (célula)
+        self._runs: Dict[Tuple[float, bool], list] = {}
+        self._sums: Dict[int, list] = {}
+        self._counts: Dict[Tuple[float, int, bool], list] = {}
+        self._since_resync = 0
+
+    @property
+    def size(self) -> int:
+        """Número de células mantidas"""
+        return len(self._runs) + len(self._sums) + len(self._counts)
+
+    def _retain(self, length: int) -> None:
+        if length > self.history.maxlen:
+            self.history = deque(self.history, maxlen=length)
+
+    def run_cell(self, threshold: float, below: bool, length: int = 1) -> list:
+        """Sequência atual de rodadas abaixo (ou iguais/acima) do threshold"""
+        key = (threshold, below)
+        cell = self._runs.get(key)
+        if cell is None:
+            self._retain(length)
+            run = 0
+            for value in reversed(self.history):
+                if (value < threshold) != below:
+                    break
+                run += 1
+            # Limitada ao que foi retido: exata se a sequência começou dentro
+            # do histórico, e sempre >= length quando a regra deve disparar
+            cell = self._runs[key] = [run]
+        return cell
+
+    def sum_cell(self, window: int) -> list:
+        """[soma das últimas `window` rodadas, rodadas incluídas]"""
+        cell = self._sums.get(window)
+        if cell is None:
+            self._retain(window)
+            recent = list(self.history)[-window:]
+            cell = self._sums[window] = [sum(recent), len(recent)]
+        return cell
+
+    def count_cell(self, threshold: float, window: int, below: bool) -> list:
+        """[rodadas abaixo (ou iguais/acima) do threshold na janela, rodadas incluídas]"""
+        key = (threshold, window, below)
+        cell = self._counts.get(key)
+        if cell is None:
+            self._retain(window)
+            recent = list(self.history)[-window:]
+            cell = self._counts[key] = [sum((value < threshold) == below for value in recent), len(recent)]
+        return cell
+
+    def update(self, value: float) -> None:
+        """Inclui uma rodada em todas as células"""
+        history = self.history
+        size = len(history)
+
+        for (threshold, below), cell in self._runs.items():
+            cell[0] = cell[0] + 1 if (value < threshold) == below else 0
+
+        for window, cell in self._sums.items():
+            if cell[1] >= window:
+                cell[0] += value - history[size - window]
+            else:
+                cell[0] += value
+                cell[1] += 1
+
+        for (threshold, window, below), cell in self._counts.items():
+            if cell[1] >= window:
+                cell[0] += ((value < threshold) == below) - ((history[size - window] < threshold) == below)
+            else:
+                cell[0] += (value < threshold) == below
+                cell[1] += 1
+
+        history.append(value)
+        self.rounds[0] += 1
+
+        self._since_resync += 1
+        if self._since_resync >= RESYNC_INTERVAL:
+            self._resync()
+
+    def _resync(self) -> None:
+        recent = list(self.history)
+        for window, cell in self._sums.items():
+            if cell[1] >= window:
+                cell[0] = sum(recent[-window:])
+        self._since_resync = 0
+
+    def reset(self) -> None:
+        """Zera o estado mantendo as células registradas"""
+        self.history.clear()
+        self.rounds[0] = 0
+        for cell in self._runs.values():
+            cell[0] = 0
+        for cell in self._sums.values():
+            cell[0], cell[1] = 0.0, 0
+        for cell in self._counts.values():
+            cell[0], cell[1] = 0, 0
+        self._since_resync = 0
+
+    def prune(self, runs: Iterable, sums: Iterable, counts: Iterable) -> None:
+        """Descarta células que nenhuma regra usa mais"""
+        for store, keep in ((self._runs, set(runs)), (self._sums, set(sums)), (self._counts, set(counts))):
+            for key in list(store):
+                if key not in keep:
+                    del store[key]
+
+
+class _StreamCompiler:
+    """Transforma a especificação de uma regra em closures sobre as células"""
+
+    def __init__(self, features: RoundFeatures):
+        self.features = features
+        self.runs: List[Tuple[float, bool]] = []
+        self.sums: List[int] = []
+        self.counts: List[Tuple[float, int, bool]] = []
+
+    def compile(self, spec: Dict[str, Any]) -> Tuple[Predicate, Predicate]:
+        """Retorna (predicado, pronto); `pronto` indica histórico suficiente"""
+        op, params = next(iter(spec.items()))
+        rounds = self.features.rounds
+
+        if op in ("run_below", "run_above"):
+            threshold, length = float(params["threshold"]), int(params["length"])
+            below = op == "run_below"
+            cell = self.features.run_cell(threshold, below, length)
+            self.runs.append((threshold, below))
+            return (lambda: cell[0] >= length), (lambda: rounds[0] >= length)
+
+        if op in ("avg_below", "avg_above"):
+            threshold, window = float(params["threshold"]), int(params["window"])
+            limit = threshold * window - SUM_TOLERANCE
+            cell = self.features.sum_cell(window)
+            self.sums.append(window)
+            ready = lambda: cell[1] >= window
+            if op == "avg_below":
+                return (lambda: cell[1] >= window and cell[0] < limit), ready
+            return (lambda: cell[1] >= window and cell[0] >= limit), ready
+
+        if op in ("count_below", "count_above"):
+            threshold, window, minimum = float(params["threshold"]), int(params["window"]), int(params["min"])
+            below = op == "count_below"
+            cell = self.features.count_cell(threshold, window, below)
+            self.counts.append((threshold, window, below))
+            return (lambda: cell[1] >= window and cell[0] >= minimum), (lambda: cell[1] >= window)
+
+        if op == "not":
+            inner, ready = self.compile(params)
+            return (lambda: ready() and not inner()), ready
+
+        children = [self.compile(child) for child in params]
+        predicates = tuple(child[0] for child in children)
+        readies = tuple(child[1] for child in children)
+
+        def all_ready():
+            for child in readies:
+                if not child():
+                    return False
+            return True
+
+        if op == "all":
+            def predicate():
+                for child in predicates:
+                    if not child():
+                        return False
+                return True
+        else:
+            def predicate():
+                for child in predicates:
+                    if child():
+                        return True
+                return False
+        return predicate, all_ready
+
+
+class StrategyEvaluator:
+    """Observa muitas regras de estratégia com uma atualização por rodada"""
+
+    def __init__(self, retained: int = RETAINED_ROUNDS):
+        self.features = RoundFeatures(retained)
+        self._predicates: Dict[str, Predicate] = {}
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._usage: Dict[str, Tuple[list, list, list]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self.triggered: Dict[str, bool] = {}
+        self.update_time = 0.0
+        self.updates = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._predicates
+
+    def __len__(self) -> int:
+        return len(self._predicates)
+
+    @property
+    def rounds(self) -> int:
+        return self.features.rounds[0]
+
+    def watch(self, name: str, spec: Dict[str, Any]) -> None:
+        """Registra (ou substitui) uma regra; levanta RuleError se inválida"""
+        compile_rule(spec)
+        compiler = _StreamCompiler(self.features)
+        predicate, _ = compiler.compile(spec)
+        replaced = name in self._predicates
+        self._predicates[name] = predicate
+        self._specs[name] = spec
+        self._usage[name] = (compiler.runs, compiler.sums, compiler.counts)
+        if not replaced or self._stats[name]["rule"] != spec:
+            self._stats[name] = {"rule": spec, "triggers": 0, "last_trigger_round": None}
+        self.triggered[name] = predicate()
+        if replaced:
+            self._prune()
+
+    def unwatch(self, name: str) -> None:
+        """Remove uma regra e as células que só ela usava"""
+        if self._predicates.pop(name, None) is None:
+            return
+        self._specs.pop(name)
+        self._usage.pop(name)
+        self._stats.pop(name)
+        self.triggered.pop(name, None)
+        self._prune()
+
+    def _prune(self) -> None:
+        runs, sums, counts = [], [], []
+        for used_runs, used_sums, used_counts in self._usage.values():
+            runs.extend(used_runs)
+            sums.extend(used_sums)
+            counts.extend(used_counts)
+        self.features.prune(runs, sums, counts)
+
+    def update(self, multiplier: float) -> List[str]:
+        """Inclui uma rodada e devolve as regras que disparam após ela"""
+        start = time.perf_counter()
+        self.features.update(multiplier)
+        rounds = self.features.rounds[0]
+        fired = []
+        triggered = self.triggered
+        for name, predicate in self._predicates.items():
+            result = predicate()
+            triggered[name] = result
+            if result:
+                fired.append(name)
+                stats = self._stats[name]
+                stats["triggers"] += 1
+                stats["last_trigger_round"] = rounds
+        self.update_time += time.perf_counter() - start
+        self.updates += 1
+        return fired
+
+    def is_triggered(self, name: str) -> bool:
+        """Se a regra disparou com a última rodada"""
+        return self.triggered.get(name, False)
+
+    def reset(self) -> None:
+        """Descarta o histórico (as regras continuam registradas)"""
+        self.features.reset()
+        for name in self.triggered:
+            self.triggered[name] = False
+
+    def seed(self, history: Iterable[float]) -> None:
+        """Reinicia o estado a partir de um histórico (ordem cronológica) sem contar gatilhos"""
+        self.features.reset()
+        for value in history:
+            self.features.update(value)
+        for name, predicate in self._predicates.items():
+            self.triggered[name] = predicate()
+
+    def get_stats(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Gatilhos por regra e custo médio da atualização"""
+        rounds = max(self.rounds, 1)
+        selected = self._stats if names is None else {name: self._stats[name] for name in names if name in self._stats}
+        return {
+            "strategies": len(self._predicates),
+            "features": self.features.size,
+            "rounds": self.rounds,
+            "avg_update_us": (self.update_time / self.updates * 1e6) if self.updates else 0.0,
+            "watched": {
+                name: {**stats, "trigger_rate": stats["triggers"] / rounds, "triggered": self.triggered.get(name, False)}
+                for name, stats in selected.items()
+            },
+        }
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regras declarativas de estratégia
+Uma regra é um dict (serializável em JSON) compilado uma única vez em:
+- um predicado escalar, avaliado a cada rodada sobre o histórico (mais recente primeiro)
+- um predicado vetorizado, que avalia toda uma série cronológica com NumPy
+  (ou várias séries de uma vez, uma por linha de uma matriz)
+
+Condições:
+    {"run_below": {"threshold": 2.0, "length": 4}}    últimas N rodadas abaixo do limite
+    {"run_above": {"threshold": 2.0, "length": 3}}    últimas N rodadas iguais ou acima
+    {"avg_below": {"threshold": 1.8, "window": 10}}   média da janela abaixo do limite
+    {"avg_above": {"threshold": 3.0, "window": 10}}   média da janela igual ou acima
+    {"count_below": {"threshold": 2.0, "window": 10, "min": 7}}   ao menos `min` rodadas abaixo
+    {"count_above": {"threshold": 2.0, "window": 10, "min": 7}}   ao menos `min` rodadas iguais ou acima
+Combinações:
+    {"all": [...]}, {"any": [...]}, {"not": {...}}
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Sequence
+
+import numpy as np
+
+ScalarPredicate = Callable[[Sequence[float]], bool]
+VectorPredicate = Callable[[np.ndarray], np.ndarray]
+
+SUM_TOLERANCE = 1e-6
+
+
+class RuleError(ValueError):
+    """Regra de estratégia inválida"""
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Regra compilada com o número mínimo de rodadas que ela precisa"""
+    spec: Dict[str, Any]
+    lookback: int
+    predicate: ScalarPredicate
+    vectorized: VectorPredicate
+
+    def __call__(self, results: Sequence[float]) -> bool:
+        return self.predicate(results)
+
+
+def default_rule_spec(threshold: float, length: int) -> Dict[str, Any]:
+    """Regra padrão: as últimas `length` rodadas abaixo de `threshold`"""
+    return {"run_below": {"threshold": threshold, "length": length}}
+
+
+def _number(params: Dict[str, Any], key: str, op: str, minimum: float = 0.0) -> float:
+    if key not in params:
+        raise RuleError(f"'{op}' requer o parâmetro '{key}'")
+    try:
+        value = float(params[key])
+    except (TypeError, ValueError):
+        raise RuleError(f"'{op}.{key}' deve ser numérico")
+    if value < minimum:
+        raise RuleError(f"'{op}.{key}' deve ser >= {minimum}")
+    return value
+
+
+def _integer(params: Dict[str, Any], key: str, op: str, minimum: int = 1) -> int:
+    value = _number(params, key, op, minimum)
+    if value != int(value):
+        raise RuleError(f"'{op}.{key}' deve ser inteiro")
+    return int(value)
+
+
+# Funções de janela vetorizadas: cada uma recebe a série cronológica (no
+# último eixo) e devolve um valor por rodada, considerando a série até ali
+
+def _run_lengths(mask: np.ndarray) -> np.ndarray:
+    """Comprimento da sequência de True terminando em cada posição"""
+    index = np.arange(1, mask.shape[-1] + 1)
+    last_false = np.maximum.accumulate(np.where(mask, 0, index), axis=-1)
+    return index - last_false
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Soma das últimas `window` posições (NaN enquanto a janela não enche)"""
+    sums = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        cumulative = np.cumsum(values, axis=-1, dtype=np.float64)
+        cumulative = np.concatenate((np.zeros(values.shape[:-1] + (1,)), cumulative), axis=-1)
+        sums[..., window - 1:] = cumulative[..., window:] - cumulative[..., :-window]
+    return sums
+
+
+def _compile_run(op: str, params: Dict[str, Any]) -> CompiledRule:
+    threshold = _number(params, "threshold", op)
+    length = _integer(params, "length", op)
+    below = op == "run_below"
+
+    if below:
+        def predicate(results):
+            return len(results) >= length and max(results[:length]) < threshold
+    else:
+        def predicate(results):
+            return len(results) >= length and min(results[:length]) >= threshold
+
+    def vectorized(series):
+        mask = series < threshold if below else series >= threshold
+        return _run_lengths(mask) >= length
+
+    return CompiledRule({op: params}, length, predicate, vectorized)
+
+
+def _compile_avg(op: str, params: Dict[str, Any]) -> CompiledRule:
+    threshold = _number(params, "threshold", op)
+    window = _integer(params, "window", op)
+    # Tolerância: somas de multiplicadores decimais (ex.: 2.17 + 3.82 + ...)
+    # não são exatas e a ordem da soma difere entre as duas avaliações
+    limit = threshold * window - SUM_TOLERANCE
+    below = op == "avg_below"
+
+    if below:
+        def predicate(results):
+            return len(results) >= window and sum(results[:window]) < limit
+    else:
+        def predicate(results):
+            return len(results) >= window and sum(results[:window]) >= limit
+
+    def vectorized(series):
+        sums = _window_sums(series, window)
+        with np.errstate(invalid="ignore"):
+            return sums < limit if below else sums >= limit
+
+    return CompiledRule({op: params}, window, predicate, vectorized)
+
+
+def _compile_count(op: str, params: Dict[str, Any]) -> CompiledRule:
+    threshold = _number(params, "threshold", op)
+    window = _integer(params, "window", op)
+    minimum = _integer(params, "min", op)
+    if minimum > window:
+        raise RuleError(f"'{op}.min' não pode ser maior que '{op}.window'")
+    below = op == "count_below"
+
+    if below:
+        def predicate(results):
+            return len(results) >= window and sum(x < threshold for x in results[:window]) >= minimum
+    else:
+        def predicate(results):
+            return len(results) >= window and sum(x >= threshold for x in results[:window]) >= minimum
+
+    def vectorized(series):
+        mask = series < threshold if below else series >= threshold
+        counts = _window_sums(mask.astype(np.float64), window)
+        with np.errstate(invalid="ignore"):
+            return counts >= minimum
+
+    return CompiledRule({op: params}, window, predicate, vectorized)
+
+
+def _compile_all(op: str, params: Any) -> CompiledRule:
+    children = _compile_children(op, params)
+    predicates = tuple(child.predicate for child in children)
+
+    def predicate(results):
+        for child in predicates:
+            if not child(results):
+                return False
+        return True
+
+    def vectorized(series):
+        return np.logical_and.reduce([child.vectorized(series) for child in children])
+
+    return CompiledRule({op: params}, max(child.lookback for child in children), predicate, vectorized)
+
+
+def _compile_any(op: str, params: Any) -> CompiledRule:
+    children = _compile_children(op, params)
+    predicates = tuple(child.predicate for child in children)
+
+    def predicate(results):
+        for child in predicates:
+            if child(results):
+                return True
+        return False
+
+    def vectorized(series):
+        return np.logical_or.reduce([child.vectorized(series) for child in children])
+
+    return CompiledRule({op: params}, max(child.lookback for child in children), predicate, vectorized)
+
+
+def _compile_not(op: str, params: Any) -> CompiledRule:
+    child = compile_rule(params)
+    lookback = child.lookback
+    inner = child.predicate
+
+    # Sem histórico suficiente a regra negada também não dispara
+    def predicate(results):
+        return len(results) >= lookback and not inner(results)
+
+    def vectorized(series):
+        result = ~child.vectorized(series)
+        result[..., :lookback - 1] = False
+        return result
+
+    return CompiledRule({op: params}, lookback, predicate, vectorized)
+
+
+def _compile_children(op: str, params: Any) -> list:
+    if not isinstance(params, (list, tuple)) or not params:
+        raise RuleError(f"'{op}' requer uma lista não vazia de regras")
+    return [compile_rule(child) for child in params]
+
+
+_COMPILERS = {
+    "run_below": _compile_run,
+    "run_above": _compile_run,
+    "avg_below": _compile_avg,
+    "avg_above": _compile_avg,
+    "count_below": _compile_count,
+    "count_above": _compile_count,
+    "all": _compile_all,
+    "any": _compile_any,
+    "not": _compile_not,
+}
+
+
+def compile_rule(spec: Dict[str, Any]) -> CompiledRule:
+    """Valida e compila uma regra (levanta RuleError se inválida)"""
+    if isinstance(spec, CompiledRule):
+        return spec
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise RuleError("Cada regra deve ser um objeto com exatamente uma chave")
+
+    op, params = next(iter(spec.items()))
+    compiler = _COMPILERS.get(op)
+    if compiler is None:
+        raise RuleError(f"Operador desconhecido: '{op}' (válidos: {', '.join(_COMPILERS)})")
+    if op not in ("all", "any", "not") and not isinstance(params, dict):
+        raise RuleError(f"'{op}' requer um objeto de parâmetros")
+    return compiler(op, params)
+
+
+def evaluate_series(rule: CompiledRule, series: Sequence[float]) -> np.ndarray:
+    """
+    Avalia a regra em toda a série cronológica: o elemento i indica se a
+    regra dispara com o histórico visto logo após a rodada i. Com uma matriz,
+    cada linha é uma série independente.
+    """
+    values = np.asarray(series, dtype=np.float64)
+    if not values.size:
+        return np.zeros(values.shape, dtype=bool)
+    return np.asarray(rule.vectorized(values), dtype=bool)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Varredura de parâmetros de estratégia em paralelo
+
+Avalia combinações de strategy_threshold, min_strategy_checks, auto_cashout e
+progression_factor (grade cartesiana ou amostras aleatórias) com o backtester.
+As combinações são divididas entre processos de um ProcessPoolExecutor; o
+histórico fica em memória compartilhada e cada processo só o mapeia (sem
+cópia nem serialização da série por tarefa). Os processos são criados com
+spawn: a API tem várias threads (driver, log, RoundStore) e um fork levaria
+cópias de locks possivelmente presos.
+
+Uso:
+    python strategy_sweep.py --db rounds.db --metric roi --top 10 \\
+        --grid strategy_threshold=1.5,2,2.5 min_strategy_checks=2,3,4 auto_cashout=1.5,2,3
+    python strategy_sweep.py --file historico.csv --samples 500 --workers 8
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models import BettingStrategy, StrategyTypeEnum
+from strategy_rules import compile_rule, default_rule_spec
+from backtester import backtest, load_series, load_round_store
+
+# Grade padrão e faixas de amostragem (limites de BotConfig/BettingStrategy)
+DEFAULT_GRID: Dict[str, List[float]] = {
+    "strategy_threshold": [1.5, 2.0, 2.5, 3.0],
+    "min_strategy_checks": [2, 3, 4, 5, 6],
+    "auto_cashout": [1.5, 2.0, 2.5, 3.0],
+    "progression_factor": [1.5],
+}
+
+PARAM_RANGES: Dict[str, tuple] = {
+    "strategy_threshold": (1.0, 10.0),
+    "min_strategy_checks": (2, 10),
+    "auto_cashout": (1.01, 10.0),
+    "progression_factor": (1.1, 3.0),
+}
+
+# Métricas de ordenação; drawdown é melhor quanto menor
+METRICS = {
+    "total_profit": True,
+    "roi": True,
+    "win_rate": True,
+    "max_drawdown": False,
+}
+
+_series: Optional[np.ndarray] = None
+_shared: Optional[shared_memory.SharedMemory] = None
+
+
+def grid_combinations(grid: Dict[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """Produto cartesiano da grade (parâmetros ausentes usam a grade padrão)"""
+    space = {**DEFAULT_GRID, **grid}
+    _check_params(space)
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_combinations(samples: int, ranges: Optional[Dict[str, tuple]] = None,
+                        seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """Amostras uniformes dentro das faixas de cada parâmetro"""
+    space = {**PARAM_RANGES, **(ranges or {})}
+    _check_params(space)
+    rng = random.Random(seed)
+    combinations = []
+    for _ in range(samples):
+        combination = {}
+        for name, (low, high) in space.items():
+            if name == "min_strategy_checks":
+                combination[name] = rng.randint(int(low), int(high))
+            else:
+                combination[name] = round(rng.uniform(low, high), 2)
+        combinations.append(combination)
+    return combinations
+
+
+def _check_params(space: Dict[str, Any]) -> None:
+    unknown = set(space) - set(PARAM_RANGES)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {', '.join(sorted(unknown))}")
+
+
+def _attach(name: str, size: int) -> None:
+    """Inicializador dos processos: mapeia o histórico compartilhado"""
+    global _series, _shared
+    _shared = shared_memory.SharedMemory(name=name)
+    _series = np.ndarray((size,), dtype=np.float64, buffer=_shared.buf)
+
+
+def _build(base: Dict[str, Any], params: Dict[str, float]):
+    """Estratégia e regra de uma combinação (ValidationError/RuleError se inválidas)"""
+    strategy = BettingStrategy(**{
+        **base,
+        "auto_cashout": params["auto_cashout"],
+        "progression_factor": params["progression_factor"],
+    })
+    rule = compile_rule(default_rule_spec(params["strategy_threshold"], int(params["min_strategy_checks"])))
+    return strategy, rule
+
+
+def _base_strategy(base_strategy: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    base = {"amount": 1.0, "strategy_type": StrategyTypeEnum.CUSTOM, **(base_strategy or {})}
+    base.pop("rule", None)
+    return base
+
+
+def validate_combinations(combinations: List[Dict[str, float]],
+                          base_strategy: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Confere os campos fixos e cada valor de parâmetro antes de distribuir o
+    trabalho; levanta ValueError com o primeiro valor inválido. Cada valor é
+    testado com os demais parâmetros no primeiro valor da grade padrão.
+    """
+    if not combinations:
+        raise ValueError("Nenhuma combinação para avaliar")
+    base = _base_strategy(base_strategy)
+    reference = {name: values[0] for name, values in DEFAULT_GRID.items()}
+    try:
+        _build(base, reference)
+    except ValueError as e:
+        raise ValueError(f"Estratégia base inválida: {e}")
+    for name in reference:
+        for value in sorted({params[name] for params in combinations}):
+            try:
+                _build(base, {**reference, name: value})
+            except ValueError as e:
+                raise ValueError(f"Valor inválido para {name}={value}: {e}")
+
+
+def _evaluate_chunk(base: Dict[str, Any], combinations: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+    """Backtest de um lote de combinações sobre o histórico mapeado"""
+    results = []
+    for params in combinations:
+        try:
+            strategy, rule = _build(base, params)
+            summary = backtest(_series, strategy, rule=rule).summary()
+        except Exception as e:
+            summary = {"error": str(e)}
+        results.append({"params": params, **summary})
+    return results
+
+
+def _chunks(items: List[Any], count: int) -> List[List[Any]]:
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def rank_results(results: List[Dict[str, Any]], metric: str) -> List[Dict[str, Any]]:
+    """Ordena do melhor para o pior pela métrica escolhida"""
+    if metric not in METRICS:
+        raise ValueError(f"Métrica inválida: {metric} (válidas: {', '.join(METRICS)})")
+    valid = [result for result in results if "error" not in result and np.isfinite(result[metric])]
+    return sorted(valid, key=lambda result: result[metric], reverse=METRICS[metric])
+
+
+def run_sweep(series: Sequence[float], combinations: List[Dict[str, float]],
+              base_strategy: Optional[Dict[str, Any]] = None, metric: str = "total_profit",
+              workers: Optional[int] = None, top: Optional[int] = 20) -> Dict[str, Any]:
+    """
+    Avalia as combinações em paralelo e devolve as melhores pela métrica.
+    `base_strategy` fornece os campos fixos da BettingStrategy (amount,
+    max_loss, max_win, progressive_betting, ...).
+    """
+    global _series
+    if metric not in METRICS:
+        raise ValueError(f"Métrica inválida: {metric} (válidas: {', '.join(METRICS)})")
+
+    values = np.ascontiguousarray(series, dtype=np.float64)
+    base = _base_strategy(base_strategy)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(combinations) or 1))
+    start = time.perf_counter()
+
+    if workers == 1:
+        _series = values
+        try:
+            results = _evaluate_chunk(base, combinations)
+        finally:
+            _series = None
+    else:
+        shared = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=shared.buf)[:] = values
+            # Alguns lotes por processo para equilibrar combinações mais lentas
+            chunks = _chunks(combinations, workers * 4)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_attach, initargs=(shared.name, values.size)) as executor:
+                futures = [executor.submit(_evaluate_chunk, base, chunk) for chunk in chunks]
+                results = [result for future in futures for result in future.result()]
+        finally:
+            shared.close()
+            shared.unlink()
+
+    elapsed = time.perf_counter() - start
+    ranked = rank_results(results, metric)
+    return {
+        "rounds": int(values.size),
+        "evaluated": len(results),
+        "errors": sum(1 for result in results if "error" in result),
+        "workers": workers,
+        "metric": metric,
+        "elapsed_s": round(elapsed, 3),
+        "results": ranked[:top] if top else ranked,
+    }
+
+
+def _parse_grid(items: Sequence[str]) -> Dict[str, List[float]]:
+    grid = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        grid[name] = [float(value) for value in values.split(",") if value]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="Arquivo com multiplicadores (.csv, .txt, .json, .npy)")
+    source.add_argument("--db", help="Banco SQLite do RoundStore")
+    parser.add_argument("--limit", type=int, help="Usar apenas as últimas N rodadas")
+    parser.add_argument("--grid", nargs="*", default=[], help="Grade: parametro=v1,v2,...")
+    parser.add_argument("--samples", type=int, help="Amostras aleatórias em vez da grade")
+    parser.add_argument("--seed", type=int, help="Semente das amostras aleatórias")
+    parser.add_argument("--metric", default="total_profit", choices=list(METRICS), help="Métrica de ordenação")
+    parser.add_argument("--workers", type=int, help="Processos (padrão: núcleos disponíveis)")
+    parser.add_argument("--top", type=int, default=10, help="Quantas combinações mostrar")
+    parser.add_argument("--amount", type=float, default=1.0, help="Valor da aposta")
+    parser.add_argument("--max-loss", type=float, help="Perda máxima")
+    parser.add_argument("--max-win", type=float, help="Ganho máximo")
+    parser.add_argument("--progressive", action="store_true", help="Aposta progressiva")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args()
+
+    series = load_round_store(args.db, args.limit) if args.db else load_series(args.file)
+    if args.limit and not args.db:
+        series = series[-args.limit:]
+
+    if args.samples:
+        combinations = random_combinations(args.samples, seed=args.seed)
+    else:
+        combinations = grid_combinations(_parse_grid(args.grid))
+
+    base = {
+        "amount": args.amount,
+        "max_loss": args.max_loss,
+        "max_win": args.max_win,
+        "progressive_betting": args.progressive,
+    }
+    try:
+        validate_combinations(combinations, base)
+    except ValueError as e:
+        parser.error(str(e))
+    report = run_sweep(series, combinations, base, args.metric, args.workers, args.top)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['evaluated']} combinações x {report['rounds']} rodadas em "
+          f"{report['elapsed_s']} s ({report['workers']} processos)")
+    for position, result in enumerate(report["results"], 1):
+        params = result["params"]
+        print(
+            f"{position:3d}. threshold={params['strategy_threshold']:<5} checks={int(params['min_strategy_checks']):<3} "
+            f"cashout={params['auto_cashout']:<5} fator={params['progression_factor']:<4} "
+            f"| {args.metric}={result[args.metric]} apostas={result['bets_placed']} roi={result['roi']}%"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
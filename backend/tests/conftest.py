@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Os módulos do backend são importados sem pacote (como em main.py e nos benchmarks)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Backtest vetorizado contra uma simulação rodada a rodada com as regras do controlador"""
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from backtester import backtest, load_series, max_drawdown
+from models import BettingStrategy, SessionStats, StrategyTypeEnum
+from strategy_rules import compile_rule, default_rule_spec
+
+
+def reference(series, strategy, rule):
+    """Laço simples: gatilho na rodada i aposta na i + 1, limites antes de cada aposta"""
+    stats = SessionStats()
+    pending = False
+    stop_reason = None
+    for index, crash in enumerate(series):
+        if pending:
+            pending = False
+            if strategy.max_loss and strategy.stop_on_loss and stats.total_profit <= -strategy.max_loss:
+                stop_reason = "max_loss"
+                break
+            if strategy.max_win and strategy.stop_on_win and stats.total_profit >= strategy.max_win:
+                stop_reason = "max_win"
+                break
+            amount = strategy.calculate_bet_amount(stats)
+            stats.bets_placed += 1
+            stats.total_bet += amount
+            if strategy.auto_cashout and crash >= strategy.auto_cashout:
+                stats.wins += 1
+                stats.total_profit += amount * (strategy.auto_cashout - 1)
+            else:
+                stats.losses += 1
+                stats.total_profit -= amount
+        if rule(series[index::-1]):
+            pending = True
+    return stats, stop_reason
+
+
+def crash_series(rng, rounds):
+    return [max(1.0, round(0.97 / (1 - rng.random()), 2)) for _ in range(rounds)]
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_matches_round_by_round_simulation(seed):
+    rng = random.Random(seed)
+    series = crash_series(rng, rng.randint(10, 300))
+    strategy = BettingStrategy(
+        amount=rng.choice([1.0, 2.0, 5.0]),
+        strategy_type=StrategyTypeEnum.CUSTOM,
+        auto_cashout=rng.choice([None, 1.5, 2.0, 3.0]),
+        max_loss=rng.choice([None, 20.0, 50.0]),
+        max_win=rng.choice([None, 10.0, 30.0]),
+        progressive_betting=rng.random() < 0.5,
+        progression_factor=rng.choice([1.1, 1.5, 2.0]),
+    )
+    rule = compile_rule(default_rule_spec(rng.choice([1.5, 2.0, 2.5]), rng.randint(1, 4)))
+
+    result = backtest(series, strategy, rule=rule)
+    stats, stop_reason = reference(series, strategy, rule)
+    assert result.bets_placed == stats.bets_placed
+    assert result.wins == stats.wins and result.losses == stats.losses
+    assert result.total_bet == pytest.approx(stats.total_bet)
+    assert result.total_profit == pytest.approx(stats.total_profit)
+    assert result.stop_reason == stop_reason
+
+
+def test_small_example():
+    # Gatilho após 2 rodadas < 2.0; aposta na seguinte com cashout em 2x
+    series = [1.5, 1.2, 3.0, 1.1, 1.4, 1.0, 5.0]
+    strategy = BettingStrategy(amount=10, strategy_type=StrategyTypeEnum.CUSTOM, auto_cashout=2.0,
+                               rule=default_rule_spec(2.0, 2))
+    result = backtest(series, strategy)
+    assert result.bet_rounds.tolist() == [2, 5, 6]
+    assert result.bet_profits.tolist() == [10.0, -10.0, 10.0]
+    assert result.pnl.tolist() == [0, 0, 10, 10, 10, 0, 10]
+    assert result.max_drawdown == 10.0
+    assert result.summary()["win_rate"] == pytest.approx(66.67)
+
+
+def test_max_drawdown_starts_from_zero():
+    assert max_drawdown(np.array([-5.0, -2.0, -8.0])) == 8.0
+    assert max_drawdown(np.array([])) == 0.0
+
+
+def test_load_series_formats(tmp_path):
+    (tmp_path / "a.csv").write_text("1.5x, 2,3.25\n4x", encoding="utf-8")
+    (tmp_path / "b.json").write_text(json.dumps({"rounds": [{"multiplier": 1.1}, {"multiplier": 2.2}]}),
+                                     encoding="utf-8")
+    np.save(tmp_path / "c.npy", np.array([1.0, 2.0]))
+    assert load_series(str(tmp_path / "a.csv")).tolist() == [1.5, 2.0, 3.25, 4.0]
+    assert load_series(str(tmp_path / "b.json")).tolist() == [1.1, 2.2]
+    assert load_series(str(tmp_path / "c.npy")).tolist() == [1.0, 2.0]
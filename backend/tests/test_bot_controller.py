@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Pré-armação da aposta: só na janela de apostas e sem aposta em aberto"""
+
+import asyncio
+
+import pytest
+
+from bot_controller import AviatorBotController
+from models import BettingStrategy, RoundPhaseEnum, StrategyTypeEnum
+
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch):
+    # bot_config.json e rounds.db ficam na pasta temporária
+    monkeypatch.chdir(tmp_path)
+    controller = AviatorBotController()
+    controller.is_betting_active = True
+    controller.betting_strategy = BettingStrategy(amount=2.0, strategy_type=StrategyTypeEnum.CONSERVATIVE)
+    controller.elements = controller.elements.copy(update={"bet_input": "//input", "bet_button": "//button"})
+    armed = []
+
+    async def run(fn, *args):
+        armed.append(args)
+        return True
+
+    monkeypatch.setattr(controller.driver_worker, "run", run)
+    controller.armed = armed
+    yield controller
+    controller.round_store.close()
+
+
+@pytest.mark.parametrize("phase", [RoundPhaseEnum.FLYING, RoundPhaseEnum.CRASHED,
+                                   RoundPhaseEnum.WAITING, RoundPhaseEnum.UNKNOWN])
+def test_prearm_skipped_outside_betting_window(controller, phase):
+    controller.phase_scheduler.phase = phase
+    asyncio.run(controller.prearm_bet())
+    assert controller.armed == []
+
+
+def test_prearm_skipped_with_open_bet(controller):
+    controller.phase_scheduler.phase = RoundPhaseEnum.BETTING
+    controller.active_bet = {"amount": 2.0, "target": None, "cashout": None}
+    asyncio.run(controller.prearm_bet())
+    assert controller.armed == []
+
+
+def test_prearm_during_betting_window(controller):
+    controller.phase_scheduler.phase = RoundPhaseEnum.BETTING
+    asyncio.run(controller.prearm_bet())
+    assert controller.armed == [(2.0,)]
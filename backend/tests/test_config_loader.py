@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Gravação do ConfigLoader: fsync fora do lock, ordem das versões, save síncrono e atualizações parciais"""
+
+import json
+import threading
+
+import pytest
+
+import config_loader
+from config_loader import ConfigLoader
+
+
+@pytest.fixture
+def loader(tmp_path):
+    loader = ConfigLoader()
+    loader.aviator_folder = tmp_path
+    loader.credentials_file = tmp_path / "credentials.json"
+    yield loader
+    if loader._flush_timer:
+        loader._flush_timer.cancel()
+
+
+def on_disk(loader):
+    with open(loader.credentials_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_save_credentials_returns_after_write(loader):
+    assert loader.save_credentials({"username": "usuario", "password": "senha"})
+    assert on_disk(loader)["username"] == "usuario"
+    assert loader._flush_timer is None
+
+
+def test_save_credentials_reports_write_failure(loader, monkeypatch):
+    def fail(path, text):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(config_loader, "atomic_write_text", fail)
+    assert not loader.save_credentials({"username": "usuario"})
+    # Continua pendente para a próxima tentativa
+    assert loader._dirty
+
+
+def test_slow_write_does_not_hold_cache_lock(loader, monkeypatch):
+    loader.save_credentials({"username": "usuario", "bot_settings": {"history_size": 1}})
+    writing, release = threading.Event(), threading.Event()
+    original = config_loader.atomic_write_text
+
+    def slow_write(path, text):
+        writing.set()
+        assert release.wait(5)
+        original(path, text)
+
+    monkeypatch.setattr(config_loader, "atomic_write_text", slow_write)
+    loader.update_config("bot_settings", {"history_size": 2})
+    flusher = threading.Thread(target=loader.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    # Durante a gravação, leituras e alterações seguem sem esperar o disco
+    done = threading.Event()
+
+    def change():
+        assert loader.get_bot_config() == {"history_size": 2}
+        loader.update_config("bot_settings", {"history_size": 3})
+        done.set()
+
+    threading.Thread(target=change).start()
+    assert done.wait(2)
+
+    release.set()
+    flusher.join(5)
+    # A alteração feita durante a gravação não foi marcada como salva
+    assert on_disk(loader)["bot_settings"] == {"history_size": 2}
+    assert loader._dirty
+    assert loader.get_bot_config() == {"history_size": 3}
+
+    assert loader.flush()
+    assert on_disk(loader)["bot_settings"] == {"history_size": 3}
+    assert not loader._dirty
+
+
+def test_partial_updates_merge_into_section(loader):
+    loader.save_credentials({"username": "usuario", "bot_settings": {"history_size": 1, "headless": True}})
+    loader.update_config("bot_settings", {"history_size": 5})
+    loader.update_config("bot_settings", {"strategy_threshold": 2.5})
+    expected = {"history_size": 5, "headless": True, "strategy_threshold": 2.5}
+    assert loader.get_bot_config() == expected
+    assert loader.flush()
+    assert on_disk(loader)["bot_settings"] == expected
+    assert on_disk(loader)["username"] == "usuario"
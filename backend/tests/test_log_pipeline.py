@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Listener em lotes: ordem, níveis, rotação e esvaziamento da fila no stop"""
+
+import json
+import logging
+
+import pytest
+
+import log_pipeline
+from log_pipeline import parse_log_line, setup_logging
+
+
+class Collect(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def restore_root():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def read_messages(path):
+    with open(path, encoding="utf-8") as f:
+        return [parse_log_line(line.rstrip("\n"))["message"] for line in f]
+
+
+def test_records_reach_every_handler_in_order(tmp_path, restore_root):
+    collect, warnings = Collect(), Collect(logging.WARNING)
+    log_file = tmp_path / "backend.log"
+    listener = setup_logging(str(log_file), console=False, handlers=[collect, warnings])
+    logger = logging.getLogger("teste")
+    for index in range(200):
+        logger.info("linha %d", index)
+    logger.warning("aviso")
+    listener.stop()
+
+    expected = [f"linha {index}" for index in range(200)] + ["aviso"]
+    assert read_messages(log_file) == expected
+    assert collect.messages == expected
+    assert warnings.messages == ["aviso"]
+    assert json.loads(log_file.read_text(encoding="utf-8").splitlines()[-1])["level"] == "WARNING"
+
+
+def test_batches_rotate_file(tmp_path, restore_root, monkeypatch):
+    monkeypatch.setattr(log_pipeline, "MAX_BATCH", 4)
+    log_file = tmp_path / "backend.log"
+    listener = setup_logging(str(log_file), max_bytes=2000, backups=50, console=False)
+    logger = logging.getLogger("teste")
+    for index in range(300):
+        logger.info("linha %03d", index)
+    listener.stop()
+
+    # Do backup mais antigo (maior sufixo) ao arquivo atual
+    files = sorted(tmp_path.glob("backend.log.*"), key=lambda p: -int(p.suffix[1:])) + [log_file]
+    assert len(files) > 2
+    assert all(path.stat().st_size <= 2000 for path in files)
+    messages = [message for path in files for message in read_messages(path)]
+    assert messages == [f"linha {index:03d}" for index in range(300)]
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Leitura do fim do log: blocos, arquivos rotacionados e assinaturas filtradas"""
+
+import asyncio
+import logging
+import random
+
+import pytest
+
+import log_stream
+from log_stream import LogStreamHandler, tail_lines
+
+
+def write_lines(path, lines, trailing_newline=True):
+    text = "\n".join(lines) + ("\n" if trailing_newline else "")
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 8192])
+def test_matches_reading_whole_file(tmp_path, block_size):
+    rng = random.Random(block_size)
+    lines = ["x" * rng.randint(0, 40) + f" linha {index} ação" for index in range(300)]
+    path = tmp_path / "backend.log"
+    write_lines(path, lines)
+    for count in (0, 1, 2, 17, 299, 300, 1000):
+        expected = lines[-count:] if count else []
+        assert tail_lines(str(path), count, block_size=block_size) == expected
+
+
+def test_last_line_without_newline(tmp_path):
+    path = tmp_path / "backend.log"
+    write_lines(path, ["a", "b", "c"], trailing_newline=False)
+    assert tail_lines(str(path), 2, block_size=2) == ["b", "c"]
+
+
+def test_crlf_and_invalid_utf8(tmp_path):
+    path = tmp_path / "backend.log"
+    path.write_bytes(b"um\r\ndois \xff\r\ntr\xc3\xaas\r\n")
+    assert tail_lines(str(path), 3) == ["um", "dois �", "três"]
+
+
+def test_continues_into_rotated_files(tmp_path):
+    path = tmp_path / "backend.log"
+    write_lines(tmp_path / "backend.log.2", ["a1", "a2"])
+    write_lines(tmp_path / "backend.log.1", ["b1", "b2", "b3"])
+    write_lines(path, ["c1"])
+    assert tail_lines(str(path), 3, backups=2) == ["b2", "b3", "c1"]
+    assert tail_lines(str(path), 10, backups=2) == ["a1", "a2", "b1", "b2", "b3", "c1"]
+    # Sem backups só o arquivo atual
+    assert tail_lines(str(path), 10) == ["c1"]
+
+
+def test_missing_current_file_and_gap_in_rotation(tmp_path):
+    path = tmp_path / "backend.log"
+    write_lines(tmp_path / "backend.log.1", ["b1"])
+    write_lines(tmp_path / "backend.log.3", ["perdido"])
+    # Logo após a rotação o arquivo atual ainda não existe; .3 sem .2 não entra
+    assert tail_lines(str(path), 10, backups=3) == ["b1"]
+    assert tail_lines(str(tmp_path / "outro.log"), 10) == []
+
+
+def test_line_count_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_stream, "MAX_TAIL_LINES", 5)
+    path = tmp_path / "backend.log"
+    write_lines(path, [str(index) for index in range(20)])
+    assert tail_lines(str(path), 100) == [str(index) for index in range(15, 20)]
+    assert tail_lines(str(path), -3) == []
+
+
+def test_subscriptions_filter_level_and_component():
+    handler = LogStreamHandler()
+    logger = logging.getLogger("teste_stream")
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+    async def scenario():
+        warnings = handler.subscribe("WARNING")
+        component = handler.subscribe("DEBUG", component="teste_stream.driver")
+        logging.getLogger("teste_stream.driver").info("driver pronto")
+        logger.warning("aviso geral")
+        logging.getLogger("teste_stream.driverx").error("outro componente")
+        await asyncio.sleep(0)
+        handler.unsubscribe(component)
+        logger.error("depois")
+        await asyncio.sleep(0)
+        return ([entry["message"] for entry in _drain(warnings)],
+                [entry["message"] for entry in _drain(component)])
+
+    try:
+        warnings, component = asyncio.run(scenario())
+    finally:
+        logger.removeHandler(handler)
+    assert warnings == ["aviso geral", "outro componente", "depois"]
+    assert component == ["driver pronto"]
+    assert handler.subscribers == 1
+    with pytest.raises(ValueError):
+        asyncio.run(_subscribe(handler, "NIVEL"))
+
+
+def _drain(subscription):
+    entries = []
+    while not subscription.queue.empty():
+        entries.append(subscription.queue.get_nowait())
+    return entries
+
+
+async def _subscribe(handler, level):
+    return handler.subscribe(level)
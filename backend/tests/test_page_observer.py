@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Espera do observador: uma chamada por espera, que volta a cada despertar da página"""
+
+import os
+
+import page_observer
+from page_observer import ResultObserver
+
+
+class FakeDriver:
+    """Simula o script de espera: cada chamada devolve o próximo payload da lista"""
+
+    def __init__(self, payloads=None):
+        self.waits = []
+        self.script_timeouts = []
+        self.payloads = list(payloads or [])
+
+    def execute_script(self, script, *args):
+        return True
+
+    def set_script_timeout(self, timeout):
+        self.script_timeouts.append(timeout)
+
+    def execute_async_script(self, script, timeout_ms, selectors):
+        self.waits.append(timeout_ms)
+        if self.payloads:
+            return self.payloads.pop(0)
+        return {"events": [], "state": {}}
+
+
+def test_waits_once_for_the_whole_timeout():
+    driver = FakeDriver()
+    assert ResultObserver(driver, "payouts-block").drain(30.0, {}) == {"events": [], "state": {}}
+    assert driver.waits == [30000]
+
+
+def test_wake_without_events_returns_immediately():
+    # Cashout acorda o script sem rodada nova: volta para o laço, sem nova espera
+    woke = {"events": [], "state": {"multiplier": 1.8}}
+    driver = FakeDriver([woke])
+    assert ResultObserver(driver, "payouts-block").drain(30.0, {}) is woke
+    assert len(driver.waits) == 1
+
+
+def test_events_are_returned():
+    driver = FakeDriver([{"events": [{"history": [2.0], "ts": 0}], "state": {}}])
+    payload = ResultObserver(driver, "payouts-block").drain(30.0, {})
+    assert payload["events"][0]["history"] == [2.0]
+
+
+def test_script_timeout_set_once_and_wait_capped():
+    driver = FakeDriver()
+    observer = ResultObserver(driver, "payouts-block")
+    for timeout in (30.0, 0.35, 2.5, 500.0):
+        observer.drain(timeout, {})
+    expected = page_observer.MAX_WAIT + page_observer.SCRIPT_TIMEOUT_MARGIN
+    assert driver.script_timeouts == [expected]
+    assert driver.waits == [30000, 350, 2500, int(page_observer.MAX_WAIT * 1000)]
+
+
+def test_replaced_container_marks_observer_for_reinstall():
+    driver = FakeDriver([None])
+    observer = ResultObserver(driver, "payouts-block")
+    assert observer.drain(30.0, {}) is None
+    assert not observer.installed
+
+
+def test_observer_and_page_state_share_history_parser():
+    from page_state import PAGE_STATE_FN_JS, PARSE_HISTORY_FN_JS
+
+    for script in (page_observer.INSTALL_OBSERVER_JS, PAGE_STATE_FN_JS):
+        assert script.startswith(PARSE_HISTORY_FN_JS)
+        assert script.count("function parseHistory") == 1
+
+
+def test_observer_imports_without_pydantic():
+    # O bot standalone (raiz do projeto) usa este módulo sem as dependências da API
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "class Block:\n"
+        "    def find_spec(self, name, path, target=None):\n"
+        "        if name.split('.')[0] in ('pydantic', 'fastapi'):\n"
+        "            raise ImportError(name)\n"
+        "sys.meta_path.insert(0, Block())\n"
+        "import page_observer, strategy_rules, log_pipeline\n"
+    )
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=backend, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""RingBuffer: ordem após dar a volta, visões sem cópia e correção do último valor"""
+
+import numpy as np
+import pytest
+
+from ring_buffer import RingBuffer
+
+
+def test_wraps_around_keeping_latest():
+    ring = RingBuffer(4)
+    for value in range(1, 11):
+        ring.append(float(value))
+    assert len(ring) == 4 and ring.total_appended == 10
+    assert ring.as_array().tolist() == [7.0, 8.0, 9.0, 10.0]
+    assert ring.latest(3) == [10.0, 9.0, 8.0]
+    assert ring.last() == 10.0
+    assert ring.as_array(2).tolist() == [9.0, 10.0]
+    # Pedir mais do que existe devolve o que existe
+    assert ring.latest(100) == [10.0, 9.0, 8.0, 7.0]
+
+
+def test_partial_fill_and_clear():
+    ring = RingBuffer(5)
+    assert ring.last() is None and ring.latest(3) == []
+    ring.append(1.5)
+    ring.append(2.5)
+    assert ring.as_array().tolist() == [1.5, 2.5]
+    ring.clear()
+    assert len(ring) == 0 and ring.as_array().size == 0
+
+
+def test_views_share_memory():
+    ring = RingBuffer(3)
+    for value in (1.0, 2.0, 3.0):
+        ring.append(value)
+    view = ring.as_array()
+    assert not view.flags.owndata
+    assert np.isclose(view.mean(), 2.0)
+
+
+def test_replace_last_after_wrap():
+    ring = RingBuffer(3)
+    for value in (1.0, 2.0, 3.0, 4.0):
+        ring.append(value)
+    ring.replace_last(40.0)
+    assert ring.as_array().tolist() == [2.0, 3.0, 40.0]
+    ring.append(5.0)
+    assert ring.latest(3) == [5.0, 40.0, 3.0]
+
+
+def test_memory_is_two_doubles_per_slot():
+    assert RingBuffer(1000).bytes_per_round == 16
+
+
+def test_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Alinhamento do histórico: rodadas novas, leituras corrompidas e perdas de sobreposição"""
+
+import random
+
+from round_aligner import HistoryAligner
+
+
+def window(series, end, size=10):
+    """Janela da página (mais recente primeiro) com as rodadas series[:end]"""
+    return list(reversed(series[max(0, end - size):end]))
+
+
+def values(result):
+    return [aligned.multiplier for aligned in result.rounds]
+
+
+SERIES = [1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9, 10.1, 11.2, 12.3, 13.4, 14.5, 15.6,
+          16.7, 17.8, 18.9, 19.1, 20.2, 21.3, 22.4, 23.5, 24.6, 25.7, 26.8, 27.9, 28.1]
+
+
+def test_single_and_multi_round_jumps():
+    aligner = HistoryAligner()
+    assert values(aligner.align(window(SERIES, 10))) == []
+    assert values(aligner.align(window(SERIES, 11))) == [11.2]
+    # Mesma leitura repetida: nada novo
+    assert values(aligner.align(window(SERIES, 11))) == []
+    result = aligner.align(window(SERIES, 15))
+    assert values(result) == SERIES[11:15]
+    assert [aligned.seq for aligned in result.rounds] == [1, 2, 3, 4]
+    assert [aligned.position for aligned in result.rounds] == [3, 2, 1, 0]
+    assert not result.gap
+
+
+def test_glitch_on_known_round_is_not_a_round():
+    aligner = HistoryAligner()
+    aligner.align(window(SERIES, 10))
+    aligner.align(window(SERIES, 11))
+    glitched = window(SERIES, 11)
+    glitched[0] = 99.0
+    result = aligner.align(glitched)
+    assert values(result) == [] and not result.gap and result.corrected is None
+    # A leitura seguinte volta ao valor certo: nada a corrigir
+    result = aligner.align(window(SERIES, 11))
+    assert values(result) == [] and result.corrected is None
+    assert values(aligner.align(window(SERIES, 12))) == [12.3]
+    assert aligner.gaps == 0 and aligner.corrections == 0
+
+
+def test_misread_new_round_is_corrected_when_confirmed():
+    aligner = HistoryAligner()
+    aligner.align(window(SERIES, 10))
+    misread = window(SERIES, 11)
+    misread[0] = 99.0
+    # Rodada nova mal lida: emitida (não dá para saber ainda)
+    assert values(aligner.align(misread)) == [99.0]
+
+    # Releitura com o valor certo: pendente, sem gap nem rodada nova
+    result = aligner.align(window(SERIES, 11))
+    assert values(result) == [] and not result.gap and result.corrected is None
+    # Confirmada: correção da rodada seq 0, sem rodada nova
+    result = aligner.align(window(SERIES, 11))
+    assert values(result) == []
+    assert (result.corrected.seq, result.corrected.multiplier, result.corrected.position) == (0, 11.2, 0)
+    assert values(aligner.align(window(SERIES, 12))) == [12.3]
+    assert aligner.gaps == 0 and aligner.corrections == 1
+
+
+def test_correction_confirmed_by_next_round():
+    # No modo observer a próxima leitura já traz a rodada seguinte
+    aligner = HistoryAligner()
+    aligner.align(window(SERIES, 10))
+    misread = window(SERIES, 11)
+    misread[0] = 99.0
+    aligner.align(misread)
+    aligner.align(window(SERIES, 11))
+    result = aligner.align(window(SERIES, 13))
+    assert result.corrected.seq == 0 and result.corrected.multiplier == 11.2
+    assert result.corrected.position == 2
+    assert values(result) == [12.3, 13.4]
+    assert [aligned.seq for aligned in result.rounds] == [1, 2]
+
+
+def test_lost_overlap_recovers_every_visible_round():
+    aligner = HistoryAligner()
+    aligner.align(window(SERIES, 10))
+    # Leitor parado por 12 rodadas: nada da janela anterior continua visível
+    result = aligner.align(window(SERIES, 22))
+    assert result.gap and values(result) == []
+    # Confirmação com mais uma rodada: entram todas as rodadas visíveis na
+    # janela confirmada; as 3 que nunca apareceram na tela ficam só no gap
+    result = aligner.align(window(SERIES, 23))
+    assert result.resynced
+    assert values(result) == SERIES[13:23]
+    assert result.rounds[0].seq == 0 and result.rounds[-1].seq == 9
+    assert aligner.gaps == 1
+    assert values(aligner.align(window(SERIES, 24))) == [SERIES[23]]
+
+
+def test_resync_uses_partial_overlap():
+    aligner = HistoryAligner(min_overlap=3)
+    aligner.align(window(SERIES, 10))
+    # Só 2 rodadas da janela antiga ainda visíveis (menos que min_overlap)
+    result = aligner.align(window(SERIES, 18))
+    assert result.gap
+    result = aligner.align(window(SERIES, 18))
+    assert result.resynced
+    assert values(result) == SERIES[10:18]
+
+
+def test_transient_corrupt_read_does_not_resync():
+    aligner = HistoryAligner()
+    aligner.align(window(SERIES, 10))
+    assert aligner.align([50.0, 51.0, 52.0, 53.0]).gap
+    assert values(aligner.align(window(SERIES, 11))) == [11.2]
+    assert aligner.gaps == 1
+
+
+def test_random_sessions_emit_every_round_once():
+    rng = random.Random(3)
+    for _ in range(100):
+        series = [round(rng.uniform(1.0, 20.0), 2) for _ in range(200)]
+        aligner = HistoryAligner()
+        end = 10
+        aligner.align(window(series, end, size=20))
+        emitted = []
+        while end < len(series):
+            end = min(len(series), end + rng.randint(0, 3))
+            emitted.extend(values(aligner.align(window(series, end, size=20))))
+        assert emitted == series[10:]
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""RoundStore: cache do final da série, gravação em lote e consultas no SQLite"""
+
+import pytest
+
+from models import GameResult
+from round_store import RoundStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "rounds.db")
+
+
+def fill(store, count, start=0):
+    for seq in range(start, start + count):
+        store.append(GameResult(multiplier=1.0 + seq / 100, round_seq=seq, strategy_triggered=seq % 2 == 0))
+
+
+def test_tail_cache_and_batched_writes(path):
+    store = RoundStore(path, batch_size=10, cache_size=5)
+    fill(store, 23)
+    assert [result.round_seq for result in store.recent(3)] == [20, 21, 22]
+    assert len(store.recent(100)) == 5
+    store.flush()
+    assert store.written == 23
+    store.close()
+
+
+def test_queries_read_from_disk(path):
+    store = RoundStore(path, cache_size=5)
+    fill(store, 30)
+    results = store.query(limit=100, since_seq=24)
+    assert [result.round_seq for result in results] == [25, 26, 27, 28, 29]
+    assert results[0].strategy_triggered is False and results[1].strategy_triggered is True
+    assert [result.round_seq for result in store.query(limit=20)][:2] == [10, 11]
+    assert store.multipliers(3) == [1.27, 1.28, 1.29]
+    assert len(store.multipliers()) == 30
+    store.close()
+
+
+def test_reopen_restores_tail_and_sequence(path):
+    store = RoundStore(path, cache_size=10)
+    fill(store, 12)
+    store.close()
+
+    reopened = RoundStore(path, cache_size=10)
+    assert reopened.last_seq() == 11
+    assert [result.round_seq for result in reopened.recent(2)] == [10, 11]
+    fill(reopened, 3, start=12)
+    assert reopened.multipliers()[-3:] == pytest.approx([1.12, 1.13, 1.14])
+    reopened.close()
+
+
+def test_empty_store(path):
+    store = RoundStore(path)
+    assert store.last_seq() == -1
+    assert store.recent() == [] and store.multipliers() == []
+    store.close()
+
+
+def test_correct_updates_cache_and_disk(path):
+    store = RoundStore(path, batch_size=100, cache_size=5)
+    fill(store, 4)
+    # Corrige uma rodada ainda no lote pendente
+    store.correct(3, 9.5)
+    assert store.recent(1)[0].multiplier == 9.5
+    assert store.multipliers() == [1.0, 1.01, 1.02, 9.5]
+    store.close()
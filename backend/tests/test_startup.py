@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Início rápido: cache do caminho do chromedriver e linha do tempo das fases"""
+
+import json
+import os
+
+import pytest
+
+import startup
+from startup import StartupTimeline, resolve_chromedriver
+
+
+def make_driver(path):
+    path.write_text("#!/bin/sh\n")
+    os.chmod(path, 0o755)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    # Cada teste começa como uma execução nova (sem caminho em memória)
+    monkeypatch.setattr(startup, "_resolved_path", None)
+
+
+class Installer:
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.path
+
+
+def test_explicit_path_skips_installer(tmp_path):
+    explicit = make_driver(tmp_path / "chromedriver")
+    installer = Installer("nunca")
+    assert resolve_chromedriver(str(tmp_path / "cache.json"), explicit, installer=installer) == explicit
+    assert installer.calls == 0
+    assert not (tmp_path / "cache.json").exists()
+
+
+def test_installer_runs_once_then_cache_is_used(tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache.json")
+    installer = Installer(make_driver(tmp_path / "chromedriver"))
+    assert resolve_chromedriver(cache, installer=installer) == installer.path
+    assert resolve_chromedriver(cache, installer=installer) == installer.path
+    assert installer.calls == 1
+    with open(cache, encoding="utf-8") as f:
+        assert json.load(f)["path"] == installer.path
+
+    # Nova execução: o caminho vem do arquivo, sem consultar o installer
+    monkeypatch.setattr(startup, "_resolved_path", None)
+    assert resolve_chromedriver(cache, installer=installer) == installer.path
+    assert installer.calls == 1
+
+
+def test_missing_or_invalid_paths_fall_back_to_installer(tmp_path):
+    cache = tmp_path / "cache.json"
+    cache.write_text(json.dumps({"path": str(tmp_path / "apagado")}))
+    installer = Installer(make_driver(tmp_path / "chromedriver"))
+    # Caminho configurado inexistente e cache apontando para arquivo removido
+    assert resolve_chromedriver(str(cache), str(tmp_path / "nao_existe"), installer=installer) == installer.path
+    assert installer.calls == 1
+
+    cache.write_text("não é json")
+    startup._resolved_path = None
+    assert resolve_chromedriver(str(cache), installer=installer) == installer.path
+    assert installer.calls == 2
+
+
+def test_refresh_bypasses_cache(tmp_path):
+    cache = str(tmp_path / "cache.json")
+    old = Installer(make_driver(tmp_path / "antigo"))
+    resolve_chromedriver(cache, installer=old)
+    new = Installer(make_driver(tmp_path / "novo"))
+    assert resolve_chromedriver(cache, refresh=True, installer=new) == new.path
+    assert new.calls == 1
+    assert resolve_chromedriver(cache, installer=old) == new.path
+
+
+def test_cache_write_failure_still_returns_path(tmp_path, monkeypatch):
+    def fail(path, data):
+        raise OSError("somente leitura")
+
+    monkeypatch.setattr(startup, "atomic_write_json", fail)
+    installer = Installer(make_driver(tmp_path / "chromedriver"))
+    assert resolve_chromedriver(str(tmp_path / "cache.json"), installer=installer) == installer.path
+
+
+def test_timeline_marks_sequential_phases(monkeypatch):
+    clock = iter([10.0, 10.5, 12.0, 12.25, 13.0])
+    monkeypatch.setattr(startup.time, "monotonic", lambda: next(clock))
+    timeline = StartupTimeline()
+    assert timeline.summary()["completed"] is False
+    assert timeline.mark("driver") == 0.5
+    assert timeline.mark("login") == 1.5
+    assert timeline.mark("iframe") == 0.25
+    assert timeline.finish() == 3.0
+
+    summary = timeline.summary()
+    assert summary["phases_ms"] == {"driver": 500.0, "login": 1500.0, "iframe": 250.0}
+    assert summary["total_ms"] == 3000.0 and summary["completed"]
+    assert timeline.describe() == "driver=0.50s, login=1.50s, iframe=0.25s"
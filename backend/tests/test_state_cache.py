@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Cache de estado: uma serialização por versão, ETag/If-None-Match e campos por requisição"""
+
+import json
+
+import state_cache
+from state_cache import StateCache
+
+
+def test_serializes_once_per_version():
+    cache = StateCache(max_age=60.0)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"wins": len(builds)}
+
+    first = cache.get("stats", 1, build)
+    assert cache.get("stats", 1, build) is first
+    assert len(builds) == 1 and cache.hits == 1
+
+    second = cache.get("stats", 2, build)
+    assert json.loads(second.body) == {"wins": 2}
+    assert second.etag != first.etag
+    assert cache.get_stats()["serializations"] == 2
+
+
+def test_max_age_bounds_reuse(monkeypatch):
+    cache = StateCache(max_age=1.0)
+    now = [100.0]
+    monkeypatch.setattr(state_cache.time, "monotonic", lambda: now[0])
+    first = cache.get("status", 1, lambda: {"running": True})
+    now[0] += 1.5
+    assert cache.get("status", 1, lambda: {"running": True}) is not first
+    # Mesmo conteúdo, mesmo ETag: o cliente continua recebendo 304
+    assert cache.get("status", 1, lambda: {"running": True}).etag == first.etag
+
+
+def test_if_none_match():
+    entry = StateCache().get("status", 1, lambda: {"running": True})
+    assert entry.matches(entry.etag)
+    assert entry.matches(f'"outra", W/{entry.etag}')
+    assert entry.matches("*")
+    assert not entry.matches('"outra"')
+    assert not entry.matches(None)
+
+
+def test_invalidate():
+    cache = StateCache(max_age=60.0)
+    first = cache.get("status", 1, lambda: {"running": True})
+    cache.get("stats", 1, lambda: {"wins": 0})
+    cache.invalidate("status")
+    assert cache.get("status", 1, lambda: {"running": True}) is not first
+    cache.invalidate()
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_volatile_fields_stay_out_of_etag():
+    cache = StateCache(max_age=60.0)
+    entry = cache.get("stats", 1, lambda: {"wins": 1, "recent": [1.5, 2.0]})
+    body = entry.body_with({"uptime": "0:00:05"})
+    assert json.loads(body) == {"wins": 1, "recent": [1.5, 2.0], "uptime": "0:00:05"}
+    # O corpo em cache e o ETag não mudam com o campo volátil
+    assert json.loads(entry.body) == {"wins": 1, "recent": [1.5, 2.0]}
+    assert entry.body_with({}) is entry.body
+
+    empty = cache.get("status", 1, lambda: {})
+    assert json.loads(empty.body_with({"uptime": "0:00:01"})) == {"uptime": "0:00:01"}
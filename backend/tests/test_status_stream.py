@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Status por deltas: versões encadeadas, campos voláteis, canal de fase e seções parciais"""
+
+from status_stream import StatusStream, diff_section
+
+
+def test_diff_section_reports_changed_added_and_removed_fields():
+    old = {"running": True, "rounds": 3, "gone": 1}
+    new = {"running": True, "rounds": 4, "added": "x"}
+    assert diff_section(old, new) == {"rounds": 4, "added": "x", "gone": None}
+    assert diff_section(new, dict(new)) == {}
+
+
+def test_deltas_chain_versions():
+    stream = StatusStream()
+    first = stream.update({"status": {"running": False}, "stats": {"wins": 0}})
+    assert (first["data"]["base"], first["data"]["version"]) == (0, 1)
+    assert first["data"]["changes"] == {"status": {"running": False}, "stats": {"wins": 0}}
+
+    second = stream.update({"stats": {"wins": 1}})
+    assert (second["data"]["base"], second["data"]["version"]) == (1, 2)
+    # Só a seção e o campo que mudaram
+    assert second["data"]["changes"] == {"stats": {"wins": 1}}
+    assert stream.update({"stats": {"wins": 1}}) is None
+    assert stream.version == 2 and stream.deltas == 2
+
+
+def test_volatile_fields_ride_along_but_do_not_trigger():
+    stream = StatusStream()
+    stream.update({"status": {"running": True, "uptime": 1.0, "last_update": "a"}})
+    assert stream.update({"status": {"running": True, "uptime": 2.0, "last_update": "b"}}) is None
+    # Estado publicado fica na versão anterior
+    assert stream.state["status"]["uptime"] == 1.0
+
+    delta = stream.update({"status": {"running": False, "uptime": 3.0, "last_update": "c"}})
+    assert delta["data"]["changes"]["status"] == {"running": False, "uptime": 3.0, "last_update": "c"}
+
+
+def test_partial_update_keeps_other_sections():
+    stream = StatusStream()
+    stream.update({"status": {"running": True}, "stats": {"wins": 0}})
+    stream.update({"stats": {"wins": 2}})
+    assert stream.state == {"status": {"running": True}, "stats": {"wins": 2}}
+
+
+def test_phase_channel_is_separate_from_versions():
+    stream = StatusStream()
+    stream.update({"status": {"running": True}})
+    revision = stream.revision
+    message = stream.update_phase("betting")
+    assert message["type"] == "round_phase" and message["data"]["phase"] == "betting"
+    assert stream.update_phase("betting") is None
+    # A fase muda a revisão (chave do snapshot em cache), não a versão dos deltas
+    assert stream.version == 1 and stream.revision == revision + 1
+    assert stream.phase_messages == 1
+
+
+def test_snapshot_carries_version_state_and_phase():
+    stream = StatusStream()
+    stream.update({"status": {"running": True}, "stats": {"wins": 1}})
+    stream.update_phase("flying")
+    data = stream.snapshot()["data"]
+    assert data["version"] == 1
+    assert data["status"] == {"running": True} and data["stats"] == {"wins": 1}
+    assert data["phase"] == "flying"
+    # Um delta seguinte parte da versão do snapshot
+    assert stream.update({"stats": {"wins": 2}})["data"]["base"] == data["version"]
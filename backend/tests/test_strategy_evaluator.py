@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Regras observadas no meio do fluxo devem concordar com a avaliação vetorizada"""
+
+import random
+
+import numpy as np
+import pytest
+
+from strategy_evaluator import StrategyEvaluator
+from strategy_rules import compile_rule, default_rule_spec, evaluate_series
+
+
+def random_spec(rng: random.Random, depth: int = 0):
+    threshold = rng.choice([1.5, 2.0, 2.5, 3.0])
+    window = rng.randint(2, 12)
+    leaf = rng.choice([
+        {"run_below": {"threshold": threshold, "length": rng.randint(1, 8)}},
+        {"run_above": {"threshold": threshold, "length": rng.randint(1, 4)}},
+        {"avg_below": {"threshold": threshold, "window": window}},
+        {"avg_above": {"threshold": threshold, "window": window}},
+        {"count_below": {"threshold": threshold, "window": window, "min": rng.randint(1, window)}},
+        {"count_above": {"threshold": threshold, "window": window, "min": rng.randint(1, window)}},
+    ])
+    if depth >= 2 or rng.random() < 0.6:
+        return leaf
+    op = rng.choice(["all", "any", "not"])
+    if op == "not":
+        return {"not": random_spec(rng, depth + 1)}
+    return {op: [random_spec(rng, depth + 1) for _ in range(rng.randint(2, 3))]}
+
+
+def crash_series(rng: random.Random, rounds: int):
+    return [max(1.0, round(0.97 / (1 - rng.random()), 2)) for _ in range(rounds)]
+
+
+def test_rewatch_with_new_threshold_uses_retained_history():
+    evaluator = StrategyEvaluator()
+    evaluator.watch("active", default_rule_spec(2.0, 4))
+    for value in [1.5, 1.2, 1.9, 1.1, 1.3, 1.4]:
+        evaluator.update(value)
+    assert evaluator.is_triggered("active")
+
+    evaluator.watch("active", default_rule_spec(2.5, 4))
+    assert evaluator.is_triggered("active")
+    evaluator.update(1.1)
+    assert evaluator.is_triggered("active")
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_rule_watched_mid_stream_matches_evaluate_series(seed):
+    rng = random.Random(seed)
+    series = crash_series(rng, rng.randint(20, 120))
+    start = rng.randint(0, len(series) - 1)
+    spec = random_spec(rng)
+
+    evaluator = StrategyEvaluator()
+    # Outra regra já observada desde o início, compartilhando células
+    evaluator.watch("other", random_spec(rng))
+    for value in series[:start]:
+        evaluator.update(value)
+    evaluator.watch("late", spec)
+
+    expected = evaluate_series(compile_rule(spec), np.array(series))
+    if start:
+        assert evaluator.is_triggered("late") == expected[start - 1]
+    for index in range(start, len(series)):
+        evaluator.update(series[index])
+        assert evaluator.is_triggered("late") == expected[index], (spec, index)
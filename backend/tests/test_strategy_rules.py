@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Regras compiladas: predicado escalar e vetorizado concordam; specs inválidas são recusadas"""
+
+import random
+
+import numpy as np
+import pytest
+
+from strategy_rules import RuleError, compile_rule, default_rule_spec, evaluate_series
+
+LEAVES = ("run_below", "run_above", "avg_below", "avg_above", "count_below", "count_above")
+
+
+def random_spec(rng: random.Random, depth: int = 0):
+    if depth < 2 and rng.random() < 0.4:
+        op = rng.choice(["all", "any", "not"])
+        if op == "not":
+            return {"not": random_spec(rng, depth + 1)}
+        return {op: [random_spec(rng, depth + 1) for _ in range(rng.randint(2, 3))]}
+
+    op = rng.choice(LEAVES)
+    threshold = rng.choice([1.5, 2.0, 2.5, 3.0])
+    if op.startswith("run"):
+        return {op: {"threshold": threshold, "length": rng.randint(1, 6)}}
+    window = rng.randint(1, 10)
+    if op.startswith("avg"):
+        return {op: {"threshold": threshold, "window": window}}
+    return {op: {"threshold": threshold, "window": window, "min": rng.randint(1, window)}}
+
+
+def crash_series(rng: random.Random, rounds: int):
+    return [max(1.0, round(0.97 / (1 - rng.random()), 2)) for _ in range(rounds)]
+
+
+def scalar_series(rule, series):
+    """Predicado escalar a cada rodada, com o histórico mais recente primeiro"""
+    return [rule(series[index::-1]) for index in range(len(series))]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_scalar_and_vectorized_agree(seed):
+    rng = random.Random(seed)
+    rule = compile_rule(random_spec(rng))
+    series = crash_series(rng, rng.randint(1, 80))
+    assert evaluate_series(rule, series).tolist() == scalar_series(rule, series)
+
+
+def test_matrix_rows_are_independent_series():
+    rng = random.Random(5)
+    rule = compile_rule({"any": [default_rule_spec(2.0, 3), {"avg_above": {"threshold": 4.0, "window": 5}}]})
+    rows = [crash_series(rng, 40) for _ in range(6)]
+    matrix = evaluate_series(rule, np.array(rows))
+    for row, expected in zip(rows, matrix):
+        assert expected.tolist() == evaluate_series(rule, row).tolist()
+
+
+def test_default_rule_and_lookback():
+    rule = compile_rule(default_rule_spec(2.0, 3))
+    assert rule.lookback == 3
+    assert rule([1.5, 1.2, 1.9, 5.0])
+    assert not rule([1.5, 1.2])
+    assert not rule([1.5, 2.0, 1.1])
+    nested = compile_rule({"all": [default_rule_spec(2.0, 3), {"count_below": {"threshold": 2.0, "window": 8, "min": 5}}]})
+    assert nested.lookback == 8
+
+
+def test_average_at_decimal_boundary():
+    # 2.1 + 1.9 + 2.0 não é exatamente 6.0 em ponto flutuante
+    rule = compile_rule({"avg_above": {"threshold": 2.0, "window": 3}})
+    assert rule([2.1, 1.9, 2.0])
+    assert evaluate_series(rule, [2.0, 1.9, 2.1]).tolist() == [False, False, True]
+
+
+def test_empty_series():
+    rule = compile_rule(default_rule_spec(2.0, 2))
+    assert evaluate_series(rule, []).tolist() == []
+    assert not rule([])
+
+
+@pytest.mark.parametrize("spec", [
+    {},
+    {"run_below": {"threshold": 2.0}},
+    {"run_below": {"threshold": -1, "length": 3}},
+    {"run_below": {"threshold": 2.0, "length": 2.5}},
+    {"run_below": {"threshold": "x", "length": 2}},
+    {"count_below": {"threshold": 2.0, "window": 3, "min": 4}},
+    {"all": []},
+    {"unknown": {}},
+    {"run_below": [1, 2]},
+    {"run_below": {"threshold": 2.0, "length": 2}, "run_above": {"threshold": 2.0, "length": 2}},
+])
+def test_invalid_specs_raise_rule_error(spec):
+    with pytest.raises(RuleError):
+        compile_rule(spec)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Varredura de estratégias: resultados iguais ao backtest e erros por combinação"""
+
+import random
+
+import pytest
+
+from backtester import backtest
+from models import BettingStrategy, StrategyTypeEnum
+from strategy_rules import compile_rule, default_rule_spec
+from strategy_sweep import grid_combinations, rank_results, run_sweep, validate_combinations
+
+SERIES = [round(value, 2) for value in (random.Random(5).uniform(1.0, 6.0) for _ in range(500))]
+
+GRID = {
+    "strategy_threshold": [1.5, 2.0],
+    "min_strategy_checks": [2, 3],
+    "auto_cashout": [1.5, 2.5],
+    "progression_factor": [1.5],
+}
+
+
+def test_grid_uses_defaults_for_missing_params():
+    combinations = grid_combinations({"auto_cashout": [2.0]})
+    assert all(params["auto_cashout"] == 2.0 for params in combinations)
+    assert {params["strategy_threshold"] for params in combinations} == {1.5, 2.0, 2.5, 3.0}
+    with pytest.raises(ValueError):
+        grid_combinations({"desconhecido": [1.0]})
+
+
+def test_results_match_backtest():
+    report = run_sweep(SERIES, grid_combinations(GRID), metric="total_profit", workers=1, top=None)
+    assert report["evaluated"] == 8 and report["errors"] == 0
+    for result in report["results"]:
+        params = result["params"]
+        strategy = BettingStrategy(amount=1.0, strategy_type=StrategyTypeEnum.CUSTOM,
+                                   auto_cashout=params["auto_cashout"],
+                                   progression_factor=params["progression_factor"])
+        rule = compile_rule(default_rule_spec(params["strategy_threshold"], params["min_strategy_checks"]))
+        expected = backtest(SERIES, strategy, rule=rule).summary()
+        assert {key: result[key] for key in expected} == expected
+    profits = [result["total_profit"] for result in report["results"]]
+    assert profits == sorted(profits, reverse=True)
+
+
+def test_invalid_combination_is_a_row_error():
+    combinations = grid_combinations({**GRID, "auto_cashout": [0.5, 2.0], "min_strategy_checks": [0, 2]})
+    report = run_sweep(SERIES, combinations, workers=1, top=None)
+    # Só a combinação com cashout e checks válidos é avaliada
+    assert report["evaluated"] == len(combinations)
+    assert report["errors"] == len(combinations) - 2
+    assert {result["params"]["auto_cashout"] for result in report["results"]} == {2.0}
+    assert {result["params"]["min_strategy_checks"] for result in report["results"]} == {2}
+
+
+def test_validate_combinations_names_invalid_value():
+    validate_combinations(grid_combinations(GRID))
+    with pytest.raises(ValueError, match="auto_cashout=0.5"):
+        validate_combinations(grid_combinations({**GRID, "auto_cashout": [0.5, 2.0]}))
+    with pytest.raises(ValueError, match="min_strategy_checks=0"):
+        validate_combinations(grid_combinations({**GRID, "min_strategy_checks": [0]}))
+    with pytest.raises(ValueError, match="base"):
+        validate_combinations(grid_combinations(GRID), {"amount": -1.0})
+    with pytest.raises(ValueError):
+        validate_combinations([])
+
+
+def test_rank_skips_errors_and_orders_drawdown_ascending():
+    results = [
+        {"params": {}, "max_drawdown": 5.0},
+        {"params": {}, "error": "inválida"},
+        {"params": {}, "max_drawdown": 1.0},
+    ]
+    assert [result["max_drawdown"] for result in rank_results(results, "max_drawdown")] == [1.0, 5.0]
+    with pytest.raises(ValueError):
+        rank_results(results, "desconhecida")
+
+
+def test_process_pool_matches_single_process():
+    combinations = grid_combinations(GRID)
+    single = run_sweep(SERIES, combinations, workers=1, top=None)
+    pooled = run_sweep(SERIES, combinations, workers=2, top=None)
+    assert pooled["workers"] == 2
+    assert pooled["results"] == single["results"]
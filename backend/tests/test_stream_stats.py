@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Precisão dos quantis incrementais em dados de cauda pesada"""
+
+import numpy as np
+import pytest
+
+from stream_stats import RELATIVE_ACCURACY, LogBucketSketch, RunningStats
+
+
+def crash_multipliers(rounds: int, seed: int, edge: float = 0.03) -> np.ndarray:
+    """Multiplicadores de crash com vantagem da casa, truncados em 2 casas (mínimo 1,00x)"""
+    rng = np.random.default_rng(seed)
+    values = np.floor((1 - edge) / rng.random(rounds) * 100) / 100
+    return np.maximum(values, 1.0)
+
+
+@pytest.mark.parametrize("rounds", [50, 500, 5000, 20000])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_quantiles_match_numpy_within_relative_accuracy(rounds, seed):
+    values = crash_multipliers(rounds, seed)
+    stats = RunningStats(quantiles=(0.5, 0.9, 0.99))
+    for value in values:
+        stats.add(float(value))
+
+    summary = stats.to_dict()
+    for q, key in ((0.5, "p50"), (0.9, "p90"), (0.99, "p99")):
+        exact = np.percentile(values, q * 100, method="lower")
+        assert summary[key] == pytest.approx(exact, rel=RELATIVE_ACCURACY + 1e-9)
+    assert summary["count"] == rounds
+    assert summary["mean"] == pytest.approx(values.mean())
+    assert summary["max"] == values.max()
+
+
+def test_bucket_count_grows_with_range_not_rounds():
+    sketch = LogBucketSketch()
+    for value in crash_multipliers(100000, seed=7):
+        sketch.add(float(value))
+    # log(max) / log(gamma) limita os buckets, independente das 100 mil rodadas
+    assert sketch.buckets <= np.log(sketch.max) / np.log(sketch.gamma) + 1
+    assert sketch.buckets < 2000
+
+
+def test_empty_and_non_positive_values():
+    sketch = LogBucketSketch()
+    assert sketch.quantile(0.5) is None
+    for value in (0.0, 0.0, 2.0, 4.0):
+        sketch.add(value)
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(4.0, rel=RELATIVE_ACCURACY)
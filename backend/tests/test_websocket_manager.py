@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Fan-out do WebSocket: filas limitadas, coalescência e remoção de clientes lentos"""
+
+import asyncio
+import json
+
+from websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Registra as mensagens enviadas; `gate` segura os envios até ser liberado"""
+
+    def __init__(self, gate=None, fail=False):
+        self.sent = []
+        self.gate = gate
+        self.fail = fail
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("conexão perdida")
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        self.closed = True
+
+
+async def settle():
+    """Deixa os escritores esvaziarem as filas (cada envio passa por wait_for)"""
+    await asyncio.sleep(0.02)
+
+
+def test_broadcast_reaches_every_client_in_order():
+    async def scenario():
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket(), FakeWebSocket()]
+        for websocket in sockets:
+            await manager.connect(websocket)
+        for index in range(3):
+            await manager.broadcast({"type": "bet_placed", "data": {"n": index}})
+        await settle()
+        return manager, sockets
+
+    manager, sockets = asyncio.run(scenario())
+    for websocket in sockets:
+        assert [message["data"]["n"] for message in websocket.sent] == [0, 1, 2]
+    assert manager.get_stats()["broadcasts"] == 3
+
+
+def test_snapshots_coalesce_while_client_is_busy():
+    async def scenario():
+        manager = ConnectionManager()
+        gate = asyncio.Event()
+        websocket = FakeWebSocket(gate)
+        await manager.connect(websocket)
+        await manager.broadcast({"type": "bet_placed", "data": {"n": 0}})
+        await settle()
+        # O escritor está preso no primeiro envio; o resto fica na fila
+        for version in range(5):
+            await manager.broadcast({"type": "status_snapshot", "data": {"version": version}})
+            await manager.broadcast({"type": "round_phase", "data": {"version": version}})
+        await manager.broadcast({"type": "bet_won", "data": {}})
+        client = manager.clients[websocket]
+        queued = len(client.pending)
+        gate.set()
+        await settle()
+        return websocket, client, queued
+
+    websocket, client, queued = asyncio.run(scenario())
+    assert queued == 3
+    assert client.coalesced == 8
+    types = [message["type"] for message in websocket.sent]
+    assert types == ["bet_placed", "status_snapshot", "round_phase", "bet_won"]
+    # Fica a versão mais recente, na posição da primeira
+    assert websocket.sent[1]["data"]["version"] == 4
+    assert websocket.sent[2]["data"]["version"] == 4
+
+
+def test_full_queue_drops_oldest():
+    async def scenario():
+        manager = ConnectionManager(max_queue=3)
+        gate = asyncio.Event()
+        websocket = FakeWebSocket(gate)
+        await manager.connect(websocket)
+        await manager.broadcast({"type": "bet_placed", "data": {"n": -1}})
+        await settle()
+        for index in range(6):
+            await manager.broadcast({"type": "bet_placed", "data": {"n": index}})
+        gate.set()
+        await settle()
+        return manager, websocket
+
+    manager, websocket = asyncio.run(scenario())
+    assert [message["data"]["n"] for message in websocket.sent] == [-1, 3, 4, 5]
+    assert manager.get_stats()["dropped"] == 3
+
+
+def test_coalesce_can_be_forced_or_disabled():
+    async def scenario():
+        manager = ConnectionManager()
+        gate = asyncio.Event()
+        websocket = FakeWebSocket(gate)
+        await manager.connect(websocket)
+        await manager.broadcast({"type": "warmup", "data": {}})
+        await settle()
+        for index in range(3):
+            await manager.broadcast({"type": "status_delta", "data": {"n": index}}, coalesce=True)
+        for index in range(2):
+            await manager.broadcast({"type": "status_snapshot", "data": {"n": index}}, coalesce=False)
+        queued = len(manager.clients[websocket].pending)
+        gate.set()
+        await settle()
+        return websocket, queued
+
+    websocket, queued = asyncio.run(scenario())
+    assert queued == 3
+    assert [message["data"]["n"] for message in websocket.sent[1:]] == [2, 0, 1]
+
+
+def test_failing_and_slow_clients_are_evicted():
+    async def scenario():
+        manager = ConnectionManager(send_timeout=0.05)
+        healthy, broken, stuck = FakeWebSocket(), FakeWebSocket(fail=True), FakeWebSocket(asyncio.Event())
+        for websocket in (healthy, broken, stuck):
+            await manager.connect(websocket)
+        await manager.broadcast({"type": "bet_placed", "data": {}})
+        await asyncio.sleep(0.2)
+        return manager, healthy, broken, stuck
+
+    manager, healthy, broken, stuck = asyncio.run(scenario())
+    assert manager.active_connections == [healthy]
+    assert manager.evicted == 2
+    assert broken.closed and stuck.closed
+    assert len(healthy.sent) == 1
+
+
+def test_personal_message_goes_only_to_one_client():
+    async def scenario():
+        manager = ConnectionManager()
+        first, second = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(first)
+        await manager.connect(second)
+        await manager.send_personal_message({"type": "status_snapshot", "data": {}}, second)
+        await settle()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.sent == [] and len(second.sent) == 1
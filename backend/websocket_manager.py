@@ -2,60 +2,198 @@
 # -*- coding: utf-8 -*-
 """
 Gerenciador de WebSocket para comunicação em tempo real
+
+Cada cliente tem uma fila de envio limitada e uma task escritora própria:
+o broadcast serializa a mensagem uma vez e só enfileira, então um dashboard
+lento não atrasa os outros clientes nem o loop do bot. Com a fila cheia a
+mensagem mais antiga é descartada; snapshots de estado (status_snapshot) são
+coalescidos, ficando só o mais recente pendente. Clientes que falham ou não
+conseguem enviar dentro do timeout são removidos.
 """
 
-import json
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Optional
 from fastapi import WebSocket
 
+from state_cache import dumps
+
 logger = logging.getLogger(__name__)
 
+# Tipos em que só a versão mais recente interessa a um cliente atrasado
+COALESCE_TYPES = {"status_snapshot", "round_phase"}
+
+
+class ClientConnection:
+    """Fila de envio e métricas de um cliente"""
+
+    def __init__(self, websocket: WebSocket, client_id: int, max_queue: int):
+        self.websocket = websocket
+        self.client_id = client_id
+        self.max_queue = max_queue
+        # Itens: [chave de coalescência, texto, instante em que foi enfileirado]
+        self.pending: deque = deque()
+        self._wakeup = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag_total = 0.0
+
+    def enqueue(self, text: str, key: Optional[str] = None) -> None:
+        """Enfileira sem bloquear, aplicando coalescência e descarte do mais antigo"""
+        now = time.monotonic()
+        if key is not None:
+            for item in self.pending:
+                if item[0] == key:
+                    # Mantém a posição (e o instante original, para medir o atraso real)
+                    item[1] = text
+                    self.coalesced += 1
+                    return
+        if len(self.pending) >= self.max_queue:
+            self.pending.popleft()
+            self.dropped += 1
+        self.pending.append([key, text, now])
+        self._wakeup.set()
+
+    async def next_message(self) -> list:
+        while not self.pending:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        return self.pending.popleft()
+
+    def record_sent(self, enqueued_at: float) -> None:
+        lag = time.monotonic() - enqueued_at
+        self.sent += 1
+        self.last_lag = lag
+        self._lag_total += lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.client_id,
+            "queued": len(self.pending),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_lag_ms": self.last_lag * 1000,
+            "avg_lag_ms": (self._lag_total / self.sent * 1000) if self.sent else 0.0,
+            "max_lag_ms": self.max_lag * 1000,
+            "connected_for_s": time.time() - self.connected_at,
+        }
+
+
 class ConnectionManager:
     """Gerencia conexões WebSocket"""
-    
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-    
+
+    def __init__(self, max_queue: int = 100, send_timeout: float = 5.0):
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self._next_id = 0
+        self.broadcasts = 0
+        self.evicted = 0
+        self._broadcast_time = 0.0
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
+
     async def connect(self, websocket: WebSocket):
         """Aceita uma nova conexão WebSocket"""
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"Nova conexão WebSocket estabelecida. Total: {len(self.active_connections)}")
-    
+        self._register(websocket)
+        logger.info(f"Nova conexão WebSocket estabelecida. Total: {len(self.clients)}")
+
+    def _register(self, websocket: WebSocket) -> ClientConnection:
+        self._next_id += 1
+        client = ClientConnection(websocket, self._next_id, self.max_queue)
+        client.writer = asyncio.create_task(self._write_loop(client))
+        self.clients[websocket] = client
+        return client
+
     def disconnect(self, websocket: WebSocket):
         """Remove uma conexão WebSocket"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info(f"Conexão WebSocket removida. Total: {len(self.active_connections)}")
-    
-    async def send_personal_message(self, message: Dict[str, Any], websocket: WebSocket):
-        """Envia mensagem para uma conexão específica"""
+        client = self.clients.pop(websocket, None)
+        if client:
+            if client.writer and client.writer is not asyncio.current_task():
+                client.writer.cancel()
+            logger.info(f"Conexão WebSocket removida. Total: {len(self.clients)}")
+
+    async def _write_loop(self, client: ClientConnection) -> None:
+        """Task escritora: envia a fila do cliente na ordem"""
         try:
-            await websocket.send_text(json.dumps(message, default=str))
+            while True:
+                _, text, enqueued_at = await client.next_message()
+                await asyncio.wait_for(client.websocket.send_text(text), self.send_timeout)
+                client.record_sent(enqueued_at)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Erro ao enviar mensagem pessoal: {e}")
-            self.disconnect(websocket)
-    
-    async def broadcast(self, message: Dict[str, Any]):
-        """Envia mensagem para todas as conexões ativas"""
-        if not self.active_connections:
-            return
-        
-        message_str = json.dumps(message, default=str)
-        disconnected = []
-        
-        for connection in self.active_connections:
+            # Cliente morto ou lento demais: sai da lista e a conexão é fechada
+            reason = "timeout de envio" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.warning(f"Cliente WebSocket {client.client_id} removido ({reason})")
+            self.evicted += 1
+            self.disconnect(client.websocket)
             try:
-                await connection.send_text(message_str)
-            except Exception as e:
-                logger.error(f"Erro ao enviar broadcast: {e}")
-                disconnected.append(connection)
-        
-        # Remove conexões que falharam
-        for connection in disconnected:
-            self.disconnect(connection)
-    
+                await asyncio.wait_for(client.websocket.close(), 1.0)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _serialize(message: Dict[str, Any]) -> str:
+        return dumps(message).decode()
+
+    async def send_personal_message(self, message: Dict[str, Any], websocket: WebSocket):
+        """Envia mensagem para uma conexão específica"""
+        await self.send_serialized(self._serialize(message), websocket, message.get("type"))
+
+    async def send_serialized(self, text: str, websocket: WebSocket, message_type: Optional[str] = None):
+        """Envia uma mensagem já serializada (ex.: bytes compartilhados do StateCache)"""
+        client = self.clients.get(websocket)
+        if client:
+            client.enqueue(text, message_type if message_type in COALESCE_TYPES else None)
+
+    async def broadcast(self, message: Dict[str, Any], coalesce: Optional[bool] = None):
+        """
+        Envia mensagem para todas as conexões ativas: serializa uma vez e só
+        enfileira. `coalesce` força (ou desativa) a coalescência por tipo.
+        """
+        if not self.clients:
+            return
+
+        start = time.perf_counter()
+        message_type = message.get("type")
+        if coalesce is None:
+            coalesce = message_type in COALESCE_TYPES
+        key = message_type if coalesce else None
+
+        message_str = self._serialize(message)
+        for client in self.clients.values():
+            client.enqueue(message_str, key)
+
+        self.broadcasts += 1
+        self._broadcast_time += time.perf_counter() - start
+
     def get_connection_count(self) -> int:
         """Retorna o número de conexões ativas"""
-        return len(self.active_connections)
\ No newline at end of file
+        return len(self.clients)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Métricas de fan-out e atraso por cliente"""
+        clients = [client.get_stats() for client in self.clients.values()]
+        return {
+            "connections": len(clients),
+            "broadcasts": self.broadcasts,
+            "avg_broadcast_us": (self._broadcast_time / self.broadcasts * 1e6) if self.broadcasts else 0.0,
+            "evicted": self.evicted,
+            "dropped": sum(client["dropped"] for client in clients),
+            "max_lag_ms": max((client["max_lag_ms"] for client in clients), default=0.0),
+            "clients": clients,
+        }
@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useState, useEffect, useCallback } from 'react';
+import React, { createContext, useContext, useState, useEffect, useCallback, useRef } from 'react';
 import axios from 'axios';
 import toast from 'react-hot-toast';
 import { useWebSocket } from './WebSocketContext';
@@ -14,6 +14,7 @@ interface BotConfig {
   min_strategy_checks: number;
   update_interval: number;
   max_retries: number;
+  paper_mode?: boolean;
 }
 
 interface ElementConfig {
@@ -40,6 +41,7 @@ interface BotStatus {
   error_message?: string;
   current_strategy?: any;
   recent_results: number[];
+  round_phase?: string;
 }
 
 interface SessionStats {
@@ -144,38 +146,68 @@ export const BotProvider: React.FC<BotProviderProps> = ({ children }) => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  const { lastMessage, isConnected } = useWebSocket();
+  const { subscribe, isConnected, sendMessage } = useWebSocket();
+  // Versão do último status aplicado (snapshot ou delta)
+  const statusVersion = useRef<number | null>(null);
+  const sendMessageRef = useRef(sendMessage);
+  sendMessageRef.current = sendMessage;
 
-  // Handle WebSocket messages
+  // Handle WebSocket messages (todas, em ordem: um delta perdido quebraria a sequência de versões)
   useEffect(() => {
-    if (lastMessage) {
-      switch (lastMessage.type) {
-        case 'status_update':
-          if (lastMessage.data.status) {
-            setBotStatus(lastMessage.data.status);
+    return subscribe((message) => {
+      const sendMessage = sendMessageRef.current;
+      switch (message.type) {
+        case 'status_snapshot': {
+          const { version, status, stats, phase } = message.data;
+          statusVersion.current = version;
+          if (status) {
+            setBotStatus({ ...status, round_phase: phase ?? undefined });
           }
-          if (lastMessage.data.stats) {
-            setSessionStats(lastMessage.data.stats);
+          if (stats) {
+            setSessionStats(stats);
           }
           break;
+        }
+        case 'round_phase':
+          // Canal próprio, sem versão: vale sempre a fase mais recente
+          setBotStatus(prev => (prev ? { ...prev, round_phase: message.data.phase } : prev));
+          break;
+        case 'status_delta': {
+          const { base, version, changes } = message.data;
+          if (statusVersion.current === null || base !== statusVersion.current) {
+            // Delta antigo (já coberto por um snapshot) é ignorado; lacuna pede o estado completo
+            if (statusVersion.current === null || version > statusVersion.current) {
+              sendMessage({ type: 'snapshot_request', data: {} });
+            }
+            break;
+          }
+          statusVersion.current = version;
+          if (changes.status) {
+            setBotStatus(prev => (prev ? { ...prev, ...changes.status } : prev));
+          }
+          if (changes.stats) {
+            setSessionStats(prev => (prev ? { ...prev, ...changes.stats } : prev));
+          }
+          break;
+        }
         case 'config_updated':
-          setBotConfig(lastMessage.data);
+          setBotConfig(message.data);
           break;
         case 'elements_updated':
-          setElementConfig(lastMessage.data);
+          setElementConfig(message.data);
           break;
         case 'betting_started':
-          setBettingStrategy(lastMessage.data);
+          setBettingStrategy(message.data);
           break;
         case 'betting_stopped':
           setBettingStrategy(null);
           break;
         case 'error':
-          setError(lastMessage.data.message);
+          setError(message.data.message);
           break;
       }
-    }
-  }, [lastMessage]);
+    });
+  }, [subscribe]);
 
   // API Functions
   const fetchBotConfig = useCallback(async () => {
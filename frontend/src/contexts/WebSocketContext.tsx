@@ -1,5 +1,4 @@
-import React, { createContext, useContext, useEffect, useState, useCallback } from 'react';
-import { io, Socket } from 'socket.io-client';
+import React, { createContext, useContext, useEffect, useState, useCallback, useRef } from 'react';
 import toast from 'react-hot-toast';
 
 interface WebSocketMessage {
@@ -8,131 +7,49 @@ interface WebSocketMessage {
   timestamp?: string;
 }
 
+type MessageListener = (message: WebSocketMessage) => void;
+
 interface WebSocketContextType {
-  socket: Socket | null;
+  socket: WebSocket | null;
   isConnected: boolean;
   sendMessage: (message: WebSocketMessage) => void;
+  // Recebe todas as mensagens, na ordem de chegada (lastMessage pode pular
+  // mensagens entregues no mesmo ciclo de renderização)
+  subscribe: (listener: MessageListener) => () => void;
   lastMessage: WebSocketMessage | null;
   connectionError: string | null;
 }
 
 const WebSocketContext = createContext<WebSocketContextType | undefined>(undefined);
 
-interface WebSocketProviderProps {
-  children: React.ReactNode;
-}
-
-export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({ children }) => {
-  const [socket, setSocket] = useState<Socket | null>(null);
-  const [isConnected, setIsConnected] = useState(false);
-  const [lastMessage, setLastMessage] = useState<WebSocketMessage | null>(null);
-  const [connectionError, setConnectionError] = useState<string | null>(null);
-
-  const sendMessage = useCallback((message: WebSocketMessage) => {
-    if (socket && isConnected) {
-      socket.emit('message', message);
-    } else {
-      console.warn('WebSocket não está conectado');
-    }
-  }, [socket, isConnected]);
-
-  useEffect(() => {
-    // Configurar conexão WebSocket
-    const newSocket = io('ws://localhost:8000/ws', {
-      transports: ['websocket'],
-      upgrade: true,
-      rememberUpgrade: true,
-    });
-
-    // Event listeners
-    newSocket.on('connect', () => {
-      console.log('WebSocket conectado');
-      setIsConnected(true);
-      setConnectionError(null);
-      toast.success('Conectado ao servidor', {
-        duration: 2000,
-        position: 'bottom-right',
-      });
-    });
-
-    newSocket.on('disconnect', (reason) => {
-      console.log('WebSocket desconectado:', reason);
-      setIsConnected(false);
-      if (reason === 'io server disconnect') {
-        // Reconectar se o servidor desconectou
-        newSocket.connect();
-      }
-      toast.error('Conexão perdida', {
-        duration: 3000,
-        position: 'bottom-right',
-      });
-    });
-
-    newSocket.on('connect_error', (error) => {
-      console.error('Erro de conexão WebSocket:', error);
-      setConnectionError(error.message);
-      setIsConnected(false);
-    });
-
-    // Listener para mensagens gerais
-    newSocket.on('message', (message: WebSocketMessage) => {
-      console.log('Mensagem recebida:', message);
-      setLastMessage(message);
-      handleMessage(message);
-    });
-
-    // Listeners específicos para diferentes tipos de mensagem
-    newSocket.on('status_update', (data) => {
-      setLastMessage({ type: 'status_update', data });
-    });
-
-    newSocket.on('config_updated', (data) => {
-      setLastMessage({ type: 'config_updated', data });
-      toast.success('Configuração atualizada', {
-        duration: 2000,
-      });
-    });
-
-    newSocket.on('elements_updated', (data) => {
-      setLastMessage({ type: 'elements_updated', data });
-      toast.success('Elementos atualizados', {
-        duration: 2000,
-      });
-    });
-
-    newSocket.on('bot_started', (data) => {
-      setLastMessage({ type: 'bot_started', data });
-      toast.success('Bot iniciado com sucesso', {
-        duration: 3000,
-        icon: '🚀',
-      });
-    });
-
-    newSocket.on('bot_stopped', (data) => {
-      setLastMessage({ type: 'bot_stopped', data });
-      toast.info('Bot parado', {
-        duration: 2000,
-        icon: '⏹️',
-      });
-    });
-
-    newSocket.on('betting_started', (data) => {
-      setLastMessage({ type: 'betting_started', data });
-      toast.success('Apostas automáticas iniciadas', {
-        duration: 3000,
-        icon: '🎰',
-      });
-    });
-
-    newSocket.on('betting_stopped', (data) => {
-      setLastMessage({ type: 'betting_stopped', data });
-      toast.info('Apostas automáticas paradas', {
-        duration: 2000,
-      });
-    });
-
-    newSocket.on('strategy_found', (data) => {
-      setLastMessage({ type: 'strategy_found', data });
+// Endpoint /ws do backend (WebSocket nativo do FastAPI, mensagens JSON {type, data})
+const WS_URL = process.env.REACT_APP_WS_URL || 'ws://localhost:8000/ws';
+const RECONNECT_BASE_DELAY = 1000;
+const RECONNECT_MAX_DELAY = 30000;
+
+// Notificações exibidas para cada tipo de mensagem
+const notifyMessage = (message: WebSocketMessage) => {
+  const data = message.data || {};
+  switch (message.type) {
+    case 'config_updated':
+      toast.success('Configuração atualizada', { duration: 2000 });
+      break;
+    case 'elements_updated':
+      toast.success('Elementos atualizados', { duration: 2000 });
+      break;
+    case 'bot_started':
+      toast.success('Bot iniciado com sucesso', { duration: 3000, icon: '🚀' });
+      break;
+    case 'bot_stopped':
+      toast('Bot parado', { duration: 2000, icon: '⏹️' });
+      break;
+    case 'betting_started':
+      toast.success('Apostas automáticas iniciadas', { duration: 3000, icon: '🎰' });
+      break;
+    case 'betting_stopped':
+      toast('Apostas automáticas paradas', { duration: 2000 });
+      break;
+    case 'strategy_found':
       toast.success('Estratégia encontrada!', {
         duration: 4000,
         icon: '🎯',
@@ -141,18 +58,11 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({ children }
           color: 'white',
         },
       });
-    });
-
-    newSocket.on('bet_placed', (data) => {
-      setLastMessage({ type: 'bet_placed', data });
-      toast.info(`Aposta realizada: R$ ${data.amount}`, {
-        duration: 3000,
-        icon: '💰',
-      });
-    });
-
-    newSocket.on('bet_won', (data) => {
-      setLastMessage({ type: 'bet_won', data });
+      break;
+    case 'bet_placed':
+      toast(`Aposta realizada: R$ ${data.amount}`, { duration: 3000, icon: '💰' });
+      break;
+    case 'bet_won':
       toast.success(`Aposta ganha! +R$ ${data.profit}`, {
         duration: 4000,
         icon: '🎉',
@@ -161,61 +71,132 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({ children }
           color: 'white',
         },
       });
-    });
-
-    newSocket.on('bet_lost', (data) => {
-      setLastMessage({ type: 'bet_lost', data });
-      toast.error(`Aposta perdida: -R$ ${data.amount}`, {
-        duration: 3000,
-        icon: '😞',
-      });
-    });
+      break;
+    case 'bet_lost':
+      toast.error(`Aposta perdida: -R$ ${data.amount}`, { duration: 3000, icon: '😞' });
+      break;
+    case 'error':
+      toast.error(data.message || 'Erro no sistema', { duration: 5000, icon: '❌' });
+      break;
+    case 'warning':
+      toast.error(data.message || 'Aviso do sistema', { duration: 4000, icon: '⚠️' });
+      break;
+    case 'notification':
+      toast(data.message, { duration: 3000 });
+      break;
+    default:
+      // Status (snapshot, deltas, fase) e demais mensagens não geram notificação
+      break;
+  }
+};
 
-    newSocket.on('error', (data) => {
-      setLastMessage({ type: 'error', data });
-      toast.error(data.message || 'Erro no sistema', {
-        duration: 5000,
-        icon: '❌',
-      });
-    });
+interface WebSocketProviderProps {
+  children: React.ReactNode;
+}
 
-    newSocket.on('warning', (data) => {
-      setLastMessage({ type: 'warning', data });
-      toast.error(data.message || 'Aviso do sistema', {
-        duration: 4000,
-        icon: '⚠️',
-      });
-    });
+export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({ children }) => {
+  const [socket, setSocket] = useState<WebSocket | null>(null);
+  const [isConnected, setIsConnected] = useState(false);
+  const [lastMessage, setLastMessage] = useState<WebSocketMessage | null>(null);
+  const [connectionError, setConnectionError] = useState<string | null>(null);
+  const listeners = useRef(new Set<MessageListener>());
 
-    setSocket(newSocket);
+  const sendMessage = useCallback((message: WebSocketMessage) => {
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      socket.send(JSON.stringify(message));
+    } else {
+      console.warn('WebSocket não está conectado');
+    }
+  }, [socket]);
 
-    // Cleanup
+  const subscribe = useCallback((listener: MessageListener) => {
+    listeners.current.add(listener);
     return () => {
-      newSocket.close();
+      listeners.current.delete(listener);
     };
   }, []);
 
-  const handleMessage = (message: WebSocketMessage) => {
-    // Processar mensagens específicas se necessário
-    switch (message.type) {
-      case 'heartbeat':
-        // Responder ao heartbeat se necessário
-        break;
-      case 'notification':
-        toast.info(message.data.message, {
-          duration: 3000,
+  useEffect(() => {
+    let ws: WebSocket | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+    let attempts = 0;
+    let closed = false;
+    let wasConnected = false;
+
+    const connect = () => {
+      ws = new WebSocket(WS_URL);
+      setSocket(ws);
+
+      ws.onopen = () => {
+        console.log('WebSocket conectado');
+        attempts = 0;
+        wasConnected = true;
+        setIsConnected(true);
+        setConnectionError(null);
+        toast.success('Conectado ao servidor', {
+          duration: 2000,
+          position: 'bottom-right',
         });
-        break;
-      default:
-        // Mensagem genérica
-        break;
-    }
-  };
+      };
+
+      ws.onmessage = (event: MessageEvent) => {
+        let message: WebSocketMessage;
+        try {
+          message = JSON.parse(event.data);
+        } catch (e) {
+          console.warn('Mensagem WebSocket inválida:', event.data);
+          return;
+        }
+        if (!message || typeof message.type !== 'string') {
+          return;
+        }
+        listeners.current.forEach(listener => listener(message));
+        setLastMessage(message);
+        notifyMessage(message);
+      };
+
+      ws.onerror = () => {
+        console.error('Erro de conexão WebSocket');
+        setConnectionError('Erro de conexão com o servidor');
+      };
+
+      ws.onclose = (event: CloseEvent) => {
+        setIsConnected(false);
+        if (closed) {
+          return;
+        }
+        console.log('WebSocket desconectado:', event.code, event.reason);
+        if (wasConnected) {
+          wasConnected = false;
+          toast.error('Conexão perdida', {
+            duration: 3000,
+            position: 'bottom-right',
+          });
+        }
+        // Reconexão com espera exponencial; o servidor envia um snapshot novo ao conectar
+        const delay = Math.min(RECONNECT_BASE_DELAY * 2 ** attempts, RECONNECT_MAX_DELAY);
+        attempts += 1;
+        reconnectTimer = setTimeout(connect, delay);
+      };
+    };
+
+    connect();
+
+    // Cleanup
+    return () => {
+      closed = true;
+      if (reconnectTimer) {
+        clearTimeout(reconnectTimer);
+      }
+      ws?.close();
+    };
+  }, []);
 
   const value: WebSocketContextType = {
     socket,
     isConnected,
     sendMessage,
+    subscribe,
     lastMessage,
     connectionError,
   };
@@ -235,4 +216,4 @@ export const useWebSocket = (): WebSocketContextType => {
   return context;
 };
 
-export default WebSocketContext;
\ No newline at end of file
+export default WebSocketContext;
@@ -47,6 +47,7 @@ interface ConfigFormData {
   min_strategy_checks: number;
   update_interval: number;
   max_retries: number;
+  paper_mode: boolean;
 }
 
 interface CredentialsFormData {
@@ -76,6 +77,7 @@ const Configuration: React.FC = () => {
       min_strategy_checks: 4,
       update_interval: 2,
       max_retries: 3,
+      paper_mode: false,
     },
   });
 
@@ -104,6 +106,7 @@ const Configuration: React.FC = () => {
         min_strategy_checks: botConfig.min_strategy_checks,
         update_interval: botConfig.update_interval,
         max_retries: botConfig.max_retries,
+        paper_mode: botConfig.paper_mode ?? false,
       });
     }
   }, [botConfig, reset]);
@@ -140,6 +143,7 @@ const Configuration: React.FC = () => {
         min_strategy_checks: botConfig.min_strategy_checks,
         update_interval: botConfig.update_interval,
         max_retries: botConfig.max_retries,
+        paper_mode: botConfig.paper_mode ?? false,
       });
       toast.info('Configurações restauradas');
     }
@@ -157,7 +161,7 @@ const Configuration: React.FC = () => {
       title: 'Configurações de Execução',
       icon: <SpeedIcon />,
       color: theme.palette.secondary.main,
-      fields: ['headless', 'wait_timeout', 'update_interval', 'max_retries'],
+      fields: ['headless', 'paper_mode', 'wait_timeout', 'update_interval', 'max_retries'],
     },
     {
       title: 'Estratégia e Análise',
@@ -329,6 +333,33 @@ const Configuration: React.FC = () => {
                               </Grid>
                             );
                           
+                          case 'paper_mode':
+                            return (
+                              <Grid item xs={12} sm={6} key={fieldName}>
+                                <Controller
+                                  name="paper_mode"
+                                  control={control}
+                                  render={({ field }) => (
+                                    <Box>
+                                      <FormControlLabel
+                                        control={
+                                          <Switch
+                                            checked={field.value}
+                                            onChange={field.onChange}
+                                            color="warning"
+                                          />
+                                        }
+                                        label="Modo Simulado"
+                                      />
+                                      <Typography variant="caption" display="block" color="text.secondary">
+                                        Decide e liquida as apostas sem clicar (vale na hora, sem reiniciar)
+                                      </Typography>
+                                    </Box>
+                                  )}
+                                />
+                              </Grid>
+                            );
+                          
                           case 'wait_timeout':
                             return (
                               <Grid item xs={12} sm={6} key={fieldName}>